@@ -0,0 +1,68 @@
+"""Compare fixed numbers of jobs with --jobs auto on a generated config of fake toolchain checks.
+
+Half the checks run a command that keeps a CPU busy, like a tool starting a full interpreter, and half run one that
+mostly waits, like a tool calling an API. Run from the repository root with:
+python3 -m benchmarks.bench_adaptive_jobs [--checks N] [--cpu-ms MS] [--wait-ms MS]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+from daktari.check import Check, CheckResult
+from daktari.check_runner import CheckRunner, RunOptions
+from daktari.command_utils import can_run_command
+from daktari.concurrency import MAX_JOBS_PER_CPU, AdaptiveConcurrency
+from daktari.result_formatter import JsonFormatter
+
+
+class FakeToolCheck(Check):
+    def __init__(self, name: str, script: str):
+        self.name = name
+        self.script = script
+
+    def check(self) -> CheckResult:
+        return self.verify(can_run_command([sys.executable, "-c", self.script]), "fake tool <not/> working")
+
+
+def build_checks(check_count: int, cpu_ms: int, wait_ms: int) -> List[Check]:
+    busy_script = f"import time\nend = time.process_time() + {cpu_ms / 1000}\nwhile time.process_time() < end: pass"
+    waiting_script = f"import time; time.sleep({wait_ms / 1000})"
+    return [
+        (
+            FakeToolCheck(f"fake.busy.{i}", busy_script)
+            if i % 2 == 0
+            else FakeToolCheck(f"fake.waiting.{i}", waiting_script)
+        )
+        for i in range(check_count)
+    ]
+
+
+def measure(label: str, checks: List[Check], jobs: int, concurrency: Optional[AdaptiveConcurrency] = None):
+    formatter = JsonFormatter(open(os.devnull, "w"))
+    start_time = time.perf_counter()
+    CheckRunner(checks, RunOptions(quiet_mode=True, jobs=jobs, concurrency=concurrency), formatter).run()
+    elapsed = time.perf_counter() - start_time
+    final_jobs = "" if concurrency is None else f", finished at {concurrency.limit()} jobs"
+    print(f"{label:>8}: {len(checks)} checks in {elapsed:.2f} s, {len(checks) / elapsed:.1f} checks/s{final_jobs}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=200, help="number of checks in the generated config")
+    parser.add_argument("--cpu-ms", type=int, default=50, help="CPU time used by each busy check")
+    parser.add_argument("--wait-ms", type=int, default=100, help="time each waiting check waits for")
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    checks = build_checks(args.checks, args.cpu_ms, args.wait_ms)
+    for jobs in sorted({1, 2, cpu_count, cpu_count * 2, cpu_count * MAX_JOBS_PER_CPU}):
+        measure(f"-j {jobs}", checks, jobs)
+    max_jobs = cpu_count * MAX_JOBS_PER_CPU
+    measure("-j auto", checks, max_jobs, AdaptiveConcurrency(max_jobs, cpu_count=cpu_count))
+
+
+if __name__ == "__main__":
+    main()
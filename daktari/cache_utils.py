@@ -0,0 +1,73 @@
+import fcntl
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+# Only the standard library may be imported here, so that reading cached state stays cheap
+
+
+def get_cache_dir() -> Path:
+    cache_dir = os.environ.get("DAKTARI_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(xdg_cache_home) / "daktari"
+
+
+def read_cache_file(name: str) -> Optional[Any]:
+    path = get_cache_dir() / name
+    try:
+        with open(path, "r", encoding="utf-8") as cache_file:
+            return json.load(cache_file)
+    except FileNotFoundError:
+        return None
+    except (IOError, ValueError):
+        logging.debug(f"Exception reading cache file {path}", exc_info=True)
+        return None
+
+
+def write_cache_file(name: str, contents: Any):
+    """Write a cache file atomically, so concurrent readers never see a partial file."""
+    path = get_cache_dir() / name
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+                json.dump(contents, temp_file)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except IOError:
+        logging.debug(f"Exception writing cache file {path}", exc_info=True)
+
+
+@contextmanager
+def locked_cache_file(name: str) -> Iterator[None]:
+    """Hold an exclusive lock on a cache file, so that daktari processes updating it at once, such as a background
+    refresh and a run in the foreground, take turns rather than losing each other's changes."""
+    lock_path = get_cache_dir() / f".{name}.lock"
+    try:
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(lock_path, "a")
+    except IOError:
+        logging.debug(f"Exception opening lock file {lock_path}", exc_info=True)
+        yield
+        return
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def update_cache_file(name: str, update: Callable[[Optional[Any]], Any]):
+    """Replace a cache file's contents with update(current contents), holding its lock throughout."""
+    with locked_cache_file(name):
+        write_cache_file(name, update(read_cache_file(name)))
@@ -1,7 +1,8 @@
 import abc
 import re
-from copy import deepcopy
-from dataclasses import dataclass
+from copy import copy
+from dataclasses import dataclass, field
+from datetime import timedelta
 from enum import Enum
 from typing import Dict, List, Optional, Type
 
@@ -24,6 +25,12 @@ class CheckResult:
     status: CheckStatus
     summary: str
     suggestions: Dict[str, str]
+    duration: float = field(default=0.0, compare=False)
+    # Epoch time after which a passing result can no longer be assumed to hold, e.g. a certificate's expiry
+    valid_until: Optional[float] = field(default=None, compare=False)
+    cached: bool = field(default=False, compare=False)
+    # Tells apart checks sharing a name in reports, set by the runner from get_check_id
+    check_id: Optional[str] = field(default=None, compare=False)
 
 
 class Check:
@@ -33,28 +40,52 @@ class Check:
     run_on: Optional[str] = None
     skip: bool = False
     warn_only_on_failure: bool = False
+    # How long a passing result may be reused by later runs. None means the check always runs.
+    cache_ttl: Optional[timedelta] = None
+    # Whether the check only reads state, so it can safely run before its dependencies have passed
+    side_effect_free: bool = False
+    # Whether the result is the same whichever project it is run from, such as whether a tool is installed globally
+    machine_wide: bool = False
+    # Whether the whole check needs the network, so fails straight away if --network-probe finds it unreachable.
+    # Checks that only need the network for some steps can call is_network_unreachable() before those steps instead.
+    requires_network: bool = False
+    # Heavyweight tools the check runs and how many instances of each, e.g. {"gcloud": 1}. Parallel runs limit how
+    # many checks use each resource at once.
+    resources: Dict[str, int] = {}
 
     def with_dependencies(self, *dependencies: Type["Check"]) -> "Check":
-        copy = deepcopy(self)
-        copy.depends_on = self.depends_on + list(dependencies)
-        return copy
+        # A shallow copy shares suggestions and other attributes with the original, which is safe because depends_on
+        # is the only thing that differs and it is replaced rather than modified
+        derived = copy(self)
+        derived.depends_on = self.depends_on + list(dependencies)
+        return derived
 
-    def passed(self, message: str) -> CheckResult:
-        return CheckResult(self.name, CheckStatus.PASS, message, self.suggestions)
+    # Each result may carry suggestions specific to it, so that checks never need to modify themselves while running
+    def get_suggestions(self, suggestions: Optional[Dict[str, str]]) -> Dict[str, str]:
+        return self.suggestions if suggestions is None else suggestions
 
-    def failed(self, message: str) -> CheckResult:
+    def passed(self, message: str, suggestions: Optional[Dict[str, str]] = None) -> CheckResult:
+        return CheckResult(self.name, CheckStatus.PASS, message, self.get_suggestions(suggestions))
+
+    def failed(self, message: str, suggestions: Optional[Dict[str, str]] = None) -> CheckResult:
         status = CheckStatus.PASS_WITH_WARNING if self.warn_only_on_failure else CheckStatus.FAIL
-        return CheckResult(self.name, status, message, self.suggestions)
+        return CheckResult(self.name, status, message, self.get_suggestions(suggestions))
 
-    def passed_with_warning(self, message: str) -> CheckResult:
-        return CheckResult(self.name, CheckStatus.PASS_WITH_WARNING, message, self.suggestions)
+    def passed_with_warning(self, message: str, suggestions: Optional[Dict[str, str]] = None) -> CheckResult:
+        return CheckResult(self.name, CheckStatus.PASS_WITH_WARNING, message, self.get_suggestions(suggestions))
 
-    def verify(self, passed: bool, dual_message: str, failed_message: Optional[str] = None) -> CheckResult:
+    def verify(
+        self,
+        passed: bool,
+        dual_message: str,
+        failed_message: Optional[str] = None,
+        suggestions: Optional[Dict[str, str]] = None,
+    ) -> CheckResult:
         pattern = re.compile(" <not/> ")
         if passed:
-            return self.passed(pattern.sub(" ", dual_message))
+            return self.passed(pattern.sub(" ", dual_message), suggestions)
         else:
-            return self.failed(failed_message or pattern.sub(" not ", dual_message))
+            return self.failed(failed_message or pattern.sub(" not ", dual_message), suggestions)
 
     def validate_semver_expression(
         self,
@@ -117,5 +148,15 @@ class Check:
     def should_run(self, current_os: str) -> bool:
         return not self.skip and (self.run_on is None or self.run_on == current_os)
 
+    def is_machine_wide(self) -> bool:
+        """Whether results can be shared between projects. Version managers such as asdf may resolve a different
+        version of a tool in each project, so a check with a version requirement never is."""
+        versions = [vars(self).get("required_version"), vars(self).get("recommended_version")]
+        return self.machine_wide and not any(versions)
+
+    def get_input_paths(self) -> List[str]:
+        """Files whose contents this check depends on. Checks whose inputs have changed are prioritised."""
+        return []
+
     def __eq__(self, other):
         return type(self) is type(other) and self.name == other.name
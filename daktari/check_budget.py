@@ -0,0 +1,90 @@
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from daktari.check import Check
+from daktari.check_history import CheckHistory
+from daktari.check_sorter import UNKNOWN_DURATION, sort_checks
+from daktari.os import detect_os
+from daktari.result_cache import ResultCache
+
+
+@dataclass
+class BudgetPlan:
+    selected: List[Check]
+    deferred: List[Check]
+    # Names of deferred checks that passed last time, so checks depending on them can still run
+    assumed_passed: Set[str]
+
+
+def inputs_changed_since(check: Check, since: Optional[float]) -> bool:
+    for path in check.get_input_paths():
+        try:
+            modified = os.stat(os.path.expanduser(path)).st_mtime
+        except OSError:
+            # We can't tell whether a missing file was there last time, so treat it as changed
+            logging.debug(f"Could not stat {path}", exc_info=True)
+            return True
+        if since is None or modified > since:
+            return True
+    return False
+
+
+def plan_within_budget(
+    checks: List[Check],
+    budget_seconds: float,
+    jobs: int,
+    history: CheckHistory,
+    result_cache: Optional[ResultCache] = None,
+) -> BudgetPlan:
+    """Choose the checks expected to finish within the budget when run on the given number of workers.
+
+    Checks whose input files changed since the last full run go first, then those that didn't pass last time. Checks
+    with a cached result cost nothing. Checks that have never been timed are assumed to take UNKNOWN_DURATION, or the
+    whole budget if that is less, so a few of them run and are timed in each run rather than all being deferred."""
+    checks = [check for check in checks if check.should_run(detect_os())]
+    last_full_run = history.get_last_full_run()
+
+    def priority(check: Check):
+        return (
+            not inputs_changed_since(check, last_full_run),
+            history.last_passed(check),
+            history.get_duration(check) or 0.0,
+        )
+
+    def estimated_duration(check: Check) -> float:
+        if result_cache is not None and result_cache.get(check) is not None:
+            return 0.0
+        duration = history.get_duration(check)
+        return min(UNKNOWN_DURATION, budget_seconds) if duration is None else duration
+
+    by_name: Dict[str, List[Check]] = {}
+    for check in checks:
+        by_name.setdefault(check.name, []).append(check)
+
+    def previously_passed(name: str) -> bool:
+        return all(history.last_passed(check) for check in by_name[name])
+
+    selected_names: Set[str] = set()
+    selected_ids: Set[int] = set()
+    load = 0.0
+    for check in sorted(sort_checks(checks), key=priority):
+        duration = estimated_duration(check)
+        if duration > budget_seconds or (load + duration) / jobs > budget_seconds:
+            continue
+        dependencies = {dependency.name for dependency in check.depends_on if dependency.name in by_name}
+        if any(name not in selected_names and not previously_passed(name) for name in dependencies):
+            continue
+        selected_names.add(check.name)
+        selected_ids.add(id(check))
+        load += duration
+
+    deferred = [check for check in checks if id(check) not in selected_ids]
+    return BudgetPlan(
+        selected=[check for check in checks if id(check) in selected_ids],
+        deferred=deferred,
+        assumed_passed={
+            check.name for check in deferred if check.name not in selected_names and previously_passed(check.name)
+        },
+    )
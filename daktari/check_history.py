@@ -0,0 +1,107 @@
+import os
+import statistics
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from daktari.cache_utils import read_cache_file, update_cache_file
+from daktari.check import Check, CheckResult, CheckStatus
+from daktari.check_utils import get_check_fingerprint
+
+HISTORY_FILE = "history.json"
+# How many of each check's most recent durations are kept
+DURATIONS_KEPT = 10
+PASSING_STATUSES = (CheckStatus.PASS, CheckStatus.PASS_WITH_WARNING)
+
+
+class CheckHistory:
+    """Remembers how long each check took in recent runs, whether it last passed and how often it has failed, so later
+    runs can plan around them."""
+
+    def __init__(self, checks: Dict[str, Dict[str, Any]], full_runs: Dict[str, float]):
+        self.checks = checks
+        # When the last full run of each config started, keyed by the config's directory
+        self.full_runs = full_runs
+        self.fingerprints: Dict[int, Optional[str]] = {}
+        # What this process changed, so that saving leaves the changes of other daktari processes in place
+        self.updated_checks: Set[str] = set()
+        self.updated_full_runs: Set[str] = set()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls) -> "CheckHistory":
+        contents = read_cache_file(HISTORY_FILE)
+        if not isinstance(contents, dict):
+            return cls({}, {})
+        return cls(contents.get("checks", {}), contents.get("full_runs", {}))
+
+    def fingerprint(self, check: Check) -> Optional[str]:
+        with self.lock:
+            if id(check) not in self.fingerprints:
+                self.fingerprints[id(check)] = get_check_fingerprint(check)
+            return self.fingerprints[id(check)]
+
+    def track(self, checks: List[Check]):
+        """Fingerprint checks before they run, since running a check may change its attributes."""
+        for check in checks:
+            self.fingerprint(check)
+
+    def get_entry(self, check: Check) -> Optional[Dict[str, Any]]:
+        fingerprint = self.fingerprint(check)
+        return None if fingerprint is None else self.checks.get(fingerprint)
+
+    def get_durations(self, check: Check) -> List[float]:
+        entry = self.get_entry(check)
+        return [] if entry is None else entry.get("durations", [])
+
+    def get_duration(self, check: Check) -> Optional[float]:
+        """The check's typical duration, i.e. the median of its recent durations."""
+        durations = self.get_durations(check)
+        return statistics.median(durations) if durations else None
+
+    def last_passed(self, check: Check) -> bool:
+        entry = self.get_entry(check)
+        return entry is not None and entry["status"] in (status.value for status in PASSING_STATUSES)
+
+    def get_failure_rate(self, check: Check) -> float:
+        """How often the check has failed, smoothed so that a check with little history counts as a coin toss."""
+        entry = self.get_entry(check) or {}
+        passes, failures = entry.get("passes", 0), entry.get("failures", 0)
+        return (failures + 1) / (passes + failures + 2)
+
+    def record(self, check: Check, result: CheckResult):
+        fingerprint = self.fingerprint(check)
+        if fingerprint is None:
+            return
+        with self.lock:
+            entry = self.checks.setdefault(fingerprint, {"name": check.name})
+            self.updated_checks.add(fingerprint)
+            entry["status"] = result.status.value
+            entry["finished_at"] = time.time()
+            # A cached result says nothing about how long the check takes to run, nor whether it would pass now
+            if not result.cached:
+                entry["durations"] = (entry.get("durations", []) + [result.duration])[-DURATIONS_KEPT:]
+                outcome = "passes" if result.status in PASSING_STATUSES else "failures"
+                entry[outcome] = entry.get(outcome, 0) + 1
+
+    def mark_full_run(self, started_at: Optional[float] = None):
+        with self.lock:
+            self.full_runs[os.getcwd()] = time.time() if started_at is None else started_at
+            self.updated_full_runs.add(os.getcwd())
+
+    def get_last_full_run(self) -> Optional[float]:
+        return self.full_runs.get(os.getcwd())
+
+    def save(self):
+        with self.lock:
+            checks = {fingerprint: self.checks[fingerprint] for fingerprint in self.updated_checks}
+            full_runs = {directory: self.full_runs[directory] for directory in self.updated_full_runs}
+
+        def merge(contents: Optional[Any]) -> Dict[str, Any]:
+            contents = contents if isinstance(contents, dict) else {}
+            return {
+                "checks": {**contents.get("checks", {}), **checks},
+                "full_runs": {**contents.get("full_runs", {}), **full_runs},
+            }
+
+        update_cache_file(HISTORY_FILE, merge)
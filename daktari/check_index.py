@@ -0,0 +1,69 @@
+import fnmatch
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from daktari.check import Check
+from daktari.check_utils import get_all_dependent_check_names
+
+
+def compile_name_patterns(patterns: Iterable[str]) -> Callable[[str], bool]:
+    """Compile glob patterns such as "kubectl.*" into a single matcher for check names."""
+    regexes = [fnmatch.translate(pattern) for pattern in patterns]
+    if not regexes:
+        return lambda name: False
+    compiled = re.compile("|".join(f"(?:{regex})" for regex in regexes))
+    return lambda name: compiled.match(name) is not None
+
+
+class CheckIndex:
+    """Index of a config's checks by name, with each check's transitive dependencies computed once."""
+
+    def __init__(self, checks: List[Check]):
+        self.checks = checks
+        self.by_name: Dict[str, List[Check]] = {}
+        for check in checks:
+            self.by_name.setdefault(check.name, []).append(check)
+        self._dependency_names: Dict[int, Set[str]] = {}
+
+    def dependency_names(self, check: Check) -> Set[str]:
+        if id(check) not in self._dependency_names:
+            self._dependency_names[id(check)] = get_all_dependent_check_names(check)
+        return self._dependency_names[id(check)]
+
+    def dependency_closure(self, names: Iterable[str]) -> Set[str]:
+        """The given names, plus the names of every check they transitively depend on."""
+        # Follow the configured instances rather than just the dependency classes, since checks may set
+        # depends_on in their constructor
+        closure: Set[str] = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name in closure:
+                continue
+            closure.add(name)
+            for check in self.by_name.get(name, []):
+                pending.extend(self.dependency_names(check) - closure)
+        return closure
+
+    def dependents_of(self, names: Set[str]) -> Set[str]:
+        """The names of every check that transitively depends on any of the given names."""
+        return {check.name for check in self.checks if not self.dependency_names(check).isdisjoint(names)}
+
+    def select(
+        self, only_patterns: Optional[List[str]] = None, skip_patterns: Optional[List[str]] = None
+    ) -> List[Check]:
+        selected_names = set(self.by_name)
+        if only_patterns:
+            matches_only = compile_name_patterns(only_patterns)
+            selected_names = self.dependency_closure(name for name in self.by_name if matches_only(name))
+        if skip_patterns:
+            matches_skip = compile_name_patterns(skip_patterns)
+            skipped_names = {name for name in self.by_name if matches_skip(name)}
+            selected_names -= skipped_names | self.dependents_of(skipped_names)
+        return [check for check in self.checks if check.name in selected_names]
+
+
+def select_checks(
+    checks: List[Check], only_patterns: Optional[List[str]] = None, skip_patterns: Optional[List[str]] = None
+) -> List[Check]:
+    return CheckIndex(checks).select(only_patterns, skip_patterns)
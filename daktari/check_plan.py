@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from daktari.check import Check
+from daktari.check_history import CheckHistory
+from daktari.check_sorter import sort_checks
+from daktari.os import detect_os
+from daktari.result_cache import ResultCache
+
+
+@dataclass
+class PlannedCheck:
+    name: str
+    dependencies: List[str]
+    # Median of recent durations, or None if the check has never been timed
+    estimate: Optional[float]
+    cached: bool = False
+
+    def cost(self) -> float:
+        return 0.0 if self.cached else self.estimate or 0.0
+
+
+@dataclass
+class SkippedCheck:
+    name: str
+    reason: str
+
+
+@dataclass
+class ExecutionPlan:
+    checks: List[PlannedCheck]
+    skipped: List[SkippedCheck]
+    critical_path: List[PlannedCheck]
+
+    def total_estimate(self) -> float:
+        return path_cost(self.checks)
+
+    def critical_path_estimate(self) -> float:
+        return path_cost(self.critical_path)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "checks": [
+                {
+                    "name": check.name,
+                    "depends_on": check.dependencies,
+                    "estimate": check.estimate,
+                    "cached": check.cached,
+                }
+                for check in self.checks
+            ],
+            "skipped": [{"name": check.name, "reason": check.reason} for check in self.skipped],
+            "estimated_total": self.total_estimate(),
+            "critical_path": [check.name for check in self.critical_path],
+            "estimated_critical_path": self.critical_path_estimate(),
+        }
+
+
+def build_plan(
+    checks: List[Check],
+    ignored_checks: List[Check],
+    history: CheckHistory,
+    result_cache: Optional[ResultCache] = None,
+) -> ExecutionPlan:
+    """Work out what a run would do, without running anything: the order checks would run in, how long each is
+    expected to take, and the chain of dependent checks that bounds the run's duration however many run at once."""
+    current_os = detect_os()
+    runnable = [check for check in checks if check.should_run(current_os)]
+    skipped = [SkippedCheck(check.name, "ignored in local config") for check in ignored_checks]
+    skipped += [
+        SkippedCheck(check.name, "marked to skip" if check.skip else f"only runs on {check.run_on}")
+        for check in checks
+        if not check.should_run(current_os)
+    ]
+
+    runnable_names = {check.name for check in runnable}
+    planned = [
+        PlannedCheck(
+            check.name,
+            [dependency.name for dependency in check.depends_on if dependency.name in runnable_names],
+            history.get_duration(check),
+            result_cache is not None and result_cache.get(check) is not None,
+        )
+        for check in sort_checks(runnable)
+    ]
+    return ExecutionPlan(planned, skipped, find_critical_path(planned))
+
+
+def path_cost(path: List[PlannedCheck]) -> float:
+    return sum(check.cost() for check in path)
+
+
+def find_critical_path(planned: List[PlannedCheck]) -> List[PlannedCheck]:
+    """The most expensive chain of dependencies, given checks sorted so that dependencies come first."""
+    # The most expensive path ending in a check of each name
+    paths: Dict[str, List[PlannedCheck]] = {}
+    for check in planned:
+        dependency_paths = [paths.get(dependency, []) for dependency in check.dependencies]
+        path = max(dependency_paths, key=path_cost, default=[]) + [check]
+        if path_cost(path) >= path_cost(paths.get(check.name, [])):
+            paths[check.name] = path
+    return max(paths.values(), key=path_cost, default=[])
+
+
+def format_duration(check: PlannedCheck) -> str:
+    if check.cached:
+        return "cached"
+    return "?" if check.estimate is None else f"{check.estimate:.2f}s"
+
+
+def format_plan(plan: ExecutionPlan) -> str:
+    output = f"Execution plan for {len(plan.checks)} check(s):\n"
+    for idx, check in enumerate(plan.checks):
+        after = f"  (after {', '.join(check.dependencies)})" if check.dependencies else ""
+        output += f"  {idx + 1:3}. {format_duration(check):>8}  {check.name}{after}\n"
+
+    if plan.skipped:
+        output += f"\n{len(plan.skipped)} check(s) would be skipped:\n"
+        for skipped in plan.skipped:
+            output += f"  {skipped.name}: {skipped.reason}\n"
+
+    output += f"\nEstimated {plan.total_estimate():.2f}s one at a time"
+    output += f", at least {plan.critical_path_estimate():.2f}s however many run at once, due to:\n"
+    output += "".join(f"  {format_duration(check):>8}  {check.name}\n" for check in plan.critical_path)
+
+    untimed = [check for check in plan.checks if check.estimate is None and not check.cached]
+    if untimed:
+        output += f"\nⓘ  {len(untimed)} check(s) have never been timed, so count as 0s in these estimates\n"
+    return output
@@ -0,0 +1,40 @@
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from daktari.check import Check
+
+# How many checks may use any one resource at once, unless overridden with --resource-limit
+DEFAULT_RESOURCE_LIMIT = 2
+
+
+def parse_resource_limit(value: str) -> Tuple[str, int]:
+    """Parse NAME=N."""
+    name, separator, limit = value.partition("=")
+    if not separator or not name or not limit.isdigit() or int(limit) < 1:
+        raise ValueError(f"Expected NAME=N, got {value}")
+    return name, int(limit)
+
+
+class ResourceLimiter:
+    """Counts the resources, such as heavyweight tools, used by the checks running at once, to keep each within its
+    limit."""
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        self.limits = limits or {}
+        self.in_use: Counter = Counter()
+
+    def get_limit(self, resource: str) -> int:
+        return self.limits.get(resource, DEFAULT_RESOURCE_LIMIT)
+
+    def can_acquire(self, check: Check) -> bool:
+        # A check needing more than a resource's whole limit can still run, as long as it has the resource to itself
+        return all(
+            self.in_use[resource] == 0 or self.in_use[resource] + amount <= self.get_limit(resource)
+            for resource, amount in check.resources.items()
+        )
+
+    def acquire(self, check: Check):
+        self.in_use.update(check.resources)
+
+    def release(self, check: Check):
+        self.in_use.subtract(check.resources)
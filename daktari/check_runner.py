@@ -1,57 +1,318 @@
 import logging
-from typing import List, Set
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import nullcontext
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
 
 from daktari.check import Check, CheckStatus, CheckResult
-from daktari.check_sorter import sort_checks
+from daktari.check_history import CheckHistory
+from daktari.check_resources import ResourceLimiter
+from daktari.check_sorter import CONFIG_ORDER, FAIL_LIKELY_FIRST_ORDER, sort_checks, sort_checks_fail_likely_first
+from daktari.check_utils import get_check_id
+from daktari.command_utils import CancellationToken, use_cancellation_token
+from daktari.concurrency import AdaptiveConcurrency, DaemonThreadPool
+from daktari.last_run import LastRun
+from daktari.network import NetworkProbe, is_network_unreachable, use_network_probe
 from daktari.os import detect_os
-from daktari.result_printer import print_check_result
+from daktari.result_cache import ResultCache
+from daktari.result_formatter import ResultFormatter, TextFormatter, get_result_formatter
+from daktari.run_cache import clear_run_cache
+from daktari.status import write_status
+from daktari.timing_report import TimingReport
 
 
-def run_checks(checks: List[Check], quiet_mode: bool, fail_fast: bool) -> bool:
-    return CheckRunner(checks, quiet_mode, fail_fast).run()
+@dataclass
+class RunOptions:
+    """How to run a set of checks, and the state shared with other runs."""
+
+    quiet_mode: bool = False
+    fail_fast: bool = False
+    jobs: int = 1
+    # Adjusts how many of the `jobs` workers are used at once, if set
+    concurrency: Optional[AdaptiveConcurrency] = None
+    speculative: bool = False
+    order: str = CONFIG_ORDER
+    # The most checks using each heavyweight resource that may run at once
+    resource_limits: Dict[str, int] = field(default_factory=dict)
+    result_cache: Optional[ResultCache] = None
+    history: Optional[CheckHistory] = None
+    timing_report: Optional[TimingReport] = None
+    network_probe: Optional[NetworkProbe] = None
+    last_run: Optional[LastRun] = None
+    # Checks left out to stay within the time budget, and which of those can be assumed to pass
+    deferred: List[Check] = field(default_factory=list)
+    assumed_passed: Set[str] = field(default_factory=set)
+    # The config being run, whose status is recorded for `daktari status` at the end of the run
+    config_path: Optional[Path] = None
+
+
+def run_checks(checks: List[Check], options: Optional[RunOptions] = None, output_format: str = "text") -> bool:
+    options = options or RunOptions()
+    formatter = get_result_formatter(output_format, options.quiet_mode)
+    return CheckRunner(checks, options, formatter).run()
 
 
 class CheckRunner:
-    def __init__(self, checks: List[Check], quiet_mode: bool, fail_fast: bool):
+    def __init__(
+        self,
+        checks: List[Check],
+        options: Optional[RunOptions] = None,
+        formatter: Optional[ResultFormatter] = None,
+    ):
+        options = options or RunOptions()
         self.checks = [check for check in checks if check.should_run(detect_os())]
+        # Identified before they run, since running a check may change its attributes
+        self.check_ids = {id(check): get_check_id(check) for check in self.checks}
         self.all_passed = True
-        self.checks_passed: Set[str] = set()
-        self.quiet_mode = quiet_mode
-        self.fail_fast = fail_fast
+        # Deferred checks aren't run, but those known to have passed last time still satisfy their dependents
+        self.checks_passed: Set[str] = set(options.assumed_passed)
+        self.checks_failed: Set[str] = set()
+        # Outcomes by check id, as several checks may share a name
+        self.passed_ids: Set[str] = set()
+        self.failed_ids: Set[str] = set()
+        self.checks_finished = 0
+        # The check whose failure stopped a fail-fast run
+        self.failed_check: Optional[Check] = None
+        self.early_exit_reported = False
+        self.lock = threading.Lock()
+        self.quiet_mode = options.quiet_mode
+        self.fail_fast = options.fail_fast
+        self.formatter = formatter or TextFormatter(options.quiet_mode)
+        self.result_cache = options.result_cache
+        self.jobs = max(options.jobs, 1)
+        # Checks run one at a time finish their commands before the next starts, so only the command itself may need
+        # killing, and it keeps the terminal for prompts. In parallel, each command is isolated so it can be killed
+        # along with its children
+        self.cancellation = CancellationToken(isolate_processes=self.jobs > 1)
+        self.history = options.history
+        if self.history is not None:
+            self.history.track(self.checks)
+        self.deferred = options.deferred
+        self.speculative = options.speculative
+        self.timing_report = options.timing_report
+        self.order = options.order
+        self.network_probe = options.network_probe
+        self.resource_limits = options.resource_limits
+        self.concurrency = options.concurrency
+        self.last_run = options.last_run
+        self.config_path = options.config_path
 
     def run(self) -> bool:
-        for idx, check in enumerate(sort_checks(self.checks)):
-            self.try_run_check(idx, check)
-            if self.early_exit():
-                break
+        clear_run_cache()
+        self.formatter.start(len(self.checks), self.jobs)
+        # Only fail-fast runs cancel commands in flight
+        cancellation = use_cancellation_token(self.cancellation) if self.fail_fast else nullcontext()
+        with cancellation, use_network_probe(self.network_probe):
+            try:
+                if self.jobs > 1:
+                    self.run_in_parallel(self.ordered_checks())
+                else:
+                    for check in self.ordered_checks():
+                        self.try_run_check(check)
+                        if self.early_exit():
+                            break
+            except KeyboardInterrupt:
+                # Commands in their own process groups don't receive the interrupt themselves
+                self.cancellation.cancel()
+                raise
 
+        if self.deferred:
+            self.formatter.checks_deferred([check.name for check in self.deferred])
+        if self.timing_report is not None:
+            self.formatter.timings_reported(self.timing_report)
+        self.formatter.finish(self.all_passed)
+        if self.result_cache is not None:
+            self.result_cache.save()
+        if self.history is not None:
+            self.history.save()
+        if self.last_run is not None:
+            self.last_run.save()
+        if self.config_path is not None:
+            self.save_status(self.config_path)
         return self.all_passed
 
+    def save_status(self, config_path: Path):
+        failed = set(self.failed_ids)
+        if self.last_run is not None:
+            # Earlier failures still count for checks this run didn't pass, such as after --only or --rerun-failed
+            failed |= self.last_run.get_failed_ids() - self.passed_ids
+        write_status(config_path, not failed, len(failed))
+
+    def ordered_checks(self) -> List[Check]:
+        if self.order == FAIL_LIKELY_FIRST_ORDER and self.history is not None:
+            return sort_checks_fail_likely_first(self.checks, self.history)
+        return sort_checks(self.checks)
+
+    def run_in_parallel(self, sorted_checks: List[Check]):
+        """Run up to `jobs` checks at once, starting each as soon as all of its dependencies have finished.
+
+        In speculative mode, side-effect-free checks start straight away. Their results are held back until their
+        dependencies finish, and are only reported if those dependencies passed.
+
+        Checks using the same heavyweight resources are also held back, so that no more than each resource's limit
+        run at once.
+
+        With fail-fast, the first failure cancels the commands of any checks still in flight, and the run returns
+        without waiting for them to finish."""
+        unfinished = Counter(check.name for check in sorted_checks)
+        pending = list(sorted_checks)
+        running: Dict[Future, Check] = {}
+        speculating: Set[int] = set()
+        awaiting_dependencies: List[Tuple[Check, CheckResult]] = []
+        resources = ResourceLimiter(self.resource_limits)
+
+        def is_ready(check: Check) -> bool:
+            return all(unfinished[dependency.name] == 0 for dependency in check.depends_on)
+
+        def can_start(check: Check) -> bool:
+            return is_ready(check) or (self.speculative and check.side_effect_free)
+
+        def report_speculative_results():
+            while True:
+                ready = [(check, result) for check, result in awaiting_dependencies if is_ready(check)]
+                if not ready:
+                    return
+                for check, result in ready:
+                    awaiting_dependencies.remove((check, result))
+                    self.try_run_check(check, result)
+                    unfinished[check.name] -= 1
+
+        executor = DaemonThreadPool(self.jobs, thread_name_prefix="daktari-check")
+        try:
+            while pending or running or awaiting_dependencies:
+                if self.early_exit():
+                    pending, awaiting_dependencies = [], []
+                    # Don't wait for checks in flight, only for the failure that stopped the run to be reported
+                    if self.early_exit_reported:
+                        break
+                ready = [check for check in pending if can_start(check)]
+                # Only a dependency cycle leaves nothing ready and nothing running; let the check report it
+                if not ready and not running and pending:
+                    ready = pending[:1]
+                jobs = self.jobs if self.concurrency is None else self.concurrency.limit()
+                for check in ready:
+                    if len(running) >= jobs:
+                        break
+                    if not resources.can_acquire(check):
+                        continue
+                    resources.acquire(check)
+                    pending.remove(check)
+                    if is_ready(check):
+                        running[executor.submit(self.try_run_check, check)] = check
+                    else:
+                        speculating.add(id(check))
+                        running[executor.submit(self.run_speculatively, check)] = check
+                if not running:
+                    # Anything still waiting on its dependencies is part of a cycle, and will be reported as skipped
+                    for check, result in awaiting_dependencies:
+                        self.try_run_check(check, result)
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    check = running.pop(future)
+                    resources.release(check)
+                    if self.concurrency is not None:
+                        self.concurrency.check_finished()
+                    if id(check) in speculating:
+                        awaiting_dependencies.append((check, future.result()))
+                    else:
+                        future.result()
+                        unfinished[check.name] -= 1
+                report_speculative_results()
+        finally:
+            executor.shutdown()
+
+    def run_speculatively(self, check: Check) -> CheckResult:
+        self.formatter.check_started(check.name, self.check_ids[id(check)])
+        return self.get_cached_result(check) or self.run_check_in_try(check)
+
     def early_exit(self) -> bool:
         return self.fail_fast and not self.all_passed
 
-    def try_run_check(self, idx: int, check: Check):
+    def try_run_check(self, check: Check, speculative_result: Optional[CheckResult] = None):
         dependencies_met = all([dependency.name in self.checks_passed for dependency in check.depends_on])
-        result = self.run_check(check) if dependencies_met else self.diagnose_missing_dependency(check)
-        print_check_result(result, self.early_exit(), self.quiet_mode, idx, len(self.checks))
-
-    def run_check(self, check: Check) -> CheckResult:
-        logging.info(f"Running check {check.name}")
-        result = self.run_check_in_try(check)
-        if result.status in (CheckStatus.PASS, CheckStatus.PASS_WITH_WARNING):
-            self.checks_passed.add(check.name)
+        offline = dependencies_met and self.is_offline_for(check)
+        if dependencies_met and not offline and speculative_result is None:
+            self.formatter.check_started(check.name, self.check_ids[id(check)])
+        # A result obtained speculatively is discarded if the check's dependencies didn't pass
+        if not dependencies_met:
+            result = self.diagnose_missing_dependency(check)
+        elif offline:
+            # Not a pass, so that the run fails and the check runs again once the network is back
+            result = check.failed("skipped as the network is unreachable", {})
+            self.record_outcome(check, result)
         else:
-            self.all_passed = False
+            result = self.run_check(check, speculative_result)
+        result = replace(result, check_id=self.check_ids.get(id(check)))
+        with self.lock:
+            # Checks that were in flight when fail-fast stopped the run are abandoned rather than reported
+            if self.failed_check is not None and check is not self.failed_check:
+                return
+            early_exit = self.failed_check is not None
+            self.early_exit_reported = early_exit
+            idx = self.checks_finished
+            self.checks_finished += 1
+            self.formatter.check_finished(result, idx, len(self.checks), early_exit)
+        if self.last_run is not None:
+            self.last_run.record(self.check_ids[id(check)], result)
+
+    def run_check(self, check: Check, result: Optional[CheckResult] = None) -> CheckResult:
+        result = result or self.get_cached_result(check) or self.run_check_in_try(check)
+        if not self.record_outcome(check, result):
+            # Abandoned after fail-fast stopped the run, so the result may only reflect its commands being killed
+            return result
+        if self.history is not None:
+            # Compare against the durations recorded before this run
+            if self.timing_report is not None and not result.cached:
+                self.timing_report.add(check.name, result.duration, self.history.get_durations(check))
+            self.history.record(check, result)
 
         return result
 
+    def record_outcome(self, check: Check, result: CheckResult) -> bool:
+        """Note whether the check passed, returning False if a fail-fast failure has already stopped the run."""
+        with self.lock:
+            if self.failed_check is not None:
+                return False
+            if result.status in (CheckStatus.PASS, CheckStatus.PASS_WITH_WARNING):
+                self.checks_passed.add(check.name)
+                self.passed_ids.add(self.check_ids[id(check)])
+            else:
+                self.all_passed = False
+                self.checks_failed.add(check.name)
+                self.failed_ids.add(self.check_ids[id(check)])
+                if self.fail_fast:
+                    self.failed_check = check
+                    self.cancellation.cancel()
+        return True
+
+    def get_cached_result(self, check: Check) -> Optional[CheckResult]:
+        return self.result_cache.get(check) if self.result_cache is not None else None
+
     def run_check_in_try(self, check: Check) -> CheckResult:
+        logging.info(f"Running check {check.name}")
+        start_time = time.monotonic()
+        result = self.run_check_catching_errors(check)
+        result = replace(result, duration=time.monotonic() - start_time)
+        if self.result_cache is not None and not self.cancellation.cancelled:
+            self.result_cache.put(check, result)
+        return result
+
+    def run_check_catching_errors(self, check: Check) -> CheckResult:
         try:
             return check.check()
         except Exception as err:
             logging.debug(f"Exception running check {check.name}", exc_info=True)
             return CheckResult(check.name, CheckStatus.ERROR, f"Check failed with unhandled {type(err).__name__}", {})
 
+    def is_offline_for(self, check: Check) -> bool:
+        return check.requires_network and is_network_unreachable()
+
     def diagnose_missing_dependency(self, check: Check) -> CheckResult:
         all_checks = {check.name for check in self.checks}
         check_dependencies = {dependency.name for dependency in check.depends_on}
@@ -0,0 +1,45 @@
+from typing import List, Set, Tuple
+
+from daktari.check import Check
+from daktari.check_history import CheckHistory
+from daktari.check_index import CheckIndex
+from daktari.check_sorter import UNKNOWN_DURATION
+from daktari.os import detect_os
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse I/N, where shards are numbered from 1 to N."""
+    index, separator, count = value.partition("/")
+    if not separator or not index.isdigit() or not count.isdigit() or not 1 <= int(index) <= int(count):
+        raise ValueError(f"Expected I/N with 1 <= I <= N, got {value}")
+    return int(index), int(count)
+
+
+def partition_checks(checks: List[Check], shard_count: int, history: CheckHistory) -> List[List[Check]]:
+    """Split checks into shards that can each run on their own, balanced by how long their checks took in recent runs.
+
+    Each check that nothing depends on is given to the shard it adds the least time to, largest first, and brings its
+    dependencies along. So prerequisites shared between shards, such as GitInstalled, run in each of them. Every job
+    must see the same history to agree on the shards."""
+    checks = [check for check in checks if check.should_run(detect_os())]
+    index = CheckIndex(checks)
+
+    def cost(names: Set[str]) -> float:
+        durations = [history.get_duration(check) for name in names for check in index.by_name.get(name, [])]
+        return sum(UNKNOWN_DURATION if duration is None else duration for duration in durations)
+
+    depended_on = {name for check in checks for name in index.dependency_names(check)}
+    closures = {name: index.dependency_closure([name]) for name in index.by_name if name not in depended_on}
+    shards: List[Set[str]] = [set() for _ in range(shard_count)]
+    loads = [0.0] * shard_count
+    for name in sorted(closures, key=lambda name: (-cost(closures[name]), name)):
+        added_costs = [cost(closures[name] - shard) for shard in shards]
+        best = min(range(shard_count), key=lambda i: (loads[i] + added_costs[i], i))
+        loads[best] += added_costs[best]
+        shards[best] |= closures[name]
+    return [[check for check in checks if check.name in shard] for shard in shards]
+
+
+def select_shard(checks: List[Check], shard: Tuple[int, int], history: CheckHistory) -> List[Check]:
+    index, count = shard
+    return partition_checks(checks, count, history)[index - 1]
@@ -1,8 +1,16 @@
-from typing import Dict, List, Set, TypeVar
+from collections import Counter
+from typing import Callable, Dict, List, Set, TypeVar
 
 from daktari.check import Check
+from daktari.check_history import CheckHistory
 from daktari.check_utils import get_all_dependent_check_names
 
+CONFIG_ORDER = "config"
+FAIL_LIKELY_FIRST_ORDER = "fail-likely-first"
+CHECK_ORDERS = [CONFIG_ORDER, FAIL_LIKELY_FIRST_ORDER]
+# Assumed for checks that have never been timed
+UNKNOWN_DURATION = 1.0
+
 
 def dependency_graph(checks: List[Check]) -> Dict[str, Set[str]]:
     return {check.name: get_all_dependent_check_names(check) for check in checks}
@@ -31,3 +39,30 @@ def sort_checks(checks: List[Check]) -> List[Check]:
         return sorted_check_names.index(check.name)
 
     return sorted(checks, key=get_topo_order)
+
+
+def sort_checks_by_priority(checks: List[Check], priority: Callable[[Check], float]) -> List[Check]:
+    """Repeatedly pick the highest priority check whose dependencies have all been picked, keeping the order from
+    sort_checks between checks of equal priority."""
+    remaining = sort_checks(checks)
+    unpicked = Counter(check.name for check in remaining)
+    result: List[Check] = []
+    while remaining:
+        ready = [check for check in remaining if all(unpicked[dependency.name] == 0 for dependency in check.depends_on)]
+        # sort_checks has already ruled out cycles, so the first remaining check is always ready
+        check = max(ready, key=priority)
+        remaining.remove(check)
+        unpicked[check.name] -= 1
+        result.append(check)
+    return result
+
+
+def sort_checks_fail_likely_first(checks: List[Check], history: CheckHistory) -> List[Check]:
+    """Order checks to find the first failure as soon as possible: among the checks whose dependencies have run, the
+    one most likely to fail per second it takes goes first."""
+
+    def failures_per_second(check: Check) -> float:
+        duration = history.get_duration(check)
+        return history.get_failure_rate(check) / max(UNKNOWN_DURATION if duration is None else duration, 0.001)
+
+    return sort_checks_by_priority(checks, failures_per_second)
@@ -1,4 +1,10 @@
-from typing import Union, Type, Set
+import hashlib
+import json
+import logging
+import os
+from datetime import timedelta
+from enum import Enum
+from typing import Any, Optional, Union, Type, Set
 
 from daktari.check import Check
 from daktari.collection_utils import flatten
@@ -25,3 +31,59 @@ def _get_all_dependent_check_names_recursive(check: Union[Check, Type[Check]]) -
     sub_dependents = [_get_all_dependent_check_names_recursive(dep) for dep in check.depends_on]
     flat_sub_dependents = flatten(sub_dependents)
     return flat_sub_dependents.union({dep.name for dep in check.depends_on})
+
+
+class UnstableFingerprintException(Exception):
+    pass
+
+
+def _fingerprint_value(value: Any, lenient: bool = False) -> Any:
+    """A JSON-serialisable form of an attribute that is the same in every run, as reprs of most objects aren't.
+
+    If lenient, values that can't be identified that way stand in as their type rather than raising."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_fingerprint_value(item, lenient) for item in value]
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        return {key: _fingerprint_value(item, lenient) for key, item in value.items()}
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, Check):
+        return value.name
+    if isinstance(value, Enum):
+        return _fingerprint_value(value.value, lenient)
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if lenient:
+        return f"<{type(value).__module__}.{type(value).__qualname__}>"
+    raise UnstableFingerprintException(f"Can't fingerprint {type(value).__name__}")
+
+
+def _get_check_identity(check: Check, lenient: bool = False) -> str:
+    check_type = type(check)
+    arguments = json.dumps(_fingerprint_value(vars(check), lenient), sort_keys=True)
+    return f"{check_type.__module__}.{check_type.__qualname__}:{check.name}:{arguments}"
+
+
+def get_check_fingerprint(check: Check) -> Optional[str]:
+    """Identify a check by its type, name and constructor arguments, stable across runs.
+
+    Unless the check is machine-wide, the project it is run from is part of its identity too. Returns None for checks
+    with attributes that can't be identified the same way in every run, such as functions, so they are never cached."""
+    try:
+        identity = _get_check_identity(check)
+    except UnstableFingerprintException:
+        logging.debug(f"Not fingerprinting check {check.name}", exc_info=True)
+        return None
+    if not check.is_machine_wide():
+        identity += f":{os.getcwd()}"
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def get_check_id(check: Check) -> str:
+    """Tell apart checks in a config that share a name, such as several file.exists checks, in reports.
+
+    Unlike the fingerprint it is the same whichever directory the config is run from, so shards of a run on different
+    machines agree on it, and attributes with no stable identity count only by their type."""
+    return hashlib.sha256(_get_check_identity(check, lenient=True).encode()).hexdigest()[:16]
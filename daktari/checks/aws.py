@@ -5,6 +5,7 @@ from daktari.os import OS
 
 class AWSCLIInstalled(Check):
     name = "aws.cliInstalled"
+    machine_wide = True
 
     suggestions = {
         OS.OS_X: """<cmd>curl "https://awscli.amazonaws.com/AWSCLIV2.pkg" -o "AWSCLIV2.pkg" && \
@@ -1,6 +1,8 @@
 import logging
 import os
-from datetime import datetime
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import List
 from OpenSSL import crypto
 
 from daktari.check import Check, CheckResult
@@ -9,6 +11,7 @@ from daktari.os import OS
 
 class CertificateIsNotExpired(Check):
     name = "certificate.isNotExpired"
+    cache_ttl = timedelta(days=1)
 
     def __init__(self, certificate_path: str):
         self.certificate_path = certificate_path
@@ -16,6 +19,9 @@ class CertificateIsNotExpired(Check):
             OS.GENERIC: f"Regenerate the certificate at {certificate_path}",
         }
 
+    def get_input_paths(self) -> List[str]:
+        return [self.certificate_path]
+
     def check(self) -> CheckResult:
         with open(self.certificate_path, "rb") as f:
             cert = crypto.load_certificate(crypto.FILETYPE_PEM, f.read())
@@ -29,6 +35,7 @@ class CertificateIsNotExpired(Check):
 
             expiry = datetime.strptime(expiry_bytes.decode(), "%Y%m%d%H%M%SZ")
             if expiry > datetime.now():
-                return self.passed(f"{os.path.basename(self.certificate_path)} is not expired")
+                result = self.passed(f"{os.path.basename(self.certificate_path)} is not expired")
+                return replace(result, valid_until=expiry.replace(tzinfo=timezone.utc).timestamp())
             else:
                 return self.failed(f"{os.path.basename(self.certificate_path)} expired on {expiry}")
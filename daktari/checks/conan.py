@@ -1,10 +1,54 @@
 import json
 import logging
-from typing import Optional
+import os
+from json import JSONDecodeError
+from typing import Any, Dict, List, Optional
 
 from daktari.check import Check, CheckResult
 from daktari.command_utils import get_stdout
+from daktari.file_utils import file_exists
 from daktari.os import OS
+from daktari.run_cache import run_cached
+
+
+def get_conan_home() -> str:
+    return os.environ.get("CONAN_HOME") or os.path.expanduser("~/.conan2")
+
+
+@run_cached
+def read_conan_remotes_file(remotes_path: str) -> Optional[List[Dict[str, Any]]]:
+    try:
+        with open(remotes_path, "rb") as remotes_file:
+            remotes = json.load(remotes_file).get("remotes", [])
+    except (IOError, JSONDecodeError):
+        logging.debug(f"Exception reading {remotes_path}", exc_info=True)
+        return None
+
+    # Match the shape of `conan remote list -f json`, which reports "enabled" rather than "disabled"
+    return [{**remote, "enabled": not remote.get("disabled", False)} for remote in remotes]
+
+
+@run_cached
+def read_conan_remotes_from_cli() -> Optional[List[Dict[str, Any]]]:
+    output = get_stdout("conan remote list -f json")
+    return None if output is None else json.loads(output)
+
+
+def get_conan_remotes() -> Optional[List[Dict[str, Any]]]:
+    remotes_path = os.path.join(get_conan_home(), "remotes.json")
+    if file_exists(remotes_path):
+        return read_conan_remotes_file(remotes_path)
+    return read_conan_remotes_from_cli()
+
+
+@run_cached
+def get_conan_remote_users() -> Optional[List[Dict[str, Any]]]:
+    output = get_stdout("conan remote list-users -f json")
+    return None if output is None else json.loads(output)
+
+
+def find_remote(remotes: List[Dict[str, Any]], remote_name: str) -> Optional[Dict[str, Any]]:
+    return next(filter(lambda remote_details: remote_details.get("name") == remote_name, remotes), None)
 
 
 class ConanInstalled(Check):
@@ -43,11 +87,10 @@ class ConanRemoteDetected(Check):
         self.depends_on = [ConanInstalled]
 
     def check(self) -> CheckResult:
-        output = get_stdout("conan remote list -f json")
-        if output is None:
+        remotes = get_conan_remotes()
+        if remotes is None:
             return self.failed("No conan remotes configured for the current user.")
-        remote_json = json.loads(output)
-        remote = next(filter(lambda remote_details: remote_details.get("name") == self.remote_name, remote_json), None)
+        remote = find_remote(remotes, self.remote_name)
         if remote is None:
             return self.failed(f"{self.remote_name} conan remote is not configured for the current user.")
 
@@ -55,22 +98,24 @@ class ConanRemoteDetected(Check):
         logging.debug(f"{self.remote_name} conan remote is configured with URL {configured_url}.")
 
         if configured_url != self.remote_url:
-            self.suggestions = {
-                OS.GENERIC: f"<cmd>conan remote update --url {self.remote_url} {self.remote_name}</cmd>"
-            }
             return self.failed(
-                f"{self.remote_name} conan remote is configured with URL {configured_url}, expected {self.remote_url}"
+                f"{self.remote_name} conan remote is configured with URL {configured_url}, expected {self.remote_url}",
+                {OS.GENERIC: f"<cmd>conan remote update --url {self.remote_url} {self.remote_name}</cmd>"},
             )
 
         if not remote["enabled"]:
-            self.suggestions = {OS.GENERIC: f"<cmd>conan remote enable {self.remote_name}</cmd>"}
-            return self.failed(f"{self.remote_name} conan remote is not enabled.")
+            return self.failed(
+                f"{self.remote_name} conan remote is not enabled.",
+                {OS.GENERIC: f"<cmd>conan remote enable {self.remote_name}</cmd>"},
+            )
 
         return self.passed(f"{self.remote_name} conan remote is configured for the current user.")
 
 
 class ConanRemoteAuthenticated(Check):
     name = "conan.remoteAuthenticated"
+    # Unlike the other conan checks, which only read local config, this one runs conan against its remotes
+    resources = {"conan": 1}
 
     def __init__(self, remote_name: str, authentication_command: Optional[str] = None):
         self.suggestions = (
@@ -82,11 +127,10 @@ class ConanRemoteAuthenticated(Check):
         self.depends_on = [ConanRemoteDetected]
 
     def check(self) -> CheckResult:
-        output = get_stdout("conan remote list-users -f json")
-        if output is None:
+        remote_users = get_conan_remote_users()
+        if remote_users is None:
             return self.failed("No conan remotes configured for the current user.")
-        remote_json = json.loads(output)
-        remote = next(filter(lambda remote_details: remote_details.get("name") == self.remote_name, remote_json), None)
+        remote = find_remote(remote_users, self.remote_name)
         if remote is None:
             return self.failed(f"{self.remote_name} conan remote is not configured for the current user.")
 
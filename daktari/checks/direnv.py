@@ -6,7 +6,7 @@ from daktari.os import OS
 from daktari.check import Check, CheckResult
 from daktari.version_utils import get_simple_cli_version
 from daktari.file_utils import file_contains_text
-from typing import Optional
+from typing import List, Optional
 from os import getcwd
 
 
@@ -31,6 +31,7 @@ class DirenvInstalled(Check):
 
 class EnvrcContainsText(Check):
     name = "direnv.envrc.containsText"
+    side_effect_free = True
 
     def __init__(self, expected_string: str, suggestion: str):
         self.file_path = f"{getcwd()}/.envrc"
@@ -38,6 +39,9 @@ class EnvrcContainsText(Check):
         self.pass_fail_message = f"{self.file_path} does <not/> contain '{expected_string}'"
         self.suggestions = {OS.GENERIC: suggestion}
 
+    def get_input_paths(self) -> List[str]:
+        return [self.file_path]
+
     def check(self) -> CheckResult:
         return self.verify(file_contains_text(self.file_path, self.expected_string), self.pass_fail_message)
 
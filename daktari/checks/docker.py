@@ -1,5 +1,6 @@
 import logging
 import re
+from datetime import timedelta
 from typing import Optional
 
 from daktari.file_utils import dir_exists
@@ -13,6 +14,7 @@ from daktari.version_utils import try_parse_semver
 
 class DockerInstalled(Check):
     name = "docker.installed"
+    machine_wide = True
 
     suggestions = {
         OS.GENERIC: "Install docker: https://docs.docker.com/get-docker/",
@@ -44,6 +46,7 @@ def get_docker_version() -> Optional[VersionInfo]:
 
 class DockerComposeInstalled(Check):
     name = "docker-compose.installed"
+    machine_wide = True
 
     suggestions = {OS.GENERIC: "Install docker-compose: https://docs.docker.com/compose/install/"}
 
@@ -64,6 +67,7 @@ def get_orbstack_version() -> Optional[VersionInfo]:
 
 class OrbStackInstalled(Check):
     name = "orbstack.installed"
+    machine_wide = True
     suggestions = {OS.GENERIC: "Install orbstack: https://docs.orbstack.dev/install and sign in."}
 
     def __init__(self, required_version: Optional[str] = None):
@@ -76,7 +80,9 @@ class OrbStackInstalled(Check):
 
 class DockerDesktopNotInstalled(Check):
     name = "docker-desktop.not-installed"
+    machine_wide = True
     run_on = OS.OS_X
+    cache_ttl = timedelta(hours=12)
     suggestions = {
         OS.OS_X: "Uninstall Docker Desktop. Open Applications and delete Docker.app",
     }
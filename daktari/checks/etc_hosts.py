@@ -1,3 +1,5 @@
+from typing import List
+
 from daktari.check import Check, CheckResult
 from daktari.os import OS
 
@@ -8,7 +10,9 @@ from daktari.os import OS
 
 class EtcHostsFormattedCorrectly(Check):
     name = "etc.hosts.formattedCorrectly"
+    machine_wide = True
     description = "Check if /etc/hosts is formatted correctly with consistent use of tabs and spaces"
+    side_effect_free = True
 
     def __init__(self):
         self.suggestions = {
@@ -18,6 +22,9 @@ class EtcHostsFormattedCorrectly(Check):
             + r"<cmd>sudo sed -Ei 's:( |\t)+: :g' /etc/hosts</cmd>",
         }
 
+    def get_input_paths(self) -> List[str]:
+        return ["/etc/hosts"]
+
     def check(self) -> CheckResult:
         with open("/etc/hosts", "r") as f:
             content = f.read()
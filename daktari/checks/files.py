@@ -10,11 +10,15 @@ class FilesExist(Check):
     name = "files.exist"
     file_paths: List[str] = []
     pass_fail_message = ""
+    side_effect_free = True
 
     def check(self) -> CheckResult:
         files_exist = all([file_exists(expanduser(file_path)) for file_path in self.file_paths])
         return self.verify(files_exist, self.pass_fail_message)
 
+    def get_input_paths(self) -> List[str]:
+        return self.file_paths
+
 
 class FileExists(FilesExist):
     name = "file.exists"
@@ -29,6 +33,7 @@ class DirsExist(Check):
     name = "directories.exist"
     dir_paths: List[str] = []
     pass_fail_message = ""
+    side_effect_free = True
 
     def check(self) -> CheckResult:
         dirs_exist = all([dir_exists(expanduser(dir_path)) for dir_path in self.dir_paths])
@@ -60,6 +65,9 @@ class FilesOwnedByUser(Check):
         self.pass_fail_message = pass_fail_message or f"{file_paths_str} are <not/> owned by {expected_owner}"
         self.follow_symlinks = follow_symlinks
 
+    def get_input_paths(self) -> List[str]:
+        return self.file_paths
+
     def check(self) -> CheckResult:
         for file_path in self.file_paths:
             expanded_file_path = expanduser(file_path)
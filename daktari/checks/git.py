@@ -1,15 +1,19 @@
 import logging
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 from daktari.check import Check, CheckResult
-from daktari.command_utils import can_run_command, get_stdout
-from daktari.file_utils import file_contains_text, is_ascii
+from daktari.command_utils import can_run_command, get_stdout, stream_stdout_lines
+from daktari.file_utils import file_contains_text, file_exists, is_git_crypt_encrypted
+from daktari.git_attributes import get_paths_with_filter
+from daktari.git_config import describe_git_config_origin, describe_git_config_value, get_git_config
 from daktari.os import OS
 from daktari.version_utils import get_simple_cli_version
 
 
 class GitInstalled(Check):
     name = "git.installed"
+    machine_wide = True
 
     suggestions = {
         OS.OS_X: "<cmd>brew install git</cmd>",
@@ -26,6 +30,7 @@ class GitInstalled(Check):
 
 class GitLfsInstalled(Check):
     name = "git.lfs.installed"
+    machine_wide = True
     depends_on = [GitInstalled]
 
     suggestions = {
@@ -66,17 +71,37 @@ class GitLfsFilesDownloaded(Check):
             """
     }
 
+    def __init__(self, stop_after_missing: Optional[int] = None):
+        self.stop_after_missing = stop_after_missing
+
     def check(self) -> CheckResult:
-        output = get_stdout("git lfs ls-files") or ""
-        files_not_downloaded = [line.split()[2] for line in output.splitlines() if line.split()[1] == "-"]
-        for file in files_not_downloaded:
-            logging.info(f"Git LFS file not downloaded: {file}")
-        passed = len(files_not_downloaded) == 0
-        return self.verify(passed, "Git LFS files have <not/> been downloaded")
+        missing_count = count_git_lfs_files_not_downloaded(self.stop_after_missing)
+        if missing_count == 0:
+            return self.passed("Git LFS files have been downloaded")
+
+        at_least = "at least " if missing_count == self.stop_after_missing else ""
+        return self.failed(f"Git LFS files have not been downloaded ({at_least}{missing_count} missing)")
+
+
+def count_git_lfs_files_not_downloaded(stop_after: Optional[int] = None) -> int:
+    missing_count = 0
+    try:
+        for line in stream_stdout_lines("git lfs ls-files"):
+            # Each line is "<oid> <*|-> <path>", where - means only the pointer file is present
+            parts = line.split(maxsplit=2)
+            if len(parts) == 3 and parts[1] == "-":
+                logging.info(f"Git LFS file not downloaded: {parts[2]}")
+                missing_count += 1
+                if missing_count == stop_after:
+                    break
+    except Exception:
+        logging.debug("Exception listing Git LFS files", exc_info=True)
+    return missing_count
 
 
 class GitCryptInstalled(Check):
     name = "git.crypt.installed"
+    machine_wide = True
     depends_on = [GitInstalled]
 
     suggestions = {
@@ -92,6 +117,7 @@ class GitCryptInstalled(Check):
 class GitCryptUnlocked(Check):
     name = "git.crypt.unlocked"
     depends_on = [GitCryptInstalled]
+    side_effect_free = True
 
     def __init__(self, fileToCheck: str):
         self.fileToCheck = fileToCheck
@@ -103,11 +129,63 @@ class GitCryptUnlocked(Check):
             """,
     }
 
+    def get_input_paths(self) -> List[str]:
+        return [self.fileToCheck]
+
     def check(self) -> CheckResult:
-        is_unlocked = is_ascii(self.fileToCheck)
+        is_unlocked = file_exists(self.fileToCheck) and not is_git_crypt_encrypted(self.fileToCheck)
         return self.verify(is_unlocked, "Encrypted files have <not/> been unlocked")
 
 
+def get_git_tracked_files() -> Optional[List[str]]:
+    output = get_stdout(["git", "ls-files", "-z"])
+    if output is None:
+        return None
+    return [path for path in output.split("\0") if path]
+
+
+def is_git_crypt_locked(path: str) -> bool:
+    # Files deleted from the working copy can't be locked
+    try:
+        return is_git_crypt_encrypted(path)
+    except FileNotFoundError:
+        return False
+
+
+def get_git_crypt_locked_files(paths: List[str], max_workers: int = 16) -> List[str]:
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        locked = executor.map(is_git_crypt_locked, paths)
+        return [path for path, is_locked in zip(paths, locked) if is_locked]
+
+
+class GitCryptAllFilesUnlocked(Check):
+    name = "git.crypt.allFilesUnlocked"
+    depends_on = [GitCryptInstalled]
+
+    suggestions = {
+        OS.GENERIC: """
+            Unlock this repository with:
+            <cmd>git-crypt unlock</cmd>
+            """,
+    }
+
+    def check(self) -> CheckResult:
+        tracked_files = get_git_tracked_files()
+        if tracked_files is None:
+            return self.failed("Could not list the files tracked in this repository")
+
+        encrypted_files = get_paths_with_filter(tracked_files, "git-crypt")
+        locked_files = get_git_crypt_locked_files(encrypted_files)
+        for file in locked_files:
+            logging.info(f"git-crypt file not unlocked: {file}")
+
+        return self.verify(
+            len(locked_files) == 0,
+            f"All {len(encrypted_files)} encrypted files have been unlocked",
+            f"{len(locked_files)} of {len(encrypted_files)} encrypted files have not been unlocked",
+        )
+
+
 class PreCommitInstalled(Check):
     name = "preCommit.installed"
     depends_on = [GitInstalled]
@@ -131,11 +209,15 @@ class PreCommitInstalled(Check):
 class PreCommitGitHooksInstalled(Check):
     name = "preCommit.gitHooksInstalled"
     depends_on = [PreCommitInstalled]
+    side_effect_free = True
 
     suggestions = {
         OS.GENERIC: "<cmd>pre-commit install</cmd>",
     }
 
+    def get_input_paths(self) -> List[str]:
+        return [".git/hooks/pre-commit"]
+
     def check(self) -> CheckResult:
         git_hooks_installed = file_contains_text(".git/hooks/pre-commit", "pre-commit.com")
         return self.verify(git_hooks_installed, "pre-commit Git hooks are <not/> installed")
@@ -143,6 +225,7 @@ class PreCommitGitHooksInstalled(Check):
 
 class GpgInstalled(Check):
     name = "gpg.installed"
+    machine_wide = True
 
     suggestions = {
         OS.OS_X: "<cmd>brew install gpg2 gnupg pinentry-mac</cmd>",
@@ -165,9 +248,13 @@ class GitCommitSigningSetUp(Check):
     }
 
     def check(self) -> CheckResult:
-        key = get_stdout("git config user.signingkey")
+        key = get_git_config("user.signingkey")
         passed = key is not None and key != ""
-        return self.verify(passed, "user.signingkey is <not/> set")
+        return self.verify(
+            passed,
+            "user.signingkey is <not/> set",
+            f"user.signingkey is not set{describe_git_config_origin('user.signingkey')}",
+        )
 
 
 class GitCommitAutoSigningEnabled(Check):
@@ -177,9 +264,13 @@ class GitCommitAutoSigningEnabled(Check):
     suggestions = {OS.GENERIC: "<cmd>git config commit.gpgsign true</cmd>"}
 
     def check(self) -> CheckResult:
-        setting = get_stdout("git config commit.gpgsign")
+        setting = get_git_config("commit.gpgsign")
         passed = setting == "true"
-        return self.verify(passed, "commit.gpgsign is <not/> enabled")
+        return self.verify(
+            passed,
+            "commit.gpgsign is <not/> enabled",
+            f"commit.gpgsign is not enabled{describe_git_config_value('commit.gpgsign')}",
+        )
 
 
 class GitCommitSigningFormat(Check):
@@ -190,9 +281,9 @@ class GitCommitSigningFormat(Check):
         self.suggestions = {OS.GENERIC: suggestion}
 
     def check(self) -> CheckResult:
-        format_setting = get_stdout("git config gpg.format")
+        format_setting = get_git_config("gpg.format")
         return self.verify(
             format_setting == self.required_format,
             f"gpg.format is {self.required_format}",
-            f"gpg.format is not {self.required_format}: {format_setting}",
+            f"gpg.format is not {self.required_format}: {format_setting}{describe_git_config_origin('gpg.format')}",
         )
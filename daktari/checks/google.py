@@ -1,18 +1,25 @@
+import hashlib
 import json
 import logging
 import os.path
+import time
+from datetime import datetime, timedelta, timezone
 from json import JSONDecodeError
 from typing import Optional
 
+from daktari.cache_utils import read_cache_file, write_cache_file
 from daktari.check import Check, CheckResult
-from daktari.command_utils import can_run_command
+from daktari.command_utils import can_run_command, get_stdout
 from daktari.file_utils import file_exists
+from daktari.network import is_network_unreachable
 from daktari.os import OS
 from daktari.version_utils import get_simple_cli_version
 
 
 class GoogleCloudSdkInstalled(Check):
     name = "google.cloudSdkInstalled"
+    machine_wide = True
+    resources = {"gcloud": 1}
 
     suggestions = {
         OS.OS_X: """<cmd>brew install --cask google-cloud-sdk</cmd>
@@ -63,9 +70,90 @@ class GkeGcloudAuthPluginInstalled(Check):
         return self.verify(can_run_command("gke-gcloud-auth-plugin --version "), "GKE auth plugin is <not/> installed")
 
 
+ADC_TOKEN_CACHE_FILE = "gcloud-adc-token.json"
+# Don't reuse a token this close to its expiry
+ACCESS_TOKEN_EXPIRY_MARGIN = timedelta(minutes=5)
+
+
+def get_gcloud_config_dir() -> str:
+    return os.environ.get("CLOUDSDK_CONFIG") or os.path.expanduser("~/.config/gcloud")
+
+
+def get_credentials_key(credentials_path: str) -> Optional[str]:
+    """A key identifying this version of the credentials file, or None if it can't be read. Rewriting the file changes
+    its key, even if the contents stay the same."""
+    try:
+        modified_time = os.stat(credentials_path).st_mtime_ns
+        with open(credentials_path, "rb") as credentials_file:
+            contents = credentials_file.read()
+        credentials = json.loads(contents)
+    except (IOError, ValueError):
+        logging.debug(f"Exception reading {credentials_path}", exc_info=True)
+        return None
+    if not isinstance(credentials, dict):
+        return None
+    return f"{modified_time}:{hashlib.sha256(contents).hexdigest()}"
+
+
+def parse_access_token_expiry(output: str) -> Optional[float]:
+    """Read the expiry from the output of `gcloud auth application-default print-access-token --format=json`."""
+    try:
+        token = json.loads(output)
+        # gcloud reports expiry times as naive UTC timestamps
+        expiry = datetime.fromisoformat(str(token["expiry"]))
+    except (ValueError, TypeError, KeyError):
+        logging.debug("Could not read the access token expiry", exc_info=True)
+        return None
+    if expiry.tzinfo is None:
+        expiry = expiry.replace(tzinfo=timezone.utc)
+    return expiry.timestamp()
+
+
+def get_recorded_adc_token_expiry(credentials_key: str) -> Optional[float]:
+    record = read_cache_file(ADC_TOKEN_CACHE_FILE) or {}
+    if record.get("credentials_key") != credentials_key:
+        return None
+    return record.get("expiry")
+
+
+def record_adc_token_expiry(credentials_key: str, expiry: float):
+    write_cache_file(ADC_TOKEN_CACHE_FILE, {"credentials_key": credentials_key, "expiry": expiry})
+
+
+def has_fresh_adc_token(credentials_key: str) -> bool:
+    """Whether gcloud has issued a still-valid access token for this version of the credentials file."""
+    expiry = get_recorded_adc_token_expiry(credentials_key)
+    return expiry is not None and expiry > time.time() + ACCESS_TOKEN_EXPIRY_MARGIN.total_seconds()
+
+
+def are_application_default_credentials_valid(credentials_path: str) -> Optional[bool]:
+    """Whether gcloud can issue an access token from the credentials, or None if it would need to ask Google and the
+    network is unreachable."""
+    credentials_key = get_credentials_key(credentials_path)
+    if credentials_key is None:
+        return False
+
+    if has_fresh_adc_token(credentials_key):
+        logging.debug("Found a fresh access token for Application Default Credentials, not running gcloud")
+        return True
+
+    if is_network_unreachable():
+        return None
+
+    output = get_stdout("gcloud auth application-default print-access-token --format=json")
+    if output is None:
+        return False
+
+    expiry = parse_access_token_expiry(output)
+    if expiry is not None:
+        record_adc_token_expiry(credentials_key, expiry)
+    return True
+
+
 class DockerGoogleCloudAuthConfigured(Check):
     name = "google.dockerGCloudAuthConfigured"
     depends_on = [GoogleCloudSdkInstalled]
+    resources = {"gcloud": 1}
 
     def __init__(self, cloud_project, region, registry):
         self.registry = registry
@@ -85,13 +173,10 @@ class DockerGoogleCloudAuthConfigured(Check):
 
     def check(self) -> CheckResult:
         # Logged in with gcloud
-        google_config_path = os.path.expanduser("~/.config/gcloud/application_default_credentials.json")
+        google_config_path = os.path.join(get_gcloud_config_dir(), "application_default_credentials.json")
         if not file_exists(google_config_path):
             return self.failed(f"{google_config_path} does not exist")
 
-        if not can_run_command("gcloud auth application-default print-access-token"):
-            return self.failed("Application Default Credentials are not correctly set up")
-
         # Docker configured correctly
         docker_config_path = os.path.expanduser("~/.docker/config.json")
         if not file_exists(docker_config_path):
@@ -108,6 +193,13 @@ class DockerGoogleCloudAuthConfigured(Check):
             return self.failed(f"Failed to parse {docker_config_path}")
 
         if docker_config.get("credHelpers", {}).get(self.registry) != "gcloud":
-            return self.failed("docker gcloud auth for {self.registry} not configured")
+            return self.failed(f"docker gcloud auth for {self.registry} not configured")
+
+        # Checked last, as it is the only step which may need the network
+        credentials_valid = are_application_default_credentials_valid(google_config_path)
+        if credentials_valid is None:
+            return self.failed("Could not verify Application Default Credentials as the network is unreachable", {})
+        if not credentials_valid:
+            return self.failed("Application Default Credentials are not correctly set up")
 
         return self.passed("docker gcloud auth configured")
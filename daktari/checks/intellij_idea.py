@@ -1,6 +1,7 @@
 import json
 import logging
 import os
+from datetime import timedelta
 from json.decoder import JSONDecodeError
 from pathlib import Path
 from typing import Optional
@@ -21,6 +22,8 @@ BUNDLE_ID_INTELLIJ_IDEA_CE = "com.jetbrains.intellij.ce"
 
 SNAP_NAME_INTELLIJ_IDEA = "intellij-idea-ultimate"
 SNAP_NAME_INTELLIJ_IDEA_CE = "intellij-idea-community"
+# snapd is queried over a local socket, so needs no network, but shouldn't hold up the check if it is unresponsive
+SNAPD_TIMEOUT_SECONDS = 5
 
 
 def locate_intellij_idea_mac():
@@ -61,7 +64,8 @@ def get_intellij_idea_version_snap() -> Optional[VersionInfo]:
 
     session = Session()
     snaps_req = session.get(
-        f"http+unix://%2Frun%2Fsnapd.socket/v2/snaps?snaps={SNAP_NAME_INTELLIJ_IDEA},{SNAP_NAME_INTELLIJ_IDEA_CE}"
+        f"http+unix://%2Frun%2Fsnapd.socket/v2/snaps?snaps={SNAP_NAME_INTELLIJ_IDEA},{SNAP_NAME_INTELLIJ_IDEA_CE}",
+        timeout=SNAPD_TIMEOUT_SECONDS,
     )
     snaps_info = snaps_req.json()
     logging.debug(f"response from snapd: {snaps_info}")
@@ -135,6 +139,8 @@ def get_intellij_idea_version() -> Optional[VersionInfo]:
 
 class IntelliJIdeaInstalled(Check):
     name = "intellij.installed"
+    machine_wide = True
+    cache_ttl = timedelta(hours=12)
 
     suggestions = {OS.GENERIC: "Install IntelliJ Ultimate: https://www.jetbrains.com/idea/download/"}
 
@@ -204,13 +210,12 @@ class IntelliJTypescriptCompilerPathConfigured(XmlFileXPathCheck):
                 """
         }
 
-    def validate_query_result(self, result):
+    def check_query_result(self, result: Optional[Element]) -> CheckResult:
         if result is None:
-            self.pass_fail_message = "IntelliJ typescript compiler path is <not/> set"
-            return False
+            return self.failed("IntelliJ typescript compiler path is not set")
         current_typescript_compiler_path = result.get("value")
         logging.debug(f"IntelliJ typescript compiler set to: {current_typescript_compiler_path}")
-        return current_typescript_compiler_path == self.typescript_compiler_path
+        return self.verify(current_typescript_compiler_path == self.typescript_compiler_path, self.pass_fail_message)
 
 
 class IntelliJProjectSdkJavaVersion(XmlFileXPathCheck):
@@ -229,20 +234,19 @@ class IntelliJProjectSdkJavaVersion(XmlFileXPathCheck):
                 """
         }
 
-    def validate_query_result(self, result: Optional[Element]):
+    def check_query_result(self, result: Optional[Element]) -> CheckResult:
         if result is None:
-            self.pass_fail_message = "IntelliJ Project SDK is not set"
-            return False
+            return self.failed("IntelliJ Project SDK is not set")
 
         try:
             jdk_type = result.attrib["project-jdk-type"]
             if jdk_type != "JavaSDK":
-                self.pass_fail_message = f"IntelliJ Project SDK is not a Java JDK: {jdk_type}"
-                return False
+                return self.failed(f"IntelliJ Project SDK is not a Java JDK: {jdk_type}")
         except KeyError:
-            self.pass_fail_message = "IntelliJ Project SDK is not a Java JDK"
-            return False
+            return self.failed("IntelliJ Project SDK is not a Java JDK")
 
         language_level = result.attrib["languageLevel"]
-        self.pass_fail_message = f"IntelliJ Project SDK is <not/> set to Java {self.jdk_version}: {language_level}"
-        return language_level == f"JDK_{self.jdk_version}"
+        return self.verify(
+            language_level == f"JDK_{self.jdk_version}",
+            f"IntelliJ Project SDK is <not/> set to Java {self.jdk_version}: {language_level}",
+        )
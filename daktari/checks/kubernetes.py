@@ -1,18 +1,26 @@
 import json
 import logging
+import os
 import re
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
+import yaml
 from semver import VersionInfo
+from yaml import YAMLError
 
 from daktari.check import Check, CheckResult
 from daktari.command_utils import get_stdout, can_run_command
-from daktari.os import OS
+from daktari.file_utils import file_exists
+from daktari.network import is_network_unreachable
+from daktari.os import OS, detect_os
+from daktari.run_cache import run_cached
 from daktari.version_utils import try_parse_semver
 from daktari.checks.google import GkeGcloudAuthPluginInstalled
 
 
 class KubectlInstalled(Check):
+    resources = {"kubectl": 1}
+
     def __init__(self, required_version: Optional[str] = None, recommended_version: Optional[str] = None):
         self.required_version = required_version
         self.recommended_version = recommended_version
@@ -50,6 +58,7 @@ def get_kubectl_version() -> Optional[VersionInfo]:
 
 class KubectlContextExists(Check):
     depends_on = [GkeGcloudAuthPluginInstalled]
+    resources = {"kubectl": 1}
 
     def __init__(self, context_name: str, provision_command: str = ""):
         self.context_name = context_name
@@ -60,13 +69,17 @@ class KubectlContextExists(Check):
         output = get_stdout("kubectl config get-contexts")
         passed = bool(output and self.context_name in output)
         if not passed:
-            return self.failed(f"{self.context_name} is <not/> configured for the current user")
+            return self.failed(f"{self.context_name} is not configured for the current user")
 
+        if is_network_unreachable():
+            return self.failed(f"Could not connect to context {self.context_name} as the network is unreachable", {})
         can_connect = can_run_command(f"kubectl get ns --context {self.context_name}")
         return self.verify(can_connect, f"Could <not/> connect to context {self.context_name}")
 
 
 class KubectlNoExtraneousContexts(Check):
+    resources = {"kubectl": 1}
+
     def __init__(self, expected_contexts: List[str]):
         self.expected_contexts = expected_contexts
         self.name = "kubectl.noExtraneousContexts"
@@ -82,16 +95,16 @@ class KubectlNoExtraneousContexts(Check):
             suggestion = "\n".join(
                 f"<cmd>kubectl config delete-context {context}</cmd>" for context in extraneous_contexts
             )
-            self.suggestions = {
-                OS.GENERIC: suggestion,
-            }
-            return self.passed_with_warning(f"{len(extraneous_contexts)} extraneous kubectl context(s) found")
+            return self.passed_with_warning(
+                f"{len(extraneous_contexts)} extraneous kubectl context(s) found", {OS.GENERIC: suggestion}
+            )
 
         return self.passed("No extraneous kubectl contexts found")
 
 
 class HelmInstalled(Check):
     name = "helm.installed"
+    machine_wide = True
 
     def __init__(self, required_version: Optional[str] = None, recommended_version: Optional[str] = None):
         self.required_version = required_version
@@ -123,6 +136,45 @@ def get_helm_version() -> Optional[VersionInfo]:
     return None
 
 
+def get_helm_repository_config_path() -> str:
+    repository_config = os.environ.get("HELM_REPOSITORY_CONFIG")
+    if repository_config:
+        return repository_config
+
+    config_home = os.environ.get("HELM_CONFIG_HOME")
+    if not config_home:
+        if detect_os() == OS.OS_X:
+            config_home = os.path.expanduser("~/Library/Preferences/helm")
+        else:
+            xdg_config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+            config_home = os.path.join(xdg_config_home, "helm")
+    return os.path.join(config_home, "repositories.yaml")
+
+
+@run_cached
+def read_helm_repositories_file(repository_config_path: str) -> Optional[List[Dict[str, Any]]]:
+    try:
+        with open(repository_config_path, "rb") as repository_config_file:
+            repository_config = yaml.safe_load(repository_config_file) or {}
+    except (IOError, YAMLError):
+        logging.debug(f"Exception reading {repository_config_path}", exc_info=True)
+        return None
+    return repository_config.get("repositories") or []
+
+
+@run_cached
+def read_helm_repositories_from_cli() -> Optional[List[Dict[str, Any]]]:
+    output = get_stdout("helm repo list -o json")
+    return json.loads(output) if output else None
+
+
+def get_helm_repositories() -> Optional[List[Dict[str, Any]]]:
+    repository_config_path = get_helm_repository_config_path()
+    if file_exists(repository_config_path):
+        return read_helm_repositories_file(repository_config_path)
+    return read_helm_repositories_from_cli()
+
+
 class HelmRepoExists(Check):
     depends_on = [HelmInstalled]
 
@@ -135,11 +187,10 @@ class HelmRepoExists(Check):
         }
 
     def check(self) -> CheckResult:
-        output = get_stdout("helm repo list -o json")
-        if not output:
+        repos = get_helm_repositories()
+        if not repos:
             return self.failed("No helm repos appear to be configured for the current user.")
-        repo_json = json.loads(output)
-        repo = next(filter(lambda repo_details: repo_details.get("name") == self.repo_name, repo_json), None)
+        repo = next(filter(lambda repo_details: repo_details.get("name") == self.repo_name, repos), None)
         if repo is None:
             return self.failed(f"{self.repo_name} is not configured for the current user")
 
@@ -1,4 +1,5 @@
 import logging
+from datetime import timedelta
 from os.path import expanduser
 from typing import Dict, Optional
 
@@ -12,6 +13,7 @@ from daktari.command_utils import can_run_command
 
 class WatchmanInstalled(Check):
     name = "watchman.installed"
+    machine_wide = True
 
     suggestions = {
         OS.OS_X: "<cmd>brew install watchman</cmd>",
@@ -24,6 +26,7 @@ class WatchmanInstalled(Check):
 
 class MkcertInstalled(Check):
     name = "mkcert.installed"
+    machine_wide = True
 
     suggestions = {
         OS.OS_X: """
@@ -84,6 +87,7 @@ class CmakeInstalled(Check):
 
 class JqInstalled(Check):
     name = "jq.installed"
+    machine_wide = True
 
     suggestions = {
         OS.OS_X: "<cmd>brew install jq</cmd>",
@@ -110,6 +114,7 @@ class FlywayInstalled(Check):
 
 class ShellcheckInstalled(Check):
     name = "shellcheck.installed"
+    machine_wide = True
 
     suggestions = {
         OS.OS_X: "<cmd>brew install shellcheck</cmd>",
@@ -123,6 +128,7 @@ class ShellcheckInstalled(Check):
 
 class MakeInstalled(Check):
     name = "make.installed"
+    machine_wide = True
 
     suggestions = {
         OS.OS_X: "<cmd>xcode-select --install</cmd>",
@@ -136,6 +142,7 @@ class MakeInstalled(Check):
 
 class GccInstalled(Check):
     name = "gcc.installed"
+    machine_wide = True
 
     suggestions = {
         OS.OS_X: "<cmd>xcode-select --install</cmd>",
@@ -293,6 +300,7 @@ class TaskInstalled(Check):
 class Rosetta2Installed(Check):
     name = "rosetta2.installed"
     run_on = OS.OS_X
+    cache_ttl = timedelta(days=7)
     suggestions = {OS.OS_X: "<cmd>softwareupdate --install-rosetta</cmd>"}
 
     def check(self) -> CheckResult:
@@ -77,6 +77,9 @@ class NodeJsVersionMatchesNvmrc(Check):
             """
     }
 
+    def get_input_paths(self) -> List[str]:
+        return [".nvmrc"]
+
     def check(self) -> CheckResult:
         nvmrc_version = get_nvmrc_version()
         if nvmrc_version is None:
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from daktari.check import CheckStatus
+from daktari.checks.conan import ConanRemoteDetected, get_conan_remotes
+from daktari.os import OS
+from daktari.run_cache import clear_run_cache
+
+REMOTES = {
+    "remotes": [
+        {"name": "conancenter", "url": "https://center2.conan.io", "verify_ssl": True},
+        {"name": "internal", "url": "https://conan.example.com/", "verify_ssl": True, "disabled": True},
+    ]
+}
+
+
+class TestConanRemotes(unittest.TestCase):
+    def setUp(self):
+        clear_run_cache()
+        self.conan_home = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.conan_home.name, "remotes.json"), "w") as remotes_file:
+            json.dump(REMOTES, remotes_file)
+        self.env_patch = mock.patch.dict(os.environ, {"CONAN_HOME": self.conan_home.name})
+        self.env_patch.start()
+
+    def tearDown(self):
+        self.env_patch.stop()
+        self.conan_home.cleanup()
+
+    @mock.patch("daktari.checks.conan.get_stdout")
+    def test_reads_remotes_file(self, mock_get_stdout):
+        remotes = get_conan_remotes()
+        self.assertEqual(["conancenter", "internal"], [remote["name"] for remote in remotes])
+        self.assertEqual([True, False], [remote["enabled"] for remote in remotes])
+        mock_get_stdout.assert_not_called()
+
+    @mock.patch("daktari.checks.conan.get_stdout")
+    def test_falls_back_to_cli(self, mock_get_stdout):
+        mock_get_stdout.return_value = json.dumps([{"name": "cli", "url": "https://cli", "enabled": True}])
+        with mock.patch.dict(os.environ, {"CONAN_HOME": os.path.join(self.conan_home.name, "missing")}):
+            remotes = get_conan_remotes()
+        self.assertEqual(["cli"], [remote["name"] for remote in remotes])
+        mock_get_stdout.assert_called_once_with("conan remote list -f json")
+
+    def test_reads_changes_after_cache_cleared(self):
+        get_conan_remotes()[0]["url"] = "https://changed.example.com"
+        self.assertEqual("https://center2.conan.io", get_conan_remotes()[0]["url"])
+
+        with open(os.path.join(self.conan_home.name, "remotes.json"), "w") as remotes_file:
+            json.dump({"remotes": []}, remotes_file)
+        self.assertEqual(2, len(get_conan_remotes()))
+        clear_run_cache()
+        self.assertEqual([], get_conan_remotes())
+
+    def test_remote_detected(self):
+        result = ConanRemoteDetected("conancenter", "https://center2.conan.io").check()
+        self.assertEqual(CheckStatus.PASS, result.status)
+
+    def test_remote_disabled(self):
+        result = ConanRemoteDetected("internal", "https://conan.example.com").check()
+        self.assertEqual(CheckStatus.FAIL, result.status)
+        self.assertEqual("internal conan remote is not enabled.", result.summary)
+
+    def test_remote_disabled_suggestion_does_not_change_check(self):
+        check = ConanRemoteDetected("internal", "https://conan.example.com")
+        original_suggestions = check.suggestions
+        result = check.check()
+        self.assertEqual({OS.GENERIC: "<cmd>conan remote enable internal</cmd>"}, result.suggestions)
+        self.assertIs(original_suggestions, check.suggestions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from daktari.check import CheckStatus
+from daktari.checks.git import GitCryptAllFilesUnlocked, GitLfsFilesDownloaded, get_git_crypt_locked_files
+from daktari.file_utils import GIT_CRYPT_HEADER
+
+
+class TestGitCrypt(unittest.TestCase):
+    def setUp(self):
+        self.original_dir = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+        os.mkdir("secrets")
+        self.write_file(".gitattributes", b"secrets/** filter=git-crypt diff=git-crypt\n")
+        self.write_file("secrets/unlocked.env", b"PASSWORD=hunter2\n")
+        self.write_file("README.md", GIT_CRYPT_HEADER + b"not a secret")
+
+    def tearDown(self):
+        os.chdir(self.original_dir)
+        self.temp_dir.cleanup()
+
+    def write_file(self, path: str, contents: bytes):
+        with open(path, "wb") as f:
+            f.write(contents)
+
+    def test_get_locked_files(self):
+        self.write_file("secrets/locked.env", GIT_CRYPT_HEADER + b"\x00\x01\x02")
+        paths = ["secrets/locked.env", "secrets/unlocked.env", "secrets/deleted.env"]
+        self.assertEqual(["secrets/locked.env"], get_git_crypt_locked_files(paths))
+
+    @mock.patch("daktari.checks.git.get_git_tracked_files")
+    def test_passes_when_all_unlocked(self, mock_tracked_files):
+        mock_tracked_files.return_value = [".gitattributes", "README.md", "secrets/unlocked.env"]
+        result = GitCryptAllFilesUnlocked().check()
+        self.assertEqual(CheckStatus.PASS, result.status)
+        self.assertEqual("All 1 encrypted files have been unlocked", result.summary)
+
+    @mock.patch("daktari.checks.git.get_git_tracked_files")
+    def test_fails_when_any_locked(self, mock_tracked_files):
+        self.write_file("secrets/locked.env", GIT_CRYPT_HEADER + b"\x00\x01\x02")
+        mock_tracked_files.return_value = [".gitattributes", "secrets/locked.env", "secrets/unlocked.env"]
+        result = GitCryptAllFilesUnlocked().check()
+        self.assertEqual(CheckStatus.FAIL, result.status)
+        self.assertEqual("1 of 2 encrypted files have not been unlocked", result.summary)
+
+
+LFS_OUTPUT = [
+    "4d7a214614 * assets/logo.png",
+    "8b1a9953c4 - assets/intro video.mp4",
+    "2c26b46b68 - assets/outro.mp4",
+]
+
+
+class TestGitLfsFilesDownloaded(unittest.TestCase):
+    @mock.patch("daktari.checks.git.stream_stdout_lines")
+    def test_passes_when_all_downloaded(self, mock_stream):
+        mock_stream.return_value = iter(LFS_OUTPUT[:1])
+        result = GitLfsFilesDownloaded().check()
+        self.assertEqual(CheckStatus.PASS, result.status)
+
+    @mock.patch("daktari.checks.git.stream_stdout_lines")
+    def test_counts_missing_files(self, mock_stream):
+        mock_stream.return_value = iter(LFS_OUTPUT)
+        result = GitLfsFilesDownloaded().check()
+        self.assertEqual(CheckStatus.FAIL, result.status)
+        self.assertEqual("Git LFS files have not been downloaded (2 missing)", result.summary)
+
+    @mock.patch("daktari.checks.git.stream_stdout_lines")
+    def test_stops_after_missing_files(self, mock_stream):
+        lines = iter(LFS_OUTPUT)
+        mock_stream.return_value = lines
+        result = GitLfsFilesDownloaded(stop_after_missing=1).check()
+        self.assertEqual("Git LFS files have not been downloaded (at least 1 missing)", result.summary)
+        self.assertEqual(LFS_OUTPUT[2], next(lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
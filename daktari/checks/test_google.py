@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+from unittest import mock
+
+from daktari.checks.google import are_application_default_credentials_valid
+from daktari.network import NetworkProbe, use_network_probe
+
+CREDENTIALS = {
+    "account": "someone@example.com",
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "refresh_token": "refresh-token",
+    "type": "authorized_user",
+}
+
+
+class TestApplicationDefaultCredentials(unittest.TestCase):
+    def setUp(self):
+        self.gcloud_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.env_patch = mock.patch.dict(os.environ, {"DAKTARI_CACHE_DIR": self.cache_dir.name})
+        self.env_patch.start()
+        self.credentials_path = os.path.join(self.gcloud_dir.name, "application_default_credentials.json")
+        with open(self.credentials_path, "w") as credentials_file:
+            json.dump(CREDENTIALS, credentials_file)
+
+    def tearDown(self):
+        self.env_patch.stop()
+        self.gcloud_dir.cleanup()
+        self.cache_dir.cleanup()
+
+    def token_output(self, expires_in: timedelta) -> str:
+        expiry = (datetime.now(timezone.utc) + expires_in).replace(tzinfo=None)
+        return json.dumps({"token": "access-token", "expiry": expiry.isoformat()})
+
+    def rewrite_credentials(self, credentials: Dict[str, Any]):
+        with open(self.credentials_path, "w") as credentials_file:
+            json.dump(credentials, credentials_file)
+        # Make sure the modification time changes even on filesystems with coarse timestamps
+        modified_time = os.stat(self.credentials_path).st_mtime_ns + 1_000_000_000
+        os.utime(self.credentials_path, ns=(modified_time, modified_time))
+
+    @mock.patch("daktari.checks.google.get_stdout")
+    def test_reuses_token_until_its_expiry(self, mock_get_stdout):
+        mock_get_stdout.return_value = self.token_output(timedelta(minutes=30))
+        self.assertTrue(are_application_default_credentials_valid(self.credentials_path))
+        self.assertTrue(are_application_default_credentials_valid(self.credentials_path))
+        mock_get_stdout.assert_called_once_with("gcloud auth application-default print-access-token --format=json")
+
+    @mock.patch("daktari.checks.google.get_stdout")
+    def test_does_not_reuse_token_about_to_expire(self, mock_get_stdout):
+        mock_get_stdout.return_value = self.token_output(timedelta(minutes=1))
+        self.assertTrue(are_application_default_credentials_valid(self.credentials_path))
+        self.assertTrue(are_application_default_credentials_valid(self.credentials_path))
+        self.assertEqual(2, mock_get_stdout.call_count)
+
+    @mock.patch("daktari.checks.google.get_stdout")
+    def test_does_not_reuse_token_without_expiry(self, mock_get_stdout):
+        mock_get_stdout.return_value = "access-token"
+        self.assertTrue(are_application_default_credentials_valid(self.credentials_path))
+        self.assertTrue(are_application_default_credentials_valid(self.credentials_path))
+        self.assertEqual(2, mock_get_stdout.call_count)
+
+    @mock.patch("daktari.checks.google.get_stdout")
+    def test_invalid_when_gcloud_cannot_issue_token(self, mock_get_stdout):
+        mock_get_stdout.return_value = None
+        self.assertFalse(are_application_default_credentials_valid(self.credentials_path))
+
+    @mock.patch("daktari.checks.google.get_stdout")
+    def test_does_not_reuse_token_for_changed_credentials(self, mock_get_stdout):
+        mock_get_stdout.return_value = self.token_output(timedelta(minutes=30))
+        self.assertTrue(are_application_default_credentials_valid(self.credentials_path))
+        self.rewrite_credentials({**CREDENTIALS, "refresh_token": "new-refresh-token"})
+        mock_get_stdout.return_value = None
+        self.assertFalse(are_application_default_credentials_valid(self.credentials_path))
+
+    @mock.patch("daktari.checks.google.get_stdout")
+    def test_does_not_reuse_token_for_rewritten_credentials(self, mock_get_stdout):
+        mock_get_stdout.return_value = self.token_output(timedelta(minutes=30))
+        self.assertTrue(are_application_default_credentials_valid(self.credentials_path))
+        self.rewrite_credentials(CREDENTIALS)
+        self.assertTrue(are_application_default_credentials_valid(self.credentials_path))
+        self.assertEqual(2, mock_get_stdout.call_count)
+
+    @mock.patch("daktari.checks.google.get_stdout")
+    def test_only_uses_reusable_token_when_offline(self, mock_get_stdout):
+        probe = NetworkProbe(("127.0.0.1", 1))
+        with mock.patch.object(probe, "probe", return_value=False), use_network_probe(probe):
+            self.assertIsNone(are_application_default_credentials_valid(self.credentials_path))
+            mock_get_stdout.assert_not_called()
+
+        mock_get_stdout.return_value = self.token_output(timedelta(minutes=30))
+        self.assertTrue(are_application_default_credentials_valid(self.credentials_path))
+        with mock.patch.object(probe, "probe", return_value=False), use_network_probe(probe):
+            self.assertTrue(are_application_default_credentials_valid(self.credentials_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
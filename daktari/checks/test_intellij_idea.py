@@ -64,3 +64,12 @@ class TestIntellijIdea(unittest.TestCase):
         result = check.check()
         self.assertEqual(result.status, CheckStatus.PASS)
         self.assertIn("IntelliJ typescript compiler path has been set to", result.summary)
+
+    def test_project_typescript_path_check_can_be_rerun(self):
+        check = IntelliJTypescriptCompilerPathConfigured("$PROJECT_DIR$/node_modules/typescript")
+        check.file_path = "checks/test_resources/intellij_misc_no_ts_path.xml"
+        check.check()
+        check.file_path = "checks/test_resources/intellij_misc_custom_ts_path.xml"
+        result = check.check()
+        self.assertEqual(result.status, CheckStatus.PASS)
+        self.assertIn("IntelliJ typescript compiler path has been set to", result.summary)
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from daktari.check import CheckStatus
+from daktari.checks.kubernetes import HelmRepoExists, KubectlContextExists, KubectlNoExtraneousContexts
+from daktari.network import NetworkProbe, use_network_probe
+from daktari.os import OS
+from daktari.run_cache import clear_run_cache
+
+REPOSITORIES_YAML = """
+apiVersion: ""
+generated: "0001-01-01T00:00:00Z"
+repositories:
+- name: bitnami
+  url: https://charts.bitnami.com/bitnami/
+- name: internal
+  url: https://charts.example.com
+"""
+
+
+class TestHelmRepoExists(unittest.TestCase):
+    def setUp(self):
+        clear_run_cache()
+        self.config_dir = tempfile.TemporaryDirectory()
+        repository_config_path = os.path.join(self.config_dir.name, "repositories.yaml")
+        with open(repository_config_path, "w") as repository_config_file:
+            repository_config_file.write(REPOSITORIES_YAML)
+        self.env_patch = mock.patch.dict(os.environ, {"HELM_REPOSITORY_CONFIG": repository_config_path})
+        self.env_patch.start()
+
+    def tearDown(self):
+        self.env_patch.stop()
+        self.config_dir.cleanup()
+
+    @mock.patch("daktari.checks.kubernetes.get_stdout")
+    def test_repo_exists(self, mock_get_stdout):
+        result = HelmRepoExists("bitnami", "https://charts.bitnami.com/bitnami").check()
+        self.assertEqual(CheckStatus.PASS, result.status)
+        mock_get_stdout.assert_not_called()
+
+    @mock.patch("daktari.checks.kubernetes.get_stdout")
+    def test_extraneous_contexts(self, mock_get_stdout):
+        mock_get_stdout.return_value = "expected\nold-cluster\n"
+        check = KubectlNoExtraneousContexts(["expected"])
+        result = check.check()
+        self.assertEqual(CheckStatus.PASS_WITH_WARNING, result.status)
+        self.assertEqual({OS.GENERIC: "<cmd>kubectl config delete-context old-cluster</cmd>"}, result.suggestions)
+        self.assertEqual({}, check.suggestions)
+
+    def test_repo_wrong_url(self):
+        result = HelmRepoExists("internal", "https://charts.example.org").check()
+        self.assertEqual(CheckStatus.FAIL, result.status)
+
+    def test_repo_missing(self):
+        result = HelmRepoExists("missing", "https://charts.example.org").check()
+        self.assertEqual("missing is not configured for the current user", result.summary)
+
+
+class TestKubectlContextExists(unittest.TestCase):
+    @mock.patch("daktari.checks.kubernetes.can_run_command")
+    @mock.patch("daktari.checks.kubernetes.get_stdout")
+    def test_only_skips_connecting_when_offline(self, mock_get_stdout, mock_can_run_command):
+        mock_get_stdout.return_value = "CURRENT   NAME\n*         staging"
+        probe = NetworkProbe(("127.0.0.1", 1))
+        with mock.patch.object(probe, "probe", return_value=False), use_network_probe(probe):
+            missing = KubectlContextExists("production").check()
+            unreachable = KubectlContextExists("staging").check()
+
+        self.assertEqual("production is not configured for the current user", missing.summary)
+        self.assertEqual(CheckStatus.FAIL, unreachable.status)
+        self.assertEqual("Could not connect to context staging as the network is unreachable", unreachable.summary)
+        mock_can_run_command.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import logging
-from typing import Optional
+from typing import List, Optional
 from xml.etree.ElementTree import Element, ElementTree, ParseError
 
 from daktari.check import Check, CheckResult
@@ -10,24 +10,31 @@ class XmlFileXPathCheck(Check):
     file_path = ""
     xpath_query = "./"
     pass_fail_message = ""
+    side_effect_free = True
 
     def validate_query_result(self, result: Optional[Element]) -> bool:
         return result is not None
 
-    def perform_query(self) -> bool:
+    def check_query_result(self, result: Optional[Element]) -> CheckResult:
+        """Override to report a result whose message depends on what was found, rather than a pass/fail message."""
+        return self.verify(self.validate_query_result(result), self.pass_fail_message)
+
+    def read_document(self) -> Optional[ElementTree]:
         if not file_exists(self.file_path):
             logging.debug(f"File {self.file_path} does not exist")
-            return False
+            return None
 
         try:
-            doc = ElementTree(file=self.file_path)
+            return ElementTree(file=self.file_path)
         except ParseError:
             logging.debug(f"Error parsing {self.file_path}", exc_info=True)
-            return False
+            return None
 
-        query_result = doc.find(self.xpath_query)
-        return self.validate_query_result(query_result)
+    def get_input_paths(self) -> List[str]:
+        return [self.file_path]
 
     def check(self) -> CheckResult:
-        success = self.perform_query()
-        return self.verify(success, self.pass_fail_message)
+        doc = self.read_document()
+        if doc is None:
+            return self.verify(False, self.pass_fail_message)
+        return self.check_query_result(doc.find(self.xpath_query))
@@ -11,6 +11,8 @@ from daktari.file_utils import file_exists
 from daktari.os import OS
 import requests
 
+GITHUB_API_TIMEOUT_SECONDS = 10
+
 
 class YarnInstalled(Check):
     name = "yarn.installed"
@@ -102,6 +104,7 @@ class YarnNpmScopeConfigured(Check):
 class YarnNpmGithubTokenValid(Check):
     name = "yarn.npmGithubTokenValid"
     depends_on = [YarnNpmScopeConfigured]
+    requires_network = True
 
     def __init__(self, github_org: str, scope_name: str):
         self.scope_name = scope_name
@@ -124,7 +127,9 @@ class YarnNpmGithubTokenValid(Check):
         }
         logging.debug(f"Checking the validity of Yarn token {github_token} with the Github API")
         response = requests.get(
-            f"https://api.github.com/orgs/{self.github_organisation}/packages?package_type=npm", headers=headers
+            f"https://api.github.com/orgs/{self.github_organisation}/packages?package_type=npm",
+            headers=headers,
+            timeout=GITHUB_API_TIMEOUT_SECONDS,
         )
         if response.status_code == 200:
             logging.debug(f"API call returned: {response.text}")
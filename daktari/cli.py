@@ -0,0 +1,250 @@
+import json
+import logging
+import os
+import sys
+from contextlib import redirect_stdout
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pyfiglet import Figlet
+
+from daktari.check_budget import plan_within_budget
+from daktari.check_history import CheckHistory
+from daktari.check_index import select_checks
+from daktari.check_plan import build_plan, format_plan
+from daktari.check_runner import CheckRunner, RunOptions
+from daktari.check_shards import select_shard
+from daktari.concurrency import AUTO_JOBS, MAX_JOBS_PER_CPU, AdaptiveConcurrency
+from daktari.config import read_config, Config, write_local_config_template
+from daktari.discovery import (
+    CONFIG_FILE_NAME,
+    SharedResultCache,
+    combine_grouped_output,
+    find_config_paths,
+    get_grouped_formatter,
+)
+from daktari.last_run import LastRun, select_failed_checks
+from daktari.network import NetworkProbe
+from daktari.options import argument_parser, validate_as_file_path
+from daktari.result_cache import ResultCache
+from daktari.result_formatter import ResultFormatter, get_result_formatter
+from daktari.result_merge import merge_reports, read_report
+from daktari.status import show_status
+from daktari.timing_report import SLOWEST_CHECKS_REPORTED, TimingReport
+
+
+def print_logo(title: str):
+    figlet = Figlet(font="slant")
+    print(figlet.renderText(title))
+
+
+def main() -> int:
+    args = argument_parser.parse_args()
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+
+    if args.generate_local_config:
+        write_local_config_template()
+        return 0
+
+    if args.command == "merge":
+        return merge_shard_reports(args.reports)
+
+    # Usually answered by __main__ before anything else is imported, but not when options such as --debug come first
+    if args.command == "status":
+        return show_status(args.max_age, args.refresh_stale)
+
+    if args.discover is not None:
+        return run_discovered_configs(args)
+
+    # Validated here rather than as an argument default, since --discover doesn't need a config in this directory
+    config_path = (args.config_path or validate_as_file_path(argument_parser, CONFIG_FILE_NAME)).absolute()
+
+    # Only text output is decorated, so that machine-readable formats can be parsed directly from stdout
+    text_output = args.output_format == "text"
+    last_run = LastRun.load()
+    config = load_config(config_path, args, last_run)
+    if config is None:
+        return 1
+
+    os.chdir(config_path.parent)
+    if text_output:
+        print_config_messages(config, args)
+
+    if args.plan:
+        plan = build_plan(config.checks, config.ignored_checks, CheckHistory.load(), ResultCache.load())
+        print(format_plan(plan) if text_output else json.dumps(plan.to_dict()))
+        return 0
+
+    if args.rerun_failed and not config.checks:
+        print("ⓘ  No checks failed last time", file=sys.stdout if text_output else sys.stderr)
+        return 0
+
+    formatter = get_result_formatter(args.output_format, args.quiet_mode or config.quiet_mode, args.timing_report)
+    history = CheckHistory.load()
+    options = get_run_options(args, ResultCache.load(refresh=args.refresh), history, last_run)
+    all_passed = run_config(config, args, options, history, formatter, config_path)
+    if text_output:
+        print("")
+    return 0 if all_passed else 1
+
+
+def load_config(config_path: Path, args, last_run: LastRun) -> Optional[Config]:
+    with redirect_stdout(sys.stdout if args.output_format == "text" else sys.stderr):
+        config = read_config(config_path)
+    if config is not None and (args.only or args.skip):
+        config = replace(config, checks=select_checks(config.checks, args.only, args.skip))
+    if config is not None and args.rerun_failed:
+        config = replace(
+            config, checks=select_failed_checks(config.checks, last_run, str(config_path.parent.resolve()))
+        )
+    if config is not None and args.shard is not None:
+        config = replace(config, checks=select_shard(config.checks, args.shard, CheckHistory.load()))
+    return config
+
+
+def merge_shard_reports(report_paths: List[Path]) -> int:
+    try:
+        reports = [read_report(path.read_text()) for path in report_paths]
+    except (OSError, ValueError) as err:
+        print(f"Could not read shard reports: {err}", file=sys.stderr)
+        return 1
+    merged = merge_reports(reports)
+    print(json.dumps(merged))
+    return 0 if merged["all_passed"] else 1
+
+
+def get_network_probe(args) -> Optional[NetworkProbe]:
+    return None if args.network_probe is None else NetworkProbe(args.network_probe)
+
+
+def get_run_options(args, result_cache: ResultCache, history: CheckHistory, last_run: LastRun) -> RunOptions:
+    """Options from the command line, shared by every config it runs."""
+    return RunOptions(
+        quiet_mode=args.quiet_mode,
+        fail_fast=args.fail_fast,
+        speculative=args.speculative,
+        order=args.order,
+        resource_limits=dict(args.resource_limits or []),
+        result_cache=result_cache,
+        history=history,
+        network_probe=get_network_probe(args),
+        last_run=last_run,
+    )
+
+
+def run_config(
+    config: Config,
+    args,
+    options: RunOptions,
+    history: CheckHistory,
+    formatter: ResultFormatter,
+    config_path: Optional[Path] = None,
+) -> bool:
+    checks, assumed_passed, deferred = config.checks, set(), []
+    cpu_count = os.cpu_count() or 1
+    auto_jobs = args.jobs == AUTO_JOBS
+    requested_jobs = None if auto_jobs else args.jobs
+    if args.budget_ms is not None:
+        jobs = requested_jobs or cpu_count
+        plan = plan_within_budget(config.checks, args.budget_ms / 1000, jobs, history, options.result_cache)
+        checks, assumed_passed, deferred = plan.selected, plan.assumed_passed, plan.deferred
+    else:
+        jobs = requested_jobs or (cpu_count if args.speculative else 1)
+        if not (args.only or args.skip or args.shard or args.rerun_failed):
+            history.mark_full_run()
+            if options.last_run is not None and not args.fail_fast:
+                options.last_run.clear()
+
+    concurrency = None
+    if auto_jobs:
+        jobs = cpu_count * MAX_JOBS_PER_CPU
+        concurrency = AdaptiveConcurrency(jobs, cpu_count=cpu_count)
+
+    options = replace(
+        options,
+        quiet_mode=options.quiet_mode or config.quiet_mode,
+        jobs=jobs,
+        concurrency=concurrency,
+        history=history,
+        timing_report=TimingReport(
+            SLOWEST_CHECKS_REPORTED if args.timing_report else 0, args.regression_threshold / 100
+        ),
+        deferred=deferred,
+        assumed_passed=assumed_passed,
+        config_path=config_path,
+    )
+    return CheckRunner(checks, options, formatter).run()
+
+
+def run_discovered_configs(args) -> int:
+    root = args.discover.absolute()
+    config_paths = find_config_paths(root)
+    if not config_paths:
+        print(f"No {CONFIG_FILE_NAME} files found beneath {root}", file=sys.stderr)
+        return 1
+
+    text_output = args.output_format == "text"
+    # One cache for every config, so that machine-wide checks such as GitInstalled only run once
+    result_cache = SharedResultCache.load(refresh=args.refresh)
+    history = CheckHistory.load()
+    last_run = LastRun.load()
+    # Built once, so that the network is also only probed once
+    options = get_run_options(args, result_cache, history, last_run)
+    outputs: List[Tuple[str, ResultFormatter]] = []
+    plans: List[Dict[str, Any]] = []
+    all_passed = True
+    for config_path in config_paths:
+        config_name = str(config_path.relative_to(root))
+        # Local config and project-relative checks are resolved from each config's own directory
+        os.chdir(config_path.parent)
+        config = load_config(Path(CONFIG_FILE_NAME), args, last_run)
+        if config is None:
+            all_passed = False
+            continue
+
+        if text_output:
+            print(f"📁 {config.title} ({config_name})" if config.title else f"📁 {config_name}")
+        if args.plan:
+            plan = build_plan(config.checks, config.ignored_checks, history, result_cache)
+            if text_output:
+                print(format_plan(plan))
+            else:
+                plans.append({"config": config_name, **plan.to_dict()})
+            continue
+        formatter = get_grouped_formatter(
+            args.output_format, args.quiet_mode or config.quiet_mode, config_name, args.timing_report
+        )
+        outputs.append((config_name, formatter))
+        config_passed = run_config(config, args, options, history, formatter, config_path)
+        all_passed = all_passed and config_passed
+        if text_output:
+            print("")
+        if args.fail_fast and not config_passed:
+            break
+
+    if args.plan:
+        if not text_output:
+            print(json.dumps({"configs": plans}))
+        return 0 if all_passed else 1
+
+    combined_output = combine_grouped_output(args.output_format, outputs, all_passed)
+    if combined_output is not None:
+        print(combined_output)
+    return 0 if all_passed else 1
+
+
+def print_config_messages(config: Config, args):
+    if config.title:
+        print_logo(config.title)
+
+    ignored_count = len(config.ignored_checks)
+    if ignored_count > 0:
+        if args.show_ignored:
+            print("ⓘ  The following checks have been ignored:\n")
+            for check in config.ignored_checks:
+                print(f"[{check.name}]")
+            print("")
+        elif not args.quiet_mode:
+            print(f"ⓘ  {ignored_count} check(s) have been marked as ignored. Run with --show-ignored to list them.\n")
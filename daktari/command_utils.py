@@ -1,7 +1,12 @@
 import logging
+import os
+import signal
 import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterator, Optional, Set
 
 
 @dataclass
@@ -23,18 +28,124 @@ class CommandErrorException(Exception):
         self.stderr = stderr
 
 
+class CommandCancelledException(Exception):
+    pass
+
+
+class CancellationToken:
+    """Lets a run stop every command its checks have started.
+
+    If isolate_processes, each command starts in a session of its own, so that it and any children it starts can be
+    killed together. A command in its own session has no controlling terminal, so one that prompts, as gpg, ssh and
+    sudo may, fails rather than waiting on input from a terminal it can't read. Otherwise commands stay in daktari's
+    process group and can prompt as usual, and only the command itself is killed."""
+
+    def __init__(self, isolate_processes: bool = True) -> None:
+        self.isolate_processes = isolate_processes
+        self.cancelled = False
+        self.processes: Set[subprocess.Popen] = set()
+        self.lock = threading.Lock()
+
+    def register(self, process: subprocess.Popen):
+        with self.lock:
+            if not self.cancelled:
+                self.processes.add(process)
+                return
+        # Started just as the run was cancelled
+        self.kill(process)
+
+    def unregister(self, process: subprocess.Popen):
+        with self.lock:
+            self.processes.discard(process)
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            processes, self.processes = self.processes, set()
+        for process in processes:
+            self.kill(process)
+
+    def kill(self, process: subprocess.Popen):
+        if self.isolate_processes:
+            kill_process_group(process)
+        else:
+            kill_process(process)
+
+
+# The token for the run in progress, shared by all of its worker threads
+active_cancellation_token: Optional[CancellationToken] = None
+
+
+@contextmanager
+def use_cancellation_token(token: CancellationToken):
+    global active_cancellation_token
+    previous_token = active_cancellation_token
+    active_cancellation_token = token
+    try:
+        yield token
+    finally:
+        active_cancellation_token = previous_token
+
+
+def kill_process_group(process: subprocess.Popen):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        logging.debug(f"Could not kill process group {process.pid}", exc_info=True)
+
+
+def kill_process(process: subprocess.Popen):
+    try:
+        process.kill()
+    except OSError:
+        logging.debug(f"Could not kill process {process.pid}", exc_info=True)
+
+
+def start_process(command_parts, combined_command: str, **kwargs) -> subprocess.Popen:
+    """Start a command, registering it with the cancellation token of the run in progress, if any."""
+    token = active_cancellation_token
+    if token is not None and token.cancelled:
+        raise CommandCancelledException(f"Run cancelled before starting: {combined_command}")
+    if token is not None and token.isolate_processes:
+        # Unlike a preexec_fn, safe to use from several threads at once
+        kwargs["start_new_session"] = True
+    try:
+        process = subprocess.Popen(command_parts, **kwargs)
+    except FileNotFoundError:
+        logging.debug(f"Command not found for '{combined_command}'.")
+        raise CommandNotFoundException(f"Command not found: {combined_command}")
+    if token is not None:
+        token.register(process)
+    return process
+
+
+def finish_process(process: subprocess.Popen, combined_command: str):
+    token = active_cancellation_token
+    if token is None:
+        return
+    token.unregister(process)
+    if token.cancelled:
+        raise CommandCancelledException(f"Run cancelled while running: {combined_command}")
+
+
 def run_command(command_parts):
     if isinstance(command_parts, str):
         command_parts = command_parts.split()
     combined_command = " ".join(command_parts)
     logging.debug(f"Running command '{combined_command}'")
+    process = start_process(
+        command_parts,
+        combined_command,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
     try:
-        result = subprocess.run(
-            command_parts, stdout=subprocess.PIPE, stderr=subprocess.PIPE, input="", universal_newlines=True
-        )
-    except FileNotFoundError:
-        logging.debug(f"Command not found for '{combined_command}'.")
-        raise CommandNotFoundException(f"Command not found: {combined_command}")
+        stdout, stderr = process.communicate(input="")
+    finally:
+        finish_process(process, combined_command)
+    result = subprocess.CompletedProcess(command_parts, process.returncode, stdout, stderr)
     if result.returncode != 0:
         logging.debug(
             f"Non-zero exit code for '{combined_command}'\n"
@@ -53,6 +164,51 @@ def run_command(command_parts):
     return SuccessfulCommandResult(result.stdout, result.stderr)
 
 
+def stream_stdout_lines(command_parts) -> Iterator[str]:
+    """Yield the lines of a command's stdout as they are produced, without buffering the whole output.
+
+    The command is killed if the caller stops iterating early."""
+    if isinstance(command_parts, str):
+        command_parts = command_parts.split()
+    combined_command = " ".join(command_parts)
+    logging.debug(f"Streaming command '{combined_command}'")
+    with tempfile.TemporaryFile() as stderr_file:
+        process = start_process(
+            command_parts,
+            combined_command,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            stdin=subprocess.DEVNULL,
+            universal_newlines=True,
+        )
+
+        try:
+            for line in process.stdout or []:
+                yield line.rstrip("\n")
+        finally:
+            if process.poll() is None:
+                process.kill()
+            if process.stdout is not None:
+                process.stdout.close()
+            process.wait()
+            finish_process(process, combined_command)
+
+        if process.returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace")
+            logging.debug(
+                f"Non-zero exit code for '{combined_command}'\n"
+                f"Exit code = {process.returncode}\n"
+                f"Stderr = {stderr}\n"
+            )
+            raise CommandErrorException(
+                f"Command returned exit code {process.returncode}: {combined_command}",
+                process.returncode,
+                None,
+                stderr,
+            )
+
+
 def can_run_command(command) -> bool:
     try:
         run_command(command)
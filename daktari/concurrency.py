@@ -0,0 +1,169 @@
+import logging
+import os
+import queue
+import resource
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+AUTO_JOBS = "auto"
+INITIAL_JOBS = 2
+# Checks mostly wait on commands and the network, so can usefully outnumber the CPUs
+MAX_JOBS_PER_CPU = 4
+ADJUST_INTERVAL_SECONDS = 0.5
+# The machine is overloaded once this many processes per CPU are waiting to run
+OVERLOADED_LOAD_PER_CPU = 1.5
+# Once checks keep this much of the CPUs busy, more of them at once would only compete with each other
+SATURATED_CPU_FRACTION = 0.9
+# Throughput has to fall by more than this after adding a worker for the worker to be taken away again
+THROUGHPUT_TOLERANCE = 0.1
+
+
+def parse_jobs(value: str) -> Union[int, str]:
+    """Parse a number of jobs, or "auto"."""
+    if value == AUTO_JOBS:
+        return AUTO_JOBS
+    return int(value)
+
+
+def get_load() -> float:
+    try:
+        return os.getloadavg()[0]
+    except OSError:
+        logging.debug("Could not read the load average", exc_info=True)
+        return 0.0
+
+
+def get_cpu_seconds() -> float:
+    """CPU time used by daktari itself and the commands it has run."""
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+class AdaptiveConcurrency:
+    """Chooses how many checks to run at once. It starts small and, as checks finish, adds a worker while that keeps
+    raising throughput and there are CPUs to spare. It removes one when the machine is overloaded or the last worker
+    added made things slower."""
+
+    def __init__(
+        self,
+        max_jobs: int,
+        initial_jobs: int = INITIAL_JOBS,
+        cpu_count: Optional[int] = None,
+        interval: float = ADJUST_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        load_sampler: Callable[[], float] = get_load,
+        cpu_sampler: Callable[[], float] = get_cpu_seconds,
+    ):
+        self.max_jobs = max(max_jobs, 1)
+        self.jobs = min(max(initial_jobs, 1), self.max_jobs)
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+        self.interval = interval
+        self.clock = clock
+        self.load_sampler = load_sampler
+        self.cpu_sampler = cpu_sampler
+        self.lock = threading.Lock()
+        self.finished = 0
+        self.sampled_at = clock()
+        self.sampled_cpu = cpu_sampler()
+        self.previous_throughput: Optional[float] = None
+        self.last_change = 0
+
+    def limit(self) -> int:
+        with self.lock:
+            return self.jobs
+
+    def check_finished(self):
+        with self.lock:
+            self.finished += 1
+            now = self.clock()
+            elapsed = now - self.sampled_at
+            if elapsed < self.interval:
+                return
+
+            cpu = self.cpu_sampler()
+            busy_cpus = (cpu - self.sampled_cpu) / elapsed
+            throughput = self.finished / elapsed
+            load = self.load_sampler()
+            slower = (
+                self.last_change > 0
+                and self.previous_throughput is not None
+                and throughput < self.previous_throughput * (1 - THROUGHPUT_TOLERANCE)
+            )
+            if load > self.cpu_count * OVERLOADED_LOAD_PER_CPU or slower:
+                change = -1
+            elif busy_cpus > self.cpu_count * SATURATED_CPU_FRACTION:
+                change = 0
+            else:
+                change = 1
+            previous_jobs = self.jobs
+            self.jobs = min(max(self.jobs + change, 1), self.max_jobs)
+            self.last_change = self.jobs - previous_jobs
+            logging.debug(
+                f"Adaptive concurrency: {throughput:.1f} checks/s, {busy_cpus:.1f} CPUs busy, load {load:.1f}; "
+                f"{previous_jobs} -> {self.jobs} jobs"
+            )
+
+            self.finished = 0
+            self.sampled_at = now
+            self.sampled_cpu = cpu
+            self.previous_throughput = throughput
+
+
+class DaemonThreadPool:
+    """Runs functions on up to max_workers threads, like ThreadPoolExecutor. The workers are daemon threads, so unlike
+    ThreadPoolExecutor's they aren't joined when the interpreter exits, and a fail-fast run can exit straight away
+    however long the checks it abandoned would take to finish."""
+
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self.max_workers = max(max_workers, 1)
+        self.thread_name_prefix = thread_name_prefix
+        self.tasks: "queue.SimpleQueue[Optional[Tuple[Future, Callable[..., Any], Tuple[Any, ...]]]]" = (
+            queue.SimpleQueue()
+        )
+        self.workers: List[threading.Thread] = []
+        self.idle_workers = threading.Semaphore(0)
+        self.shut_down = False
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        future: Future = Future()
+        self.tasks.put((future, fn, args))
+        if not self.idle_workers.acquire(blocking=False) and len(self.workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self.work, name=f"{self.thread_name_prefix}_{len(self.workers)}", daemon=True
+            )
+            self.workers.append(worker)
+            worker.start()
+        return future
+
+    def work(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                return
+            future, fn, args = task
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args))
+                except BaseException as err:
+                    future.set_exception(err)
+            if self.shut_down:
+                return
+            self.idle_workers.release()
+
+    def shutdown(self):
+        """Cancel anything not yet started and let idle workers exit, without waiting for those still running."""
+        self.shut_down = True
+        while True:
+            try:
+                task = self.tasks.get_nowait()
+            except queue.Empty:
+                break
+            if task is not None:
+                task[0].cancel()
+        for _ in self.workers:
+            self.tasks.put(None)
@@ -3,7 +3,7 @@ import re
 import os
 from dataclasses import dataclass, replace, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 import yaml
 from colors import red, yellow
@@ -12,7 +12,7 @@ from yaml import YAMLError
 
 from daktari import __version__
 from daktari.check import Check
-from daktari.check_utils import get_all_dependent_check_names
+from daktari.check_index import CheckIndex, compile_name_patterns
 from daktari.resource_utils import get_resource
 from daktari.result_printer import print_suggestion_text
 from daktari.command_utils import CommandErrorException, run_command
@@ -57,7 +57,7 @@ def apply_local_config(config: Config) -> Optional[Config]:
     if local_config is None:
         return config
 
-    ignored_checks: List[str] = local_config.get("ignoredChecks", [])
+    ignored_checks: List[str] = local_config.get("ignoredChecks") or []
     updated_config = remove_ignored_checks(config, ignored_checks)
 
     if local_config.get("alwaysQuiet", False):
@@ -77,15 +77,25 @@ def write_local_config_template():
     )
 
 
-def remove_ignored_checks(config: Config, ignored_check_names: List[str]) -> Config:
-    ignored_checks = [check for check in config.checks if check_should_be_ignored(check, ignored_check_names)]
-    remaining_checks = [check for check in config.checks if check not in ignored_checks]
+def remove_ignored_checks(config: Config, ignored_check_patterns: List[str]) -> Config:
+    """Remove checks whose names match any of the patterns (e.g. "intellij.*"), along with the checks depending on
+    them, even where the matching dependency isn't itself in the config."""
+    if not ignored_check_patterns:
+        return config
+
+    index = CheckIndex(config.checks)
+    matches_ignored = compile_name_patterns(ignored_check_patterns)
+    known_names = set(index.by_name).union(*[index.dependency_names(check) for check in config.checks])
+    ignored_names = {name for name in known_names if matches_ignored(name)}
+
+    ignored_checks = [check for check in config.checks if check_should_be_ignored(index, check, ignored_names)]
+    ignored_ids = {id(check) for check in ignored_checks}
+    remaining_checks = [check for check in config.checks if id(check) not in ignored_ids]
     return replace(config, checks=remaining_checks, ignored_checks=ignored_checks)
 
 
-def check_should_be_ignored(check: Check, ignored_check_names: List[str]) -> bool:
-    dependents = get_all_dependent_check_names(check)
-    return check.name in ignored_check_names or any([dependent in ignored_check_names for dependent in dependents])
+def check_should_be_ignored(index: CheckIndex, check: Check, ignored_names: Set[str]) -> bool:
+    return check.name in ignored_names or not index.dependency_names(check).isdisjoint(ignored_names)
 
 
 def parse_raw_config(config_path: Path, raw_config: str) -> Optional[Config]:
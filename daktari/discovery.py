@@ -0,0 +1,83 @@
+import json
+import os
+from dataclasses import replace
+from io import StringIO
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from xml.etree.ElementTree import Element, fromstring, tostring
+
+from daktari.check import Check, CheckResult
+from daktari.result_cache import ResultCache
+from daktari.result_formatter import JsonFormatter, JunitFormatter, NdjsonFormatter, ResultFormatter, TextFormatter
+
+CONFIG_FILE_NAME = ".daktari.py"
+IGNORED_DIRECTORIES = {"node_modules", "venv", "build", "dist", "target", "__pycache__"}
+
+
+def find_config_paths(root: Path) -> List[Path]:
+    """Find every config beneath root, skipping hidden and dependency/build directories."""
+    config_paths = []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = sorted(
+            subdirectory
+            for subdirectory in subdirectories
+            if not subdirectory.startswith(".") and subdirectory not in IGNORED_DIRECTORIES
+        )
+        if CONFIG_FILE_NAME in files:
+            config_paths.append(Path(directory) / CONFIG_FILE_NAME)
+    return config_paths
+
+
+class SharedResultCache(ResultCache):
+    """A result cache which also shares the results of machine-wide checks between configs run in one process."""
+
+    def __init__(self, entries: Dict[str, Dict], refresh: bool = False):
+        super().__init__(entries, refresh)
+        self.shared: Dict[str, CheckResult] = {}
+
+    def get(self, check: Check) -> Optional[CheckResult]:
+        fingerprint = self.fingerprint(check)
+        if check.is_machine_wide() and fingerprint is not None:
+            shared_result = self.shared.get(fingerprint)
+            if shared_result is not None:
+                return replace(shared_result, cached=True)
+        return super().get(check)
+
+    def put(self, check: Check, result: CheckResult):
+        super().put(check, result)
+        fingerprint = self.fingerprint(check)
+        if check.is_machine_wide() and fingerprint is not None and not result.cached:
+            with self.lock:
+                self.shared[fingerprint] = result
+
+
+def get_grouped_formatter(
+    output_format: str, quiet_mode: bool, config_name: str, timing_report: bool = False
+) -> ResultFormatter:
+    """A formatter for one of several configs. Whole-document formats are collected and combined at the end."""
+    if output_format == "json":
+        return JsonFormatter(StringIO())
+    elif output_format == "ndjson":
+        return NdjsonFormatter(extra_fields={"config": config_name}, timing_report=timing_report)
+    elif output_format == "junit":
+        return JunitFormatter(StringIO(), suite_name=config_name)
+    else:
+        return TextFormatter(quiet_mode)
+
+
+def combine_grouped_output(
+    output_format: str, outputs: List[Tuple[str, ResultFormatter]], all_passed: bool
+) -> Optional[str]:
+    documents = [
+        (config_name, formatter.stream.getvalue())
+        for config_name, formatter in outputs
+        if isinstance(formatter, (JsonFormatter, JunitFormatter)) and isinstance(formatter.stream, StringIO)
+    ]
+    if output_format == "json":
+        configs = [{"config": config_name, **json.loads(document)} for config_name, document in documents]
+        return json.dumps({"all_passed": all_passed, "configs": configs})
+    elif output_format == "junit":
+        suites = Element("testsuites", name="daktari")
+        suites.extend(fromstring(document) for _, document in documents)
+        return tostring(suites, encoding="unicode")
+    return None
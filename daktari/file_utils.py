@@ -1,20 +1,20 @@
 from pathlib import Path
 
-from daktari.command_utils import get_stdout
-
 import os
 import re
 from pwd import getpwuid
 
 
+GIT_CRYPT_HEADER = b"\0GITCRYPT\0"
+
+
 def get_absolute_path(path: str) -> str:
     return os.path.expanduser(path)
 
 
-def is_ascii(path: str) -> bool:
-    file_output = get_stdout(["file", path]) or ""
-    parts = file_output.strip().split(": ")
-    return parts[1] == "ASCII text"
+def is_git_crypt_encrypted(path: str) -> bool:
+    with open(path, "rb") as file:
+        return file.read(len(GIT_CRYPT_HEADER)) == GIT_CRYPT_HEADER
 
 
 def file_exists(path: str) -> bool:
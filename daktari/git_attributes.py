@@ -0,0 +1,92 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Pattern
+
+
+@dataclass
+class GitAttributesFilterRule:
+    base_dir: str
+    pattern: Pattern[str]
+    filter: Optional[str]
+
+
+def pattern_to_regex(pattern: str) -> Pattern[str]:
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    regex = "" if anchored else "(?:.*/)?"
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1 :]:
+            end = pattern.index("]", i + 1)
+            char_class = pattern[i + 1 : end]
+            regex += "[" + ("^" + char_class[1:] if char_class.startswith("!") else char_class) + "]"
+            i = end + 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return re.compile(regex + "$")
+
+
+def parse_git_attributes_filters(file_content: str, base_dir: str = "") -> List[GitAttributesFilterRule]:
+    rules = []
+    for line in file_content.splitlines():
+        parts = line.strip().split()
+        if not parts or parts[0].startswith("#"):
+            continue
+
+        pattern, attributes = parts[0], parts[1:]
+        # Patterns ending in a slash only match directories, which never carry a filter
+        if pattern.endswith("/"):
+            continue
+
+        for attribute in attributes:
+            if attribute.startswith("filter="):
+                rules.append(GitAttributesFilterRule(base_dir, pattern_to_regex(pattern), attribute[len("filter=") :]))
+            elif attribute in ("-filter", "!filter"):
+                rules.append(GitAttributesFilterRule(base_dir, pattern_to_regex(pattern), None))
+    return rules
+
+
+def get_filter_for_path(path: str, rules: List[GitAttributesFilterRule]) -> Optional[str]:
+    result = None
+    for rule in rules:
+        prefix = f"{rule.base_dir}/" if rule.base_dir else ""
+        if path.startswith(prefix) and rule.pattern.match(path[len(prefix) :]):
+            result = rule.filter
+    return result
+
+
+def read_git_attributes_filters(repo_paths: Iterable[str]) -> List[GitAttributesFilterRule]:
+    """Read filter rules from every .gitattributes in the repo, ordered from lowest to highest precedence."""
+    attributes_files = sorted(
+        [path for path in repo_paths if os.path.basename(path) == ".gitattributes"],
+        key=lambda path: path.count("/"),
+    )
+    if os.path.isfile(".git/info/attributes"):
+        attributes_files.append(".git/info/attributes")
+
+    rules = []
+    for attributes_file in attributes_files:
+        base_dir = "" if attributes_file.startswith(".git/") else os.path.dirname(attributes_file)
+        with open(attributes_file, "r") as f:
+            rules += parse_git_attributes_filters(f.read(), base_dir)
+    return rules
+
+
+def get_paths_with_filter(repo_paths: List[str], filter_name: str) -> List[str]:
+    rules = read_git_attributes_filters(repo_paths)
+    return [path for path in repo_paths if get_filter_for_path(path, rules) == filter_name]
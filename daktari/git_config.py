@@ -0,0 +1,85 @@
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from daktari.command_utils import run_command
+from daktari.run_cache import run_cached
+
+
+@dataclass
+class GitConfigEntry:
+    value: str
+    origin: str
+
+
+def normalise_key(key: str) -> str:
+    # Section and variable names are case-insensitive, subsection names are not
+    parts = key.split(".")
+    if len(parts) < 2:
+        return key.lower()
+    return ".".join([parts[0].lower(), *parts[1:-1], parts[-1].lower()])
+
+
+def parse_git_config_list(output: str) -> Dict[str, List[GitConfigEntry]]:
+    """Parse the output of `git config --list -z --show-origin`.
+
+    Each entry is "<origin>\\0<key>\\n<value>\\0", or "<origin>\\0<key>\\0" for a key with no value."""
+    entries: Dict[str, List[GitConfigEntry]] = {}
+    fields = output.split("\0")
+    for origin, key_value in zip(fields[0::2], fields[1::2]):
+        key, separator, value = key_value.partition("\n")
+        # A key with no value is an implicit boolean true
+        entry = GitConfigEntry(value if separator else "true", origin)
+        entries.setdefault(normalise_key(key), []).append(entry)
+    return entries
+
+
+class GitConfigSnapshot:
+    def __init__(self, entries: Dict[str, List[GitConfigEntry]]):
+        self.entries = entries
+
+    def get_entry(self, key: str) -> Optional[GitConfigEntry]:
+        # As with `git config <key>`, the last value found wins
+        values = self.entries.get(normalise_key(key))
+        return values[-1] if values else None
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.get_entry(key)
+        return None if entry is None else entry.value
+
+    def get_all(self, key: str) -> List[str]:
+        return [entry.value for entry in self.entries.get(normalise_key(key), [])]
+
+    def get_origin(self, key: str) -> Optional[str]:
+        entry = self.get_entry(key)
+        return None if entry is None else entry.origin
+
+
+@run_cached
+def read_git_config_snapshot(directory: str) -> GitConfigSnapshot:
+    try:
+        output = run_command(["git", "config", "--list", "-z", "--show-origin"]).stdout
+    except Exception:
+        logging.debug("Exception reading git config", exc_info=True)
+        return GitConfigSnapshot({})
+    return GitConfigSnapshot(parse_git_config_list(output))
+
+
+def get_git_config_snapshot() -> GitConfigSnapshot:
+    """Return the git config for the current directory, read once per run and shared by every check."""
+    return read_git_config_snapshot(os.getcwd())
+
+
+def get_git_config(key: str) -> Optional[str]:
+    return get_git_config_snapshot().get(key)
+
+
+def describe_git_config_origin(key: str) -> str:
+    origin = get_git_config_snapshot().get_origin(key)
+    return f" (set in {origin})" if origin else ""
+
+
+def describe_git_config_value(key: str) -> str:
+    value = get_git_config(key)
+    return "" if value is None else f": {value}{describe_git_config_origin(key)}"
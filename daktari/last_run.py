@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from daktari.cache_utils import read_cache_file, update_cache_file
+from daktari.check import Check, CheckResult, CheckStatus
+from daktari.check_index import CheckIndex
+from daktari.check_utils import get_check_id
+
+LAST_RUN_FILE = "last_run.json"
+FAILED_STATUSES = {CheckStatus.FAIL.value, CheckStatus.ERROR.value}
+# Checks worth running again, including those skipped because a dependency failed
+RERUN_STATUSES = FAILED_STATUSES | {CheckStatus.PASS_WITH_WARNING.value}
+
+
+class LastRun:
+    """The latest result of each check in each config, keyed by the config's directory, so that a later run can
+    repeat just the checks that didn't pass. Checks are keyed by get_check_id, as several may share a name."""
+
+    def __init__(self, configs: Dict[str, Dict[str, Any]]):
+        self.configs = configs
+        # What this process changed, so that saving leaves the results of other daktari processes in place
+        self.recorded: Dict[str, Set[str]] = {}
+        self.cleared: Set[str] = set()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls) -> "LastRun":
+        contents = read_cache_file(LAST_RUN_FILE)
+        return cls(contents if isinstance(contents, dict) else {})
+
+    def get_statuses(self, directory: Optional[str] = None) -> Dict[str, str]:
+        with self.lock:
+            return dict(self.configs.get(directory or os.getcwd(), {}).get("results", {}))
+
+    def clear(self, directory: Optional[str] = None):
+        """Forget the config's results before a full run, so checks since removed from it are forgotten too."""
+        with self.lock:
+            self.configs.pop(directory or os.getcwd(), None)
+            self.cleared.add(directory or os.getcwd())
+            self.recorded.pop(directory or os.getcwd(), None)
+
+    def get_failed_ids(self, directory: Optional[str] = None) -> Set[str]:
+        statuses = self.get_statuses(directory)
+        return {check_id for check_id, status in statuses.items() if status in FAILED_STATUSES}
+
+    def record(self, check_id: str, result: CheckResult, directory: Optional[str] = None):
+        # Results are merged into those of earlier runs, so a partial run only updates the checks it ran
+        with self.lock:
+            config = self.configs.setdefault(directory or os.getcwd(), {})
+            config.setdefault("results", {})[check_id] = result.status.value
+            config["finished_at"] = time.time()
+            self.recorded.setdefault(directory or os.getcwd(), set()).add(check_id)
+
+    def save(self):
+        with self.lock:
+            cleared = set(self.cleared)
+            recorded = {
+                directory: {check_id: self.configs[directory]["results"][check_id] for check_id in check_ids}
+                for directory, check_ids in self.recorded.items()
+            }
+            finished_at = {directory: self.configs[directory]["finished_at"] for directory in recorded}
+
+        def merge(contents: Optional[Any]) -> Dict[str, Any]:
+            contents = contents if isinstance(contents, dict) else {}
+            for directory in cleared:
+                contents.pop(directory, None)
+            for directory, results in recorded.items():
+                earlier_results = contents.get(directory, {}).get("results", {})
+                contents[directory] = {"results": {**earlier_results, **results}, "finished_at": finished_at[directory]}
+            return contents
+
+        update_cache_file(LAST_RUN_FILE, merge)
+
+
+def select_failed_checks(checks: List[Check], last_run: LastRun, directory: Optional[str] = None) -> List[Check]:
+    """The checks that didn't pass last time, plus the checks they depend on. All of them if the config hasn't been
+    run before."""
+    statuses = last_run.get_statuses(directory)
+    if not statuses:
+        return checks
+    failed = [check for check in checks if statuses.get(get_check_id(check)) in RERUN_STATUSES]
+    failed_ids = {id(check) for check in failed}
+    index = CheckIndex(checks)
+    # Dependencies are named, but checks sharing a failed check's name that passed last time needn't run again
+    dependency_names = index.dependency_closure(name for check in failed for name in index.dependency_names(check))
+    return [check for check in checks if id(check) in failed_ids or check.name in dependency_names]
@@ -0,0 +1,66 @@
+import logging
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+# An address rather than a hostname, so that the probe doesn't wait on DNS when offline
+DEFAULT_PROBE_ADDRESS = "1.1.1.1:443"
+PROBE_TIMEOUT_SECONDS = 1.0
+
+
+def parse_probe_address(value: str) -> Optional[Tuple[str, int]]:
+    """Parse HOST:PORT, or "off" for no probe."""
+    if value == "off":
+        return None
+    host, separator, port = value.rpartition(":")
+    if not separator or not host or not port.isdigit():
+        raise ValueError(f"Expected HOST:PORT, got {value}")
+    return host.strip("[]"), int(port)
+
+
+class NetworkProbe:
+    """Finds out once per run whether the network is reachable, by trying to connect to a single address."""
+
+    def __init__(self, address: Tuple[str, int], timeout: float = PROBE_TIMEOUT_SECONDS):
+        self.address = address
+        self.timeout = timeout
+        self.online: Optional[bool] = None
+        self.lock = threading.Lock()
+
+    def is_online(self) -> bool:
+        # Checks running in parallel wait for the first probe rather than each making their own
+        with self.lock:
+            if self.online is None:
+                self.online = self.probe()
+            return self.online
+
+    def probe(self) -> bool:
+        try:
+            with socket.create_connection(self.address, timeout=self.timeout):
+                logging.debug(f"Network probe connected to {self.address}")
+                return True
+        except OSError:
+            logging.debug(f"Network probe could not connect to {self.address}", exc_info=True)
+            return False
+
+
+# The probe for the run in progress, shared by all of its worker threads
+active_network_probe: Optional[NetworkProbe] = None
+
+
+@contextmanager
+def use_network_probe(probe: Optional[NetworkProbe]):
+    global active_network_probe
+    previous_probe = active_network_probe
+    active_network_probe = probe
+    try:
+        yield probe
+    finally:
+        active_network_probe = previous_probe
+
+
+def is_network_unreachable() -> bool:
+    """Whether the run's probe found the network unreachable. Always false unless the run was asked to probe."""
+    probe = active_network_probe
+    return probe is not None and not probe.is_online()
@@ -2,6 +2,13 @@ from argparse import ArgumentParser
 from pathlib import Path
 
 from daktari import __version__
+from daktari.check_resources import DEFAULT_RESOURCE_LIMIT, parse_resource_limit
+from daktari.check_shards import parse_shard
+from daktari.check_sorter import CHECK_ORDERS, CONFIG_ORDER
+from daktari.concurrency import parse_jobs
+from daktari.network import DEFAULT_PROBE_ADDRESS, parse_probe_address
+from daktari.result_formatter import OUTPUT_FORMATS
+from daktari.status import status_parser
 
 
 def validate_as_file_path(parser: ArgumentParser, arg: str) -> Path:
@@ -29,11 +36,128 @@ argument_parser.add_argument(
 argument_parser.add_argument(
     "-c",
     "--config",
-    default=".daktari.py",
     dest="config_path",
     required=False,
-    help="Python configuration file",
+    help="Python configuration file (default: .daktari.py)",
     metavar="FILE",
     type=lambda arg: validate_as_file_path(argument_parser, arg),
 )
+argument_parser.add_argument(
+    "--discover",
+    type=Path,
+    metavar="ROOT",
+    help="run every .daktari.py config found beneath ROOT in one go, sharing the results of machine-wide checks "
+    "between them, and report results grouped per config",
+)
+argument_parser.add_argument(
+    "--plan",
+    action="store_true",
+    help="show the order checks would run in, which would be skipped, how long each took in recent runs and the "
+    "longest chain of dependent checks, without running any",
+)
+argument_parser.add_argument(
+    "--only",
+    action="append",
+    metavar="PATTERN",
+    help="only run checks whose names match this glob (e.g. 'kubectl.*'), plus the checks they depend on",
+)
+argument_parser.add_argument(
+    "--skip",
+    action="append",
+    metavar="PATTERN",
+    help="don't run checks whose names match this glob, nor the checks that depend on them",
+)
+argument_parser.add_argument(
+    "--rerun-failed",
+    action="store_true",
+    help="only run the checks that failed, errored or warned last time, plus the checks they depend on",
+)
+argument_parser.add_argument(
+    "--shard",
+    type=parse_shard,
+    metavar="I/N",
+    help="only run shard I of N, for splitting a run between parallel CI jobs. Shards are balanced by the durations "
+    "of recent runs and include the checks they depend on. Combine the outputs with 'daktari merge'.",
+)
+argument_parser.add_argument(
+    "-j",
+    "--jobs",
+    type=parse_jobs,
+    metavar="N",
+    help="run up to N checks at once, or 'auto' to adjust the number as checks run based on the system load and the "
+    "throughput achieved (default: 1, or the number of CPUs with --budget-ms or --speculative)",
+)
+argument_parser.add_argument(
+    "--resource-limit",
+    action="append",
+    dest="resource_limits",
+    type=parse_resource_limit,
+    metavar="NAME=N",
+    help="when running checks in parallel, run at most N at once that use the named resource, such as gcloud "
+    f"(default: {DEFAULT_RESOURCE_LIMIT} for each resource)",
+)
+argument_parser.add_argument(
+    "--budget-ms",
+    type=int,
+    metavar="MS",
+    help="only run the checks expected to finish within this many milliseconds, based on previous runs, and "
+    "report the rest as deferred. Intended for git hooks.",
+)
+argument_parser.add_argument(
+    "--speculative",
+    action="store_true",
+    help="start side-effect-free checks alongside their dependencies, discarding their results if a dependency "
+    "fails. Implies running checks in parallel.",
+)
+argument_parser.add_argument(
+    "--order",
+    choices=CHECK_ORDERS,
+    default=CONFIG_ORDER,
+    help="order to run checks in, within their dependencies: as listed in the config, or those most likely to fail "
+    "for the time they take first, based on previous runs, to find a failure sooner with --fail-fast "
+    "(default: config)",
+)
+argument_parser.add_argument(
+    "--timing-report",
+    action="store_true",
+    help="list the slowest checks at the end of the run",
+)
+argument_parser.add_argument(
+    "--regression-threshold",
+    type=int,
+    default=50,
+    metavar="PERCENT",
+    help="warn about checks that took this much longer than their median over recent runs (default: 50)",
+)
+argument_parser.add_argument(
+    "--network-probe",
+    type=parse_probe_address,
+    nargs="?",
+    const=parse_probe_address(DEFAULT_PROBE_ADDRESS),
+    metavar="HOST:PORT",
+    help="connect to this address once per run to find out whether the network is reachable. If it isn't, checks "
+    "that need the network fail straight away rather than waiting to time out. Off by default, since some networks "
+    f"only allow connections through a proxy (default address: {DEFAULT_PROBE_ADDRESS})",
+)
+argument_parser.add_argument(
+    "--refresh", action="store_true", help="ignore cached results and run every check, then update the cache"
+)
+argument_parser.add_argument(
+    "--format",
+    choices=OUTPUT_FORMATS,
+    default="text",
+    dest="output_format",
+    help="output format for check results (default: text)",
+)
+subparsers = argument_parser.add_subparsers(dest="command", metavar="COMMAND")
+merge_parser = subparsers.add_parser(
+    "merge", help="combine the --format json or ndjson outputs of several shards into a single json report"
+)
+merge_parser.add_argument("reports", nargs="+", type=Path, metavar="REPORT", help="output of a shard")
+subparsers.add_parser(
+    "status",
+    parents=[status_parser],
+    help="report whether the last run of the config in this directory passed, without running any checks",
+)
+
 argument_parser.add_argument("--version", action="version", version="%(prog)s {version}".format(version=__version__))
@@ -0,0 +1,104 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Set
+
+from daktari.cache_utils import read_cache_file, update_cache_file
+from daktari.check import Check, CheckResult, CheckStatus
+from daktari.check_utils import get_check_fingerprint
+
+RESULT_CACHE_FILE = "results.json"
+MISSING_INPUT = "missing"
+
+
+def get_input_state(check: Check) -> Dict[str, Any]:
+    """The modification time and size of each of the check's input files, as a cached result only holds while they
+    are unchanged."""
+    state: Dict[str, Any] = {}
+    for path in check.get_input_paths():
+        try:
+            stat = os.stat(os.path.expanduser(path))
+        except OSError:
+            logging.debug(f"Could not stat {path}", exc_info=True)
+            state[path] = MISSING_INPUT
+            continue
+        state[path] = [stat.st_mtime_ns, stat.st_size]
+    return state
+
+
+class ResultCache:
+    """Persists passing results of checks that declare a cache_ttl, so later runs can skip them."""
+
+    def __init__(self, entries: Dict[str, Dict[str, Any]], refresh: bool = False):
+        self.entries = entries
+        self.refresh = refresh
+        self.fingerprints: Dict[int, Optional[str]] = {}
+        # Entries this process added or removed, so that saving leaves those of other daktari processes in place
+        self.updated: Set[str] = set()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, refresh: bool = False) -> "ResultCache":
+        entries = read_cache_file(RESULT_CACHE_FILE)
+        return cls(entries if isinstance(entries, dict) else {}, refresh)
+
+    def fingerprint(self, check: Check) -> Optional[str]:
+        # Remember each check's fingerprint, so it is unaffected by anything the check does while running
+        with self.lock:
+            if id(check) not in self.fingerprints:
+                self.fingerprints[id(check)] = get_check_fingerprint(check)
+            return self.fingerprints[id(check)]
+
+    def get(self, check: Check) -> Optional[CheckResult]:
+        if check.cache_ttl is None or self.refresh:
+            return None
+
+        fingerprint = self.fingerprint(check)
+        entry = None if fingerprint is None else self.entries.get(fingerprint)
+        if entry is None or entry["expires"] <= time.time():
+            return None
+        if entry.get("inputs", {}) != get_input_state(check):
+            logging.debug(f"Inputs of check {check.name} have changed since its result was cached")
+            return None
+
+        logging.debug(f"Using cached result for check {check.name}")
+        return CheckResult(check.name, CheckStatus(entry["status"]), entry["summary"], check.suggestions, cached=True)
+
+    def put(self, check: Check, result: CheckResult):
+        if check.cache_ttl is None or result.cached:
+            return
+
+        fingerprint = self.fingerprint(check)
+        if fingerprint is None:
+            return
+        with self.lock:
+            self.updated.add(fingerprint)
+            if result.status != CheckStatus.PASS:
+                self.entries.pop(fingerprint, None)
+                return
+
+            expires = time.time() + check.cache_ttl.total_seconds()
+            if result.valid_until is not None:
+                expires = min(expires, result.valid_until)
+            self.entries[fingerprint] = {
+                "status": result.status.value,
+                "summary": result.summary,
+                "expires": expires,
+                "inputs": get_input_state(check),
+            }
+
+    def save(self):
+        with self.lock:
+            updates = {fingerprint: self.entries.get(fingerprint) for fingerprint in self.updated}
+
+        def merge(entries: Optional[Any]) -> Dict[str, Any]:
+            entries = {**(entries if isinstance(entries, dict) else {}), **updates}
+            now = time.time()
+            return {
+                fingerprint: entry
+                for fingerprint, entry in entries.items()
+                if entry is not None and entry["expires"] > now
+            }
+
+        update_cache_file(RESULT_CACHE_FILE, merge)
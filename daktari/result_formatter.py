@@ -0,0 +1,224 @@
+import abc
+import json
+import sys
+import threading
+from typing import Any, Dict, List, Optional, TextIO
+from xml.etree.ElementTree import Element, SubElement, tostring
+
+from daktari.check import CheckResult, CheckStatus
+from daktari.os import detect_os
+from daktari.result_printer import (
+    copy_suggestion_to_clipboard,
+    format_check_result,
+    get_most_specific_suggestion,
+    progress_bar,
+)
+from daktari.terminal_renderer import TerminalRenderer
+from daktari.timing_report import CheckTiming, TimingReport
+
+OUTPUT_FORMATS = ["text", "json", "ndjson", "junit"]
+
+
+class ResultFormatter(abc.ABC):
+    """Receives check results from the runner as they complete and writes them out in a particular format."""
+
+    def start(self, total_checks: int, jobs: int = 1):
+        pass
+
+    def check_started(self, name: str, check_id: str):
+        pass
+
+    @abc.abstractmethod
+    def check_finished(self, result: CheckResult, idx: int, total_checks: int, early_exit: bool):
+        raise NotImplementedError("check_finished must be implemented")
+
+    def checks_deferred(self, names: List[str]):
+        pass
+
+    def timings_reported(self, report: TimingReport):
+        pass
+
+    def finish(self, all_passed: bool):
+        pass
+
+
+class TextFormatter(ResultFormatter):
+    def __init__(self, quiet_mode: bool, renderer: Optional[TerminalRenderer] = None):
+        self.quiet_mode = quiet_mode
+        self.renderer = renderer or TerminalRenderer()
+
+    def start(self, total_checks: int, jobs: int = 1):
+        # When checks run one at a time, the one in flight is always the next to be reported
+        if jobs <= 1:
+            self.renderer.show_in_flight = False
+
+    def check_started(self, name: str, check_id: str):
+        self.renderer.check_started(name, check_id)
+
+    def check_finished(self, result: CheckResult, idx: int, total_checks: int, early_exit: bool):
+        if result.check_id is not None:
+            self.renderer.check_finished(result.check_id)
+        # Only the terminal offers the suggested command on the clipboard, as the other formats are read by tools
+        clipboard_message = copy_suggestion_to_clipboard(get_chosen_suggestion(result)) if early_exit else None
+        output = format_check_result(result, early_exit, self.quiet_mode, clipboard_message)
+        if self.quiet_mode:
+            self.renderer.set_progress(progress_bar(idx + 1, total_checks, early_exit))
+        if output:
+            self.renderer.write(output)
+        else:
+            self.renderer.render()
+
+    def timings_reported(self, report: TimingReport):
+        output = report.format()
+        if output:
+            self.renderer.write("\n" + output)
+
+    def checks_deferred(self, names: List[str]):
+        self.renderer.write(f"ⓘ  {len(names)} check(s) deferred to stay within the time budget: {', '.join(names)}\n")
+
+    def finish(self, all_passed: bool):
+        self.renderer.close()
+
+
+def get_chosen_suggestion(result: CheckResult) -> Optional[str]:
+    # As with text output, suggestions are only offered for failures and warnings
+    if result.status not in (CheckStatus.FAIL, CheckStatus.PASS_WITH_WARNING):
+        return None
+    return get_most_specific_suggestion(detect_os(), result.suggestions)
+
+
+def result_to_dict(result: CheckResult) -> Dict[str, Any]:
+    return {
+        "name": result.name,
+        "id": result.check_id,
+        "status": result.status.value,
+        "summary": result.summary,
+        "duration": round(result.duration, 6),
+        "cached": result.cached,
+        "suggestion": get_chosen_suggestion(result),
+    }
+
+
+def timing_to_dict(timing: CheckTiming) -> Dict[str, Any]:
+    return {"name": timing.name, "duration": round(timing.duration, 6), "median": timing.median}
+
+
+class NdjsonFormatter(ResultFormatter):
+    """Streams one JSON event per line, flushing each so consumers see checks as they complete."""
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        extra_fields: Optional[Dict[str, Any]] = None,
+        timing_report: bool = False,
+    ):
+        self.stream = stream
+        # Added to every event, e.g. to say which config the results belong to
+        self.extra_fields = extra_fields or {}
+        # Whether --timing-report asked for the timings
+        self.timing_report = timing_report
+        self.lock = threading.Lock()
+
+    def write_event(self, event: Dict[str, Any]):
+        stream = self.stream or sys.stdout
+        with self.lock:
+            stream.write(json.dumps({**event, **self.extra_fields}) + "\n")
+            stream.flush()
+
+    def start(self, total_checks: int, jobs: int = 1):
+        self.write_event({"event": "start", "total": total_checks})
+
+    def check_finished(self, result: CheckResult, idx: int, total_checks: int, early_exit: bool):
+        self.write_event({"event": "check", **result_to_dict(result)})
+
+    def checks_deferred(self, names: List[str]):
+        self.write_event({"event": "deferred", "names": names})
+
+    def timings_reported(self, report: TimingReport):
+        if not self.timing_report:
+            return
+        self.write_event(
+            {
+                "event": "timings",
+                "slowest": [timing_to_dict(timing) for timing in report.slowest()],
+                "regressions": [timing_to_dict(timing) for timing in report.regressions()],
+            }
+        )
+
+    def finish(self, all_passed: bool):
+        self.write_event({"event": "finish", "all_passed": all_passed})
+
+
+class CollectingFormatter(ResultFormatter):
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+        self.results: List[CheckResult] = []
+        self.deferred: List[str] = []
+        self.lock = threading.Lock()
+
+    def check_finished(self, result: CheckResult, idx: int, total_checks: int, early_exit: bool):
+        with self.lock:
+            self.results.append(result)
+
+    def checks_deferred(self, names: List[str]):
+        self.deferred = names
+
+    def finish(self, all_passed: bool):
+        stream = self.stream or sys.stdout
+        stream.write(self.render(all_passed) + "\n")
+        stream.flush()
+
+    @abc.abstractmethod
+    def render(self, all_passed: bool) -> str:
+        raise NotImplementedError("render must be implemented")
+
+
+class JsonFormatter(CollectingFormatter):
+    def render(self, all_passed: bool) -> str:
+        return json.dumps(
+            {
+                "all_passed": all_passed,
+                "checks": [result_to_dict(result) for result in self.results],
+                "deferred": self.deferred,
+            }
+        )
+
+
+class JunitFormatter(CollectingFormatter):
+    def __init__(self, stream: Optional[TextIO] = None, suite_name: str = "daktari"):
+        super().__init__(stream)
+        self.suite_name = suite_name
+
+    def render(self, all_passed: bool) -> str:
+        suite = Element(
+            "testsuite",
+            name=self.suite_name,
+            tests=str(len(self.results) + len(self.deferred)),
+            failures=str(len([result for result in self.results if result.status == CheckStatus.FAIL])),
+            errors=str(len([result for result in self.results if result.status == CheckStatus.ERROR])),
+            skipped=str(len(self.deferred)),
+            time=f"{sum(result.duration for result in self.results):.3f}",
+        )
+        for result in self.results:
+            case = SubElement(suite, "testcase", name=result.name, classname="daktari", time=f"{result.duration:.3f}")
+            if result.status == CheckStatus.FAIL:
+                SubElement(case, "failure", message=result.summary).text = get_chosen_suggestion(result)
+            elif result.status == CheckStatus.ERROR:
+                SubElement(case, "error", message=result.summary)
+            elif result.status == CheckStatus.PASS_WITH_WARNING:
+                SubElement(case, "system-out").text = result.summary
+        for name in self.deferred:
+            case = SubElement(suite, "testcase", name=name, classname="daktari", time="0.000")
+            SubElement(case, "skipped", message="deferred to stay within the time budget")
+        return tostring(suite, encoding="unicode")
+
+
+def get_result_formatter(output_format: str, quiet_mode: bool, timing_report: bool = False) -> ResultFormatter:
+    if output_format == "json":
+        return JsonFormatter()
+    elif output_format == "ndjson":
+        return NdjsonFormatter(timing_report=timing_report)
+    elif output_format == "junit":
+        return JunitFormatter()
+    else:
+        return TextFormatter(quiet_mode)
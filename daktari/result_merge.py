@@ -0,0 +1,64 @@
+import json
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from daktari.check import CheckStatus
+
+# When shards report the same check, such as a prerequisite they both ran, the worst result wins
+STATUS_SEVERITY = [CheckStatus.PASS, CheckStatus.PASS_WITH_WARNING, CheckStatus.FAIL, CheckStatus.ERROR]
+
+
+def read_report(contents: str) -> Dict[str, Any]:
+    """Read the output of a run in --format json or ndjson into the shape of the json output."""
+    try:
+        report = json.loads(contents)
+        if isinstance(report, dict) and "checks" in report:
+            return report
+    except json.JSONDecodeError:
+        logging.debug("Report is not a single JSON document, reading it as NDJSON", exc_info=True)
+
+    # A run that never finished didn't pass
+    report = {"all_passed": False, "checks": [], "deferred": []}
+    for line in contents.splitlines():
+        if not line.strip():
+            continue
+        event = json.loads(line)
+        if not isinstance(event, dict) or "event" not in event:
+            raise ValueError("Expected the output of --format json or ndjson")
+        if event["event"] == "check":
+            report["checks"].append({key: value for key, value in event.items() if key != "event"})
+        elif event["event"] == "deferred":
+            report["deferred"] += event["names"]
+        elif event["event"] == "finish":
+            report["all_passed"] = event["all_passed"]
+    return report
+
+
+def severity(check: Dict[str, Any]) -> int:
+    return STATUS_SEVERITY.index(CheckStatus(check["status"]))
+
+
+def merge_reports(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine the reports of shards into one, reporting each check that more than one shard ran only once.
+
+    Checks are matched by id, as several in a config may share a name. A config can also contain the same check more
+    than once, so the first occurrence in one shard is matched with the first in another, and so on."""
+    checks: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    for report in reports:
+        occurrences: Counter = Counter()
+        for check in report["checks"]:
+            # Reports from before checks had ids can only be matched by name
+            check_id = check.get("id") or check["name"]
+            key = (check_id, occurrences[check_id])
+            occurrences[check_id] += 1
+            existing = checks.get(key)
+            if existing is None or severity(check) > severity(existing):
+                checks[key] = check
+    names = {check["name"] for check in checks.values()}
+    deferred = {name for report in reports for name in report.get("deferred", []) if name not in names}
+    return {
+        "all_passed": all(report["all_passed"] for report in reports),
+        "checks": list(checks.values()),
+        "deferred": sorted(deferred),
+    }
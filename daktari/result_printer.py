@@ -9,9 +9,6 @@ from daktari.check import CheckResult, CheckStatus
 from daktari.os import OS, detect_os
 
 
-clear_line_prefix = "\33[2K\r"
-
-
 def check_status_symbol(status: CheckStatus) -> str:
     return {
         CheckStatus.PASS: "✅",
@@ -34,7 +31,7 @@ def get_most_specific_suggestion(this_os: str, suggestions: Dict[str, str]) -> O
     return suggestions.get(this_os, suggestions.get(OS.GENERIC))
 
 
-def print_suggestion_text(text: str):
+def format_suggestion_text(text: str) -> str:
     text = textwrap.dedent(text.lstrip("\n").rstrip())
 
     pattern = re.compile("<cmd>(.+)</cmd>")
@@ -50,52 +47,56 @@ def print_suggestion_text(text: str):
     max_width = max([len(line) for line in raw_lines])
 
     title = "💡 Suggestion "
-    print("┌─" + title + "─" * (max_width - len(title)) + "┐")
+    output = "┌─" + title + "─" * (max_width - len(title)) + "┐\n"
     for line in lines:
-        print(f"  {line}")
-    print("└" + "─" * (max_width + 2) + "┘")
+        output += f"  {line}\n"
+    output += "└" + "─" * (max_width + 2) + "┘\n"
+    return output
+
+
+def print_suggestion_text(text: str):
+    print(format_suggestion_text(text), end="")
 
 
-def copy_to_clipboard(suggestion: Optional[str]):
+def copy_suggestion_to_clipboard(suggestion: Optional[str]) -> str:
     if suggestion is not None:
         command_regex = re.compile(r"\<cmd\>(.*?)\<\/cmd\>")
         results = command_regex.findall(suggestion)
         if len(results) > 0:
             try:
                 pyclip.copy("\n".join(results))
-                print("ⓘ  Command copied to clipboard")
+                return "ⓘ  Command copied to clipboard"
             except pyclip.base.ClipboardSetupException:
-                print("ⓘ  Clipboard not available")
-            return
-    print("ⓘ  No command available to copy to clipboard")
+                return "ⓘ  Clipboard not available"
+    return "ⓘ  No command available to copy to clipboard"
 
 
-def print_check_result(result: CheckResult, early_exit: bool, quiet_mode: bool, idx: int, total_checks: int):
+def format_check_result(
+    result: CheckResult, early_exit: bool, quiet_mode: bool, clipboard_message: Optional[str] = None
+) -> str:
+    """Format a result as it should appear in the terminal. On early exit, clipboard_message says whether the
+    suggested command was copied."""
     this_os = detect_os()
     status_symbol = check_status_symbol(result.status)
     colour = check_status_colour(result.status)
+    output = ""
     if result.status != CheckStatus.PASS or not quiet_mode:
-        print(f"{clear_line_prefix}{status_symbol} [{colour(result.name)}] {result.summary}")
+        cached = " (cached)" if result.cached else ""
+        output += f"{status_symbol} [{colour(result.name)}] {result.summary}{cached}\n"
         if result.status in (CheckStatus.FAIL, CheckStatus.PASS_WITH_WARNING):
             suggestion = get_most_specific_suggestion(this_os, result.suggestions)
             if suggestion:
-                print_suggestion_text(suggestion)
+                output += format_suggestion_text(suggestion)
 
-            if early_exit:
-                copy_to_clipboard(suggestion)
+            if early_exit and clipboard_message is not None:
+                output += clipboard_message + "\n"
 
         if quiet_mode:
-            print("")
-
-    if quiet_mode:
-        print_progress_bar(early_exit, idx + 1, total_checks)
-    elif early_exit:
-        print("ⓘ  Exited early due to --fail-fast flag")
-
+            output += "\n"
 
-def print_progress_bar(early_exit: bool, current: int, total: int):
-    end_char = "\n" if current == total or early_exit else "\r"
-    print(progress_bar(current, total, early_exit), end=end_char)
+    if not quiet_mode and early_exit:
+        output += "ⓘ  Exited early due to --fail-fast flag\n"
+    return output
 
 
 def progress_bar(current: int, total: int, early_exit: bool) -> str:
@@ -0,0 +1,36 @@
+import copy
+import functools
+import threading
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+_values: Dict[Hashable, Any] = {}
+_key_locks: Dict[Hashable, threading.Lock] = {}
+_lock = threading.Lock()
+
+
+def clear_run_cache():
+    """Forget everything cached by `run_cached` functions, so that the next run sees any changes the user has made."""
+    with _lock:
+        _values.clear()
+        _key_locks.clear()
+
+
+def run_cached(func: Callable[..., T]) -> Callable[..., T]:
+    """Cache a function's result for the rest of the current run, keyed on its arguments.
+
+    Callers each get their own copy of the result, so can't change what other checks see."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Hashable) -> T:
+        key = (func.__module__, func.__qualname__, args)
+        with _lock:
+            key_lock = _key_locks.setdefault(key, threading.Lock())
+        # Checks running in parallel wait for the first call rather than each making their own
+        with key_lock:
+            if key not in _values:
+                _values[key] = func(*args)
+            return copy.deepcopy(_values[key])
+
+    return wrapper
@@ -0,0 +1,129 @@
+import hashlib
+import os
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from daktari.cache_utils import locked_cache_file, read_cache_file, update_cache_file, write_cache_file
+
+# Read by `daktari status`, which imports nothing else from daktari so that it stays fast enough for shell prompts
+
+STATUS_FILE = "status.json"
+DEFAULT_MAX_AGE_SECONDS = 60 * 60
+# A background refresh that hasn't finished after this long is assumed to have died, so another may be started
+REFRESH_TIMEOUT_SECONDS = 10 * 60
+
+OK = "ok"
+FAILING = "failing"
+STALE = "stale"
+UNKNOWN = "unknown"
+EXIT_CODES = {OK: 0, FAILING: 1, STALE: 2, UNKNOWN: 3}
+
+status_parser = ArgumentParser(prog="daktari status", add_help=False)
+status_parser.add_argument(
+    "--max-age",
+    type=int,
+    default=DEFAULT_MAX_AGE_SECONDS,
+    metavar="SECONDS",
+    help=f"report results older than this as stale (default: {DEFAULT_MAX_AGE_SECONDS})",
+)
+status_parser.add_argument(
+    "--refresh",
+    action="store_true",
+    # Not "refresh", which the main parser's --refresh already sets when this is parsed as its subcommand
+    dest="refresh_stale",
+    help="if the results are stale, start a run in the background to bring them up to date",
+)
+
+
+def hash_config(config_path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(config_path.read_bytes()).hexdigest()[:16]
+    except OSError:
+        return None
+
+
+def write_status(config_path: Path, passed: bool, failed_count: int):
+    """Record the outcome of a run of the config, replacing the file atomically so readers never see it half written."""
+    config_path = config_path.resolve()
+    entry = {
+        "status": OK if passed else FAILING,
+        "failed_count": failed_count,
+        "finished_at": time.time(),
+        "config_path": str(config_path),
+        "config_hash": hash_config(config_path),
+    }
+
+    def add_entry(statuses: Optional[Any]) -> Dict[str, Any]:
+        statuses = statuses if isinstance(statuses, dict) else {}
+        statuses[str(config_path.parent)] = entry
+        return statuses
+
+    update_cache_file(STATUS_FILE, add_entry)
+
+
+def find_status(statuses: Dict[str, Any], directory: Path) -> Optional[Dict[str, Any]]:
+    """The status of the config in the directory or the nearest of its parents that has been run."""
+    for candidate in [directory, *directory.parents]:
+        entry = statuses.get(str(candidate))
+        if isinstance(entry, dict):
+            return entry
+    return None
+
+
+def get_state(entry: Optional[Dict[str, Any]], max_age: float, now: float) -> str:
+    if entry is None:
+        return UNKNOWN
+    if now - entry["finished_at"] > max_age or hash_config(Path(entry["config_path"])) != entry["config_hash"]:
+        return STALE
+    return entry["status"]
+
+
+def format_status(state: str, entry: Optional[Dict[str, Any]]) -> str:
+    if entry is None:
+        return state
+    finished_at = datetime.fromtimestamp(entry["finished_at"]).isoformat(timespec="seconds")
+    failures = f" ({entry['failed_count']} failed)" if entry["status"] == FAILING else ""
+    return f"{state}{failures} {finished_at} {entry['config_hash']}"
+
+
+def start_refresh(entry: Dict[str, Any], now: float):
+    config_path = Path(entry["config_path"])
+    # Checked and marked while holding the lock, so that prompts in several shells don't each start a refresh
+    with locked_cache_file(STATUS_FILE):
+        statuses = read_cache_file(STATUS_FILE)
+        current = statuses.get(str(config_path.parent)) if isinstance(statuses, dict) else None
+        if not isinstance(current, dict) or now - current.get("refresh_started_at", 0) < REFRESH_TIMEOUT_SECONDS:
+            return
+        current["refresh_started_at"] = now
+        write_cache_file(STATUS_FILE, statuses)
+
+    subprocess.Popen(
+        [sys.executable, "-m", "daktari", "--quiet", "--config", str(config_path)],
+        cwd=config_path.parent,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def main(argv: List[str]) -> int:
+    args = ArgumentParser(prog="daktari status", parents=[status_parser]).parse_args(argv)
+    return show_status(args.max_age, args.refresh_stale)
+
+
+def show_status(max_age: int, refresh: bool) -> int:
+    statuses = read_cache_file(STATUS_FILE)
+    statuses = statuses if isinstance(statuses, dict) else {}
+    entry = find_status(statuses, Path(os.getcwd()))
+    now = time.time()
+    state = get_state(entry, max_age, now)
+    if refresh and state == STALE and entry is not None:
+        start_refresh(entry, now)
+    print(format_status(state, entry))
+    return EXIT_CODES[state]
@@ -0,0 +1,128 @@
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Protocol, TextIO
+
+cursor_up_and_clear_line = "\33[1A\33[2K"
+clear_line_prefix = "\33[2K\r"
+
+
+class Timer(Protocol):
+    def cancel(self) -> None: ...
+
+
+def start_timer(delay: float, callback: Callable[[], None]) -> Timer:
+    timer = threading.Timer(delay, callback)
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+class TerminalRenderer:
+    """Batches terminal output into a single buffered write per frame.
+
+    Permanent output (check results) is written on the next frame. The live section below it (checks in flight and
+    the progress bar) is redrawn at most max_redraws_per_second times; a redraw that is skipped is scheduled for the
+    end of the current frame so the screen never stays stale."""
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        max_redraws_per_second: float = 10,
+        show_in_flight: Optional[bool] = None,
+        clock: Callable[[], float] = time.monotonic,
+        timer_factory: Callable[[float, Callable[[], None]], Timer] = start_timer,
+    ):
+        self.stream = stream
+        self.frame_interval = 1 / max_redraws_per_second
+        self.show_in_flight = self.get_stream().isatty() if show_in_flight is None else show_in_flight
+        self.clock = clock
+        self.timer_factory = timer_factory
+        self.lock = threading.RLock()
+        self.pending_output: List[str] = []
+        # Names of the checks in flight, keyed by check id, as several checks may share a name
+        self.in_flight: Dict[str, str] = {}
+        self.progress_line: Optional[str] = None
+        self.live_lines_drawn: List[str] = []
+        self.last_redraw = float("-inf")
+        self.redraw_timer: Optional[Timer] = None
+        self.redraw_scheduled = False
+        self.closed = False
+
+    def get_stream(self) -> TextIO:
+        return self.stream or sys.stdout
+
+    def write(self, text: str):
+        with self.lock:
+            self.pending_output.append(text)
+            self.render(force=True)
+
+    def check_started(self, name: str, check_id: str):
+        with self.lock:
+            self.in_flight[check_id] = name
+            self.render()
+
+    def check_finished(self, check_id: str):
+        with self.lock:
+            self.in_flight.pop(check_id, None)
+
+    def set_progress(self, progress_line: str):
+        with self.lock:
+            self.progress_line = progress_line
+
+    def live_lines(self) -> List[str]:
+        lines = [f"  ⏳ {name}" for name in self.in_flight.values()] if self.show_in_flight else []
+        if self.progress_line is not None:
+            lines.append(self.progress_line)
+        return lines
+
+    def render(self, force: bool = False):
+        with self.lock:
+            if self.closed:
+                return
+
+            now = self.clock()
+            if not force and now - self.last_redraw < self.frame_interval:
+                self.schedule_redraw(self.frame_interval - (now - self.last_redraw))
+                return
+
+            live_lines = self.live_lines()
+            if not self.pending_output and live_lines == self.live_lines_drawn:
+                return
+
+            frame = self.erase_live_lines() + "".join(self.pending_output) + "\n".join(live_lines)
+            self.pending_output = []
+            self.live_lines_drawn = live_lines
+            self.last_redraw = now
+
+            stream = self.get_stream()
+            stream.write(frame)
+            stream.flush()
+
+    def erase_live_lines(self) -> str:
+        if not self.live_lines_drawn:
+            return ""
+        return clear_line_prefix + cursor_up_and_clear_line * (len(self.live_lines_drawn) - 1)
+
+    def schedule_redraw(self, delay: float):
+        if self.redraw_scheduled:
+            return
+        self.redraw_scheduled = True
+        self.redraw_timer = self.timer_factory(delay, self.scheduled_redraw)
+
+    def scheduled_redraw(self):
+        with self.lock:
+            self.redraw_scheduled = False
+            self.render(force=True)
+
+    def close(self):
+        """Draw the final frame and leave the cursor on a fresh line."""
+        with self.lock:
+            if self.redraw_timer is not None:
+                self.redraw_timer.cancel()
+            self.in_flight.clear()
+            self.render(force=True)
+            if self.live_lines_drawn:
+                self.get_stream().write("\n")
+                self.get_stream().flush()
+            self.closed = True
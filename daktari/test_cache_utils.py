@@ -0,0 +1,39 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from daktari.cache_utils import read_cache_file, update_cache_file
+
+
+class TestCacheUtils(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.env_patch = mock.patch.dict(os.environ, {"DAKTARI_CACHE_DIR": self.cache_dir.name})
+        self.env_patch.start()
+
+    def tearDown(self):
+        self.env_patch.stop()
+        self.cache_dir.cleanup()
+
+    def test_concurrent_updates_are_not_lost(self):
+        def increment(contents):
+            return {"count": (contents or {}).get("count", 0) + 1}
+
+        def update_repeatedly():
+            for _ in range(20):
+                update_cache_file("counter.json", increment)
+
+        threads = [threading.Thread(target=update_repeatedly) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual({"count": 80}, read_cache_file("counter.json"))
+        self.assertEqual([".counter.json.lock", "counter.json"], sorted(os.listdir(self.cache_dir.name)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -48,6 +48,15 @@ class TestConfig(unittest.TestCase):
         check = DummyCheck(depends_on=[DummyCheck]).with_dependencies(DummyCheck2)
         self.assertEqual(check.depends_on, [DummyCheck, DummyCheck2])
 
+    def test_with_dependencies_leaves_original_unchanged(self):
+        original = DummyCheck(depends_on=[DummyCheck]).suggest("Do the thing")
+        derived = original.with_dependencies(DummyCheck2)
+        self.assertEqual(original.depends_on, [DummyCheck])
+        self.assertIs(original.suggestions, derived.suggestions)
+
+        derived.suggest("Do something else")
+        self.assertEqual(original.suggestions, {OS.GENERIC: "Do the thing"})
+
     def test_override_suggest(self):
         generic = DummyCheck().suggest("Do the thing")
         self.assertEqual(generic.suggestions, {OS.GENERIC: "Do the thing"})
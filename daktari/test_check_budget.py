@@ -0,0 +1,101 @@
+import os
+import tempfile
+import time
+import unittest
+from dataclasses import replace
+from typing import List
+
+from daktari.check import CheckStatus
+from daktari.check_budget import inputs_changed_since, plan_within_budget
+from daktari.check_history import CheckHistory
+from daktari.test_check_factory import DummyCheck
+
+
+class FileCheck(DummyCheck):
+    def __init__(self, name: str, path: str):
+        super().__init__(name)
+        self.path = path
+
+    def get_input_paths(self) -> List[str]:
+        return [self.path]
+
+
+def history_with(*timings, full_run: float = 0.0) -> CheckHistory:
+    history = CheckHistory({}, {})
+    for check, duration, status in timings:
+        history.record(check, replace(check.check(), status=status, duration=duration))
+    history.mark_full_run(started_at=full_run)
+    return history
+
+
+def names(checks):
+    return [check.name for check in checks]
+
+
+class TestCheckBudget(unittest.TestCase):
+    def test_defers_checks_that_do_not_fit(self):
+        fast, slow = DummyCheck("fast"), DummyCheck("slow")
+        history = history_with((fast, 0.05, CheckStatus.PASS), (slow, 2.0, CheckStatus.PASS))
+        plan = plan_within_budget([fast, slow], 0.3, 4, history)
+        self.assertEqual(["fast"], names(plan.selected))
+        self.assertEqual(["slow"], names(plan.deferred))
+
+    def test_runs_checks_never_timed_as_if_they_take_the_whole_budget(self):
+        checks = [DummyCheck("new.one"), DummyCheck("new.two"), DummyCheck("new.three")]
+        plan = plan_within_budget(checks, 0.3, 2, CheckHistory({}, {}))
+        self.assertEqual(["new.one", "new.two"], names(plan.selected))
+        self.assertEqual(["new.three"], names(plan.deferred))
+
+    def test_checks_never_timed_are_assumed_to_take_a_second(self):
+        fast, new = DummyCheck("fast"), DummyCheck("new")
+        history = history_with((fast, 0.5, CheckStatus.PASS))
+        plan = plan_within_budget([fast, new], 1.2, 1, history)
+        self.assertEqual(["new"], names(plan.selected))
+
+    def test_prioritises_failures_then_cheapest(self):
+        checks = [DummyCheck("passed.cheap"), DummyCheck("passed.dear"), DummyCheck("failed")]
+        history = history_with(
+            (checks[0], 0.1, CheckStatus.PASS),
+            (checks[1], 0.2, CheckStatus.PASS),
+            (checks[2], 0.2, CheckStatus.FAIL),
+        )
+        plan = plan_within_budget(checks, 0.35, 1, history)
+        self.assertEqual(["passed.cheap", "failed"], names(plan.selected))
+
+    def test_prioritises_changed_inputs(self):
+        with tempfile.NamedTemporaryFile() as changed_file:
+            unchanged, changed = DummyCheck("unchanged"), FileCheck("changed", changed_file.name)
+            history = history_with(
+                (unchanged, 0.1, CheckStatus.FAIL), (changed, 0.2, CheckStatus.PASS), full_run=time.time() - 60
+            )
+            plan = plan_within_budget([unchanged, changed], 0.2, 1, history)
+            self.assertEqual(["changed"], names(plan.selected))
+
+    def test_dependencies_that_passed_before_are_assumed_to_pass(self):
+        dependency = DummyCheck("dependency")
+        dependent = DummyCheck("dependent", [dependency])
+        history = history_with((dependency, 1.0, CheckStatus.PASS), (dependent, 0.1, CheckStatus.FAIL))
+        plan = plan_within_budget([dependency, dependent], 0.3, 1, history)
+        self.assertEqual(["dependent"], names(plan.selected))
+        self.assertEqual({"dependency"}, plan.assumed_passed)
+
+    def test_dependents_of_failed_checks_are_deferred(self):
+        dependency = DummyCheck("dependency")
+        dependent = DummyCheck("dependent", [dependency])
+        history = history_with((dependency, 1.0, CheckStatus.FAIL), (dependent, 0.1, CheckStatus.PASS))
+        plan = plan_within_budget([dependency, dependent], 0.3, 1, history)
+        self.assertEqual([], plan.selected)
+        self.assertEqual(["dependency", "dependent"], names(plan.deferred))
+
+    def test_inputs_changed_since(self):
+        with tempfile.NamedTemporaryFile() as input_file:
+            check = FileCheck("check", input_file.name)
+            modified = os.stat(input_file.name).st_mtime
+            self.assertTrue(inputs_changed_since(check, modified - 1))
+            self.assertFalse(inputs_changed_since(check, modified + 1))
+        self.assertTrue(inputs_changed_since(check, modified + 1))
+        self.assertFalse(inputs_changed_since(DummyCheck("no.inputs"), None))
+
+
+if __name__ == "__main__":
+    unittest.main()
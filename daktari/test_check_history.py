@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+from unittest import mock
+
+from daktari.check_history import DURATIONS_KEPT, CheckHistory
+from daktari.test_check_factory import DummyCheck
+
+
+class TestCheckHistory(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.env_patch = mock.patch.dict(os.environ, {"DAKTARI_CACHE_DIR": self.cache_dir.name})
+        self.env_patch.start()
+
+    def tearDown(self):
+        self.env_patch.stop()
+        self.cache_dir.cleanup()
+
+    def test_records_duration_and_status(self):
+        history = CheckHistory.load()
+        check = DummyCheck("check.one", succeed=False)
+        history.track([check])
+        history.record(check, replace(check.check(), duration=0.25))
+        history.save()
+
+        reloaded = CheckHistory.load()
+        self.assertEqual(0.25, reloaded.get_duration(DummyCheck("check.one", succeed=False)))
+        self.assertFalse(reloaded.last_passed(DummyCheck("check.one", succeed=False)))
+
+    def test_cached_results_keep_previous_duration(self):
+        history = CheckHistory({}, {})
+        check = DummyCheck("check.one")
+        history.record(check, replace(check.check(), duration=0.25))
+        history.record(check, replace(check.check(), cached=True))
+        self.assertEqual(0.25, history.get_duration(check))
+        self.assertTrue(history.last_passed(check))
+
+    def test_duration_is_median_of_recent_runs(self):
+        history = CheckHistory({}, {})
+        check = DummyCheck("check.one")
+        for duration in [5.0] + [1.0] * DURATIONS_KEPT + [2.0, 3.0]:
+            history.record(check, replace(check.check(), duration=duration))
+        self.assertEqual(DURATIONS_KEPT, len(history.get_durations(check)))
+        self.assertNotIn(5.0, history.get_durations(check))
+        self.assertEqual(1.0, history.get_duration(check))
+
+    def test_failure_rate_counts_uncached_outcomes(self):
+        history = CheckHistory({}, {})
+        check = DummyCheck("check.one", succeed=False)
+        for _ in range(3):
+            history.record(check, check.check())
+        check.succeed = True
+        history.record(check, check.check())
+        history.record(check, replace(check.check(), cached=True))
+        self.assertEqual((3 + 1) / (4 + 2), history.get_failure_rate(check))
+
+    def test_unknown_check(self):
+        history = CheckHistory({}, {})
+        self.assertIsNone(history.get_duration(DummyCheck("check.one")))
+        self.assertFalse(history.last_passed(DummyCheck("check.one")))
+        self.assertEqual(0.5, history.get_failure_rate(DummyCheck("check.one")))
+
+    def test_full_run_is_per_directory(self):
+        history = CheckHistory({}, {})
+        history.mark_full_run(started_at=100.0)
+        self.assertEqual(100.0, history.get_last_full_run())
+        with mock.patch("os.getcwd", return_value="/some/other/project"):
+            self.assertIsNone(history.get_last_full_run())
+
+    def test_saving_keeps_changes_made_by_other_processes(self):
+        first, second = CheckHistory.load(), CheckHistory.load()
+        check_one, check_two = DummyCheck("check.one"), DummyCheck("check.two")
+        first.track([check_one])
+        first.record(check_one, replace(check_one.check(), duration=0.25))
+        with mock.patch("os.getcwd", return_value="/some/other/project"):
+            second.track([check_two])
+            second.record(check_two, replace(check_two.check(), duration=0.5))
+            second.mark_full_run(started_at=100.0)
+        first.save()
+        second.save()
+
+        reloaded = CheckHistory.load()
+        self.assertEqual(0.25, reloaded.get_duration(DummyCheck("check.one")))
+        with mock.patch("os.getcwd", return_value="/some/other/project"):
+            self.assertEqual(0.5, reloaded.get_duration(DummyCheck("check.two")))
+            self.assertEqual(100.0, reloaded.get_last_full_run())
+
+
+if __name__ == "__main__":
+    unittest.main()
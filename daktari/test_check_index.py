@@ -0,0 +1,56 @@
+import unittest
+
+from daktari.check_index import CheckIndex, compile_name_patterns, select_checks
+from daktari.test_check_factory import DummyCheck
+
+# Dummy checks set up with dependencies as follows (A <- B means "B depends on A")
+#
+#   git.installed <- git.lfs.installed <- git.lfs.filesDownloaded
+#   kubectl.installed <- kubectl.contextExists
+#
+GIT_INSTALLED = DummyCheck("git.installed")
+GIT_LFS_INSTALLED = DummyCheck("git.lfs.installed", [GIT_INSTALLED])
+GIT_LFS_DOWNLOADED = DummyCheck("git.lfs.filesDownloaded", [GIT_LFS_INSTALLED])
+KUBECTL_INSTALLED = DummyCheck("kubectl.installed")
+KUBECTL_CONTEXT = DummyCheck("kubectl.contextExists", [KUBECTL_INSTALLED])
+CHECKS = [GIT_INSTALLED, GIT_LFS_INSTALLED, GIT_LFS_DOWNLOADED, KUBECTL_INSTALLED, KUBECTL_CONTEXT]
+
+
+def names(checks):
+    return [check.name for check in checks]
+
+
+class TestCheckIndex(unittest.TestCase):
+    def test_compile_name_patterns(self):
+        matches = compile_name_patterns(["kubectl.*", "git.lfs.installed"])
+        self.assertTrue(matches("kubectl.contextExists"))
+        self.assertTrue(matches("git.lfs.installed"))
+        self.assertFalse(matches("git.lfs.filesDownloaded"))
+        self.assertFalse(compile_name_patterns([])("anything"))
+
+    def test_only_includes_dependency_closure(self):
+        selected = select_checks(CHECKS, only_patterns=["git.lfs.files*"])
+        self.assertEqual(["git.installed", "git.lfs.installed", "git.lfs.filesDownloaded"], names(selected))
+
+    def test_only_follows_dependencies_set_on_instances(self):
+        dependency = DummyCheck("dependency")
+        # The class-level depends_on is empty, only the configured instance knows its dependency
+        middle = DummyCheck("middle", [dependency])
+        top = DummyCheck("top", [DummyCheck("middle")])
+        selected = select_checks([dependency, middle, top], only_patterns=["top"])
+        self.assertEqual(["dependency", "middle", "top"], names(selected))
+
+    def test_skip_excludes_dependents(self):
+        selected = select_checks(CHECKS, skip_patterns=["git.lfs.installed"])
+        self.assertEqual(["git.installed", "kubectl.installed", "kubectl.contextExists"], names(selected))
+
+    def test_only_and_skip(self):
+        selected = select_checks(CHECKS, only_patterns=["*.installed"], skip_patterns=["kubectl.*"])
+        self.assertEqual(["git.installed", "git.lfs.installed"], names(selected))
+
+    def test_no_filters_selects_everything(self):
+        self.assertEqual(names(CHECKS), names(CheckIndex(CHECKS).select()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from daktari.check import CheckResult, CheckStatus
+from daktari.check_history import CheckHistory
+from daktari.check_plan import build_plan, format_plan
+from daktari.test_check_factory import DummyCheck
+
+
+def make_history(durations):
+    history = CheckHistory({}, {})
+    for check, duration in durations:
+        history.record(check, CheckResult(check.name, CheckStatus.PASS, "", {}, duration=duration))
+    return history
+
+
+class TestCheckPlan(unittest.TestCase):
+    def test_orders_checks_and_finds_critical_path(self):
+        base = DummyCheck("base")
+        quick = DummyCheck("quick", [base])
+        slow = DummyCheck("slow", [base])
+        final = DummyCheck("final", [quick, slow])
+        independent = DummyCheck("independent")
+        history = make_history([(base, 1.0), (quick, 0.5), (slow, 2.0), (final, 1.0), (independent, 3.0)])
+
+        plan = build_plan([final, slow, independent, quick, base], [], history)
+
+        names = [check.name for check in plan.checks]
+        self.assertLess(names.index("base"), names.index("quick"))
+        self.assertLess(names.index("slow"), names.index("final"))
+        self.assertEqual(7.5, plan.total_estimate())
+        self.assertEqual(["base", "slow", "final"], [check.name for check in plan.critical_path])
+        self.assertEqual(4.0, plan.critical_path_estimate())
+
+    def test_lists_skipped_and_untimed_checks(self):
+        skipped = DummyCheck("skipped").skip_if(True)
+        other_os = DummyCheck("other.os")
+        other_os.run_on = "NOT_THIS_OS"
+        ignored = DummyCheck("ignored")
+        untimed = DummyCheck("untimed")
+
+        plan = build_plan([skipped, other_os, untimed], [ignored], CheckHistory({}, {}))
+
+        self.assertEqual(["untimed"], [check.name for check in plan.checks])
+        reasons = {check.name: check.reason for check in plan.skipped}
+        self.assertEqual(
+            {"ignored": "ignored in local config", "skipped": "marked to skip", "other.os": "only runs on NOT_THIS_OS"},
+            reasons,
+        )
+        self.assertIn("1 check(s) have never been timed", format_plan(plan))
+
+
+if __name__ == "__main__":
+    unittest.main()
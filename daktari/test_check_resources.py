@@ -0,0 +1,39 @@
+import unittest
+
+from daktari.check_resources import ResourceLimiter, parse_resource_limit
+from daktari.test_check_factory import DummyCheck
+
+
+class GcloudCheck(DummyCheck):
+    resources = {"gcloud": 1}
+
+
+class TestResourceLimiter(unittest.TestCase):
+    def test_limits_checks_using_resource(self):
+        limiter = ResourceLimiter({"gcloud": 2})
+        limiter.acquire(GcloudCheck())
+        self.assertTrue(limiter.can_acquire(GcloudCheck()))
+        limiter.acquire(GcloudCheck())
+        self.assertFalse(limiter.can_acquire(GcloudCheck()))
+        self.assertTrue(limiter.can_acquire(DummyCheck()))
+        limiter.release(GcloudCheck())
+        self.assertTrue(limiter.can_acquire(GcloudCheck()))
+
+    def test_check_needing_more_than_limit_runs_alone(self):
+        class GreedyCheck(DummyCheck):
+            resources = {"gcloud": 3}
+
+        limiter = ResourceLimiter({"gcloud": 2})
+        self.assertTrue(limiter.can_acquire(GreedyCheck()))
+        limiter.acquire(GcloudCheck())
+        self.assertFalse(limiter.can_acquire(GreedyCheck()))
+
+    def test_parse_resource_limit(self):
+        self.assertEqual(("gcloud", 3), parse_resource_limit("gcloud=3"))
+        for value in ["gcloud", "gcloud=0", "=2", "gcloud=many"]:
+            with self.assertRaises(ValueError):
+                parse_resource_limit(value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,30 +1,42 @@
+import os
+import pty
+import select
+import signal
+import subprocess
+import sys
+import threading
+import time
 import unittest
 from io import StringIO
 from unittest.mock import patch
 
 from colors import red, yellow, green
 
-from daktari.check_runner import run_checks
+from daktari.check_runner import RunOptions, run_checks
+from daktari.command_utils import stream_stdout_lines
+from daktari.network import NetworkProbe
 from daktari.test_check_factory import DummyCheck, ExplodingCheck
 
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 
 class TestCheckRunner(unittest.TestCase):
     def test_status_all_passing(self):
         checks = [DummyCheck("check.one", succeed=True), DummyCheck("check.two", succeed=True)]
-        result = run_checks(checks, quiet_mode=True, fail_fast=False)
+        result = run_checks(checks, RunOptions(quiet_mode=True))
         self.assertTrue(result)
 
     def test_runs_all_and_returns_failure_if_check_fails(self):
         final_check = DummyCheck("check.three", succeed=True)
         checks = [DummyCheck("check.one", succeed=True), DummyCheck("check.two", succeed=False), final_check]
-        result = run_checks(checks, quiet_mode=True, fail_fast=False)
+        result = run_checks(checks, RunOptions(quiet_mode=True))
         self.assertFalse(result)
         self.assertTrue(final_check.was_run)
 
     def test_aborts_and_returns_failure_if_check_fails_and_fail_fast(self):
         final_check = DummyCheck("check.three", succeed=True)
         checks = [DummyCheck("check.one", succeed=True), DummyCheck("check.two", succeed=False), final_check]
-        result = run_checks(checks, quiet_mode=True, fail_fast=True)
+        result = run_checks(checks, RunOptions(quiet_mode=True, fail_fast=True))
         self.assertFalse(result)
         self.assertFalse(final_check.was_run)
 
@@ -32,7 +44,7 @@ class TestCheckRunner(unittest.TestCase):
         with patch("sys.stdout", new=StringIO()) as fake_out:
             final_check = DummyCheck("check.three", succeed=True)
             checks = [ExplodingCheck(), final_check]
-            result = run_checks(checks, quiet_mode=True, fail_fast=False)
+            result = run_checks(checks, RunOptions(quiet_mode=True))
             self.assertFalse(result)
             self.assertTrue(final_check.was_run)
             self.assertIn(f"💥 [{red('exploding.check')}] Check failed with unhandled Exception", fake_out.getvalue())
@@ -41,7 +53,7 @@ class TestCheckRunner(unittest.TestCase):
         with patch("sys.stdout", new=StringIO()) as fake_out:
             final_check = DummyCheck("dependent.check", depends_on=[ExplodingCheck], succeed=True)
             checks = [ExplodingCheck(), final_check]
-            result = run_checks(checks, quiet_mode=True, fail_fast=False)
+            result = run_checks(checks, RunOptions(quiet_mode=True))
             self.assertFalse(result)
             self.assertFalse(final_check.was_run)
             self.assertIn(f"⚠️  [{yellow('dependent.check')}] skipped due to previous failures", fake_out.getvalue())
@@ -51,7 +63,7 @@ class TestCheckRunner(unittest.TestCase):
             missing_check = DummyCheck("check.one")
             final_check = DummyCheck("dependent.check", depends_on=[missing_check])
             checks = [final_check]
-            result = run_checks(checks, quiet_mode=True, fail_fast=False)
+            result = run_checks(checks, RunOptions(quiet_mode=True))
             self.assertTrue(result)
             self.assertFalse(final_check.was_run)
             self.assertIn(
@@ -62,20 +74,232 @@ class TestCheckRunner(unittest.TestCase):
     def test_outputs_success(self):
         with patch("sys.stdout", new=StringIO()) as fake_out:
             checks = [DummyCheck("check.one", succeed=True)]
-            result = run_checks(checks, quiet_mode=False, fail_fast=False)
+            result = run_checks(checks)
             self.assertTrue(result)
             self.assertIn(f"✅ [{green('check.one')}] dummy check", fake_out.getvalue())
 
     def test_suppresses_success_in_quiet_mode(self):
         with patch("sys.stdout", new=StringIO()) as fake_out:
             checks = [DummyCheck("check.one", succeed=True)]
-            result = run_checks(checks, quiet_mode=True, fail_fast=False)
+            result = run_checks(checks, RunOptions(quiet_mode=True))
             self.assertTrue(result)
             self.assertNotIn("✅", fake_out.getvalue())
 
     def test_outputs_failure_in_quiet_mode(self):
         with patch("sys.stdout", new=StringIO()) as fake_out:
             checks = [DummyCheck("check.one", succeed=False)]
-            result = run_checks(checks, quiet_mode=True, fail_fast=False)
+            result = run_checks(checks, RunOptions(quiet_mode=True))
             self.assertFalse(result)
             self.assertIn(f"❌ [{red('check.one')}] dummy check", fake_out.getvalue())
+
+    def test_parallel_runs_dependencies_first(self):
+        finished = []
+
+        class RecordingCheck(DummyCheck):
+            def check(self):
+                result = super().check()
+                finished.append(self.name)
+                return result
+
+        dependency = RecordingCheck("check.one")
+        dependent = RecordingCheck("check.two", depends_on=[dependency])
+        checks = [dependent, RecordingCheck("check.three"), dependency]
+        result = run_checks(checks, RunOptions(quiet_mode=True, jobs=4))
+        self.assertTrue(result)
+        self.assertLess(finished.index("check.one"), finished.index("check.two"))
+
+    def test_parallel_skips_dependents_on_failure(self):
+        with patch("sys.stdout", new=StringIO()) as fake_out:
+            final_check = DummyCheck("dependent.check", depends_on=[ExplodingCheck], succeed=True)
+            result = run_checks([final_check, ExplodingCheck()], RunOptions(quiet_mode=True, jobs=4))
+            self.assertFalse(result)
+            self.assertFalse(final_check.was_run)
+            self.assertIn(f"⚠️  [{yellow('dependent.check')}] skipped due to previous failures", fake_out.getvalue())
+
+    def test_assumed_passed_dependencies_and_deferred_checks(self):
+        with patch("sys.stdout", new=StringIO()) as fake_out:
+            deferred_check = DummyCheck("check.one")
+            final_check = DummyCheck("dependent.check", depends_on=[deferred_check])
+            result = run_checks(
+                [final_check], RunOptions(quiet_mode=True, assumed_passed={"check.one"}, deferred=[deferred_check])
+            )
+            self.assertTrue(result)
+            self.assertTrue(final_check.was_run)
+            self.assertIn("1 check(s) deferred to stay within the time budget: check.one", fake_out.getvalue())
+
+    def test_speculative_runs_side_effect_free_checks_alongside_dependencies(self):
+        dependency_may_finish = threading.Event()
+
+        class BlockingCheck(DummyCheck):
+            def check(self):
+                # Only passes if the dependent check ran while this one was still running
+                self.succeed = dependency_may_finish.wait(timeout=5)
+                return super().check()
+
+        class SideEffectFreeCheck(DummyCheck):
+            side_effect_free = True
+
+            def check(self):
+                dependency_may_finish.set()
+                return super().check()
+
+        dependency = BlockingCheck("check.one")
+        dependent = SideEffectFreeCheck("check.two", depends_on=[dependency])
+        with patch("sys.stdout", new=StringIO()) as fake_out:
+            result = run_checks([dependency, dependent], RunOptions(jobs=2, speculative=True))
+            self.assertTrue(result)
+            self.assertIn(f"✅ [{green('check.two')}] dummy check", fake_out.getvalue())
+
+    def test_speculative_results_discarded_when_dependency_fails(self):
+        class SideEffectFreeCheck(DummyCheck):
+            side_effect_free = True
+
+        dependent = SideEffectFreeCheck("dependent.check", depends_on=[ExplodingCheck], succeed=False)
+        with patch("sys.stdout", new=StringIO()) as fake_out:
+            result = run_checks([ExplodingCheck(), dependent], RunOptions(quiet_mode=True, jobs=2, speculative=True))
+            self.assertFalse(result)
+            self.assertIn(f"⚠️  [{yellow('dependent.check')}] skipped due to previous failures", fake_out.getvalue())
+            self.assertNotIn(f"❌ [{red('dependent.check')}]", fake_out.getvalue())
+
+    def test_parallel_fail_fast_kills_checks_in_flight(self):
+        slow_command_started = threading.Event()
+
+        class SlowCheck(DummyCheck):
+            def check(self):
+                lines = stream_stdout_lines(
+                    [sys.executable, "-c", "import time; print('started', flush=True); time.sleep(30)"]
+                )
+                next(lines)
+                slow_command_started.set()
+                list(lines)
+                return super().check()
+
+        class FailingCheck(DummyCheck):
+            def check(self):
+                slow_command_started.wait(timeout=5)
+                return super().check()
+
+        slow_check = SlowCheck("check.slow")
+        with patch("sys.stdout", new=StringIO()) as fake_out:
+            start_time = time.monotonic()
+            result = run_checks(
+                [slow_check, FailingCheck("check.failing", succeed=False)],
+                RunOptions(quiet_mode=True, fail_fast=True, jobs=2),
+            )
+            self.assertLess(time.monotonic() - start_time, 2)
+            self.assertFalse(result)
+            self.assertIn(f"❌ [{red('check.failing')}] dummy check", fake_out.getvalue())
+            self.assertNotIn("check.slow", fake_out.getvalue())
+            self.assertFalse(slow_check.was_run)
+
+    def test_skips_network_checks_when_offline(self):
+        class NetworkCheck(DummyCheck):
+            requires_network = True
+
+        network_check = NetworkCheck("check.network")
+        local_check = DummyCheck("check.local")
+        probe = NetworkProbe(("127.0.0.1", 1))
+        with patch("sys.stdout", new=StringIO()) as fake_out, patch.object(probe, "probe", return_value=False):
+            result = run_checks([network_check, local_check], RunOptions(quiet_mode=True, network_probe=probe))
+            self.assertFalse(result)
+            self.assertFalse(network_check.was_run)
+            self.assertTrue(local_check.was_run)
+            self.assertIn(f"❌ [{red('check.network')}] skipped as the network is unreachable", fake_out.getvalue())
+
+    def test_runs_network_checks_without_a_probe(self):
+        class NetworkCheck(DummyCheck):
+            requires_network = True
+
+        network_check = NetworkCheck("check.network")
+        with patch("sys.stdout", new=StringIO()):
+            self.assertTrue(run_checks([network_check], RunOptions(quiet_mode=True)))
+        self.assertTrue(network_check.was_run)
+
+    def test_parallel_limits_checks_sharing_a_resource(self):
+        lock = threading.Lock()
+        running = []
+        most_running = []
+
+        class GcloudCheck(DummyCheck):
+            resources = {"gcloud": 1}
+
+            def check(self):
+                with lock:
+                    running.append(self.name)
+                    most_running.append(len(running))
+                time.sleep(0.05)
+                with lock:
+                    running.remove(self.name)
+                return super().check()
+
+        checks = [GcloudCheck(f"check.{i}") for i in range(4)]
+        result = run_checks(checks, RunOptions(quiet_mode=True, jobs=4, resource_limits={"gcloud": 2}))
+        self.assertTrue(result)
+        self.assertEqual(2, max(most_running))
+
+    def test_fail_fast_exits_without_waiting_for_checks_in_flight(self):
+        script = """
+import sys, threading, time
+from daktari.check_runner import RunOptions, run_checks
+from daktari.test_check_factory import DummyCheck
+
+started = threading.Event()
+
+class SlowCheck(DummyCheck):
+    def check(self):
+        started.set()
+        time.sleep(10)
+        return super().check()
+
+class FailingCheck(DummyCheck):
+    def check(self):
+        started.wait(5)
+        return super().check()
+
+sys.exit(0 if run_checks([SlowCheck("slow"), FailingCheck("failing", succeed=False)], RunOptions(True, True, 2)) else 1)
+"""
+        start_time = time.monotonic()
+        process = subprocess.run([sys.executable, "-c", script], cwd=ROOT_DIR, capture_output=True, timeout=30)
+        self.assertLess(time.monotonic() - start_time, 5)
+        self.assertEqual(1, process.returncode, process.stderr)
+
+    def test_fail_fast_commands_can_prompt_on_the_terminal(self):
+        # A command that reads from the terminal, as ssh and gpg prompts do, in a sequential fail-fast run started
+        # from a terminal. It would be stopped by SIGTTIN if it were put in a background process group.
+        script = """
+import sys
+from daktari.check import Check
+from daktari.check_runner import RunOptions, run_checks
+from daktari.command_utils import get_stdout
+
+class PromptingCheck(Check):
+    name = "prompting.check"
+
+    def check(self):
+        answer = get_stdout([sys.executable, "-c", "print('answer: ' + open('/dev/tty').readline().strip())"])
+        return self.passed(str(answer).strip())
+
+run_checks([PromptingCheck()], RunOptions(fail_fast=True))
+"""
+        pid, terminal = pty.fork()
+        if pid == 0:
+            os.chdir(ROOT_DIR)
+            os.execv(sys.executable, [sys.executable, "-c", script])
+        try:
+            os.write(terminal, b"hello\n")
+            output = b""
+            deadline = time.monotonic() + 10
+            while b"answer: hello" not in output and time.monotonic() < deadline:
+                if select.select([terminal], [], [], 0.1)[0]:
+                    try:
+                        output += os.read(terminal, 1024)
+                    except OSError:
+                        break
+            self.assertIn(b"answer: hello", output)
+        finally:
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except OSError:
+                pass
+            os.waitpid(pid, 0)
+            os.close(terminal)
@@ -0,0 +1,49 @@
+import unittest
+
+from daktari.check import CheckResult, CheckStatus
+from daktari.check_history import CheckHistory
+from daktari.check_shards import parse_shard, partition_checks
+from daktari.test_check_factory import DummyCheck
+
+
+def make_history(durations):
+    history = CheckHistory({}, {})
+    for check, duration in durations:
+        history.record(check, CheckResult(check.name, CheckStatus.PASS, "", {}, duration=duration))
+    return history
+
+
+def names(checks):
+    return {check.name for check in checks}
+
+
+class TestCheckShards(unittest.TestCase):
+    def test_shards_include_dependencies_and_balance_durations(self):
+        git = DummyCheck("git.installed")
+        slow = DummyCheck("slow", [git])
+        medium = DummyCheck("medium", [git])
+        quick_1 = DummyCheck("quick.1")
+        quick_2 = DummyCheck("quick.2")
+        checks = [git, slow, medium, quick_1, quick_2]
+        history = make_history([(git, 0.1), (slow, 4.0), (medium, 2.0), (quick_1, 1.0), (quick_2, 1.0)])
+
+        shards = partition_checks(checks, 2, history)
+
+        self.assertEqual({"git.installed", "slow"}, names(shards[0]))
+        self.assertEqual({"git.installed", "medium", "quick.1", "quick.2"}, names(shards[1]))
+
+    def test_every_check_is_in_a_shard(self):
+        checks = [DummyCheck(f"check.{i}") for i in range(7)]
+        shards = partition_checks(checks, 3, CheckHistory({}, {}))
+        self.assertEqual(names(checks), set.union(*(names(shard) for shard in shards)))
+        self.assertEqual([3, 2, 2], [len(shard) for shard in shards])
+
+    def test_parse_shard(self):
+        self.assertEqual((2, 4), parse_shard("2/4"))
+        for value in ["0/4", "5/4", "2", "a/b"]:
+            with self.assertRaises(ValueError):
+                parse_shard(value)
+
+
+if __name__ == "__main__":
+    unittest.main()
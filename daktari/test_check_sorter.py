@@ -1,6 +1,8 @@
 import unittest
 
-from daktari.check_sorter import sort_checks
+from daktari.check import CheckResult, CheckStatus
+from daktari.check_history import CheckHistory
+from daktari.check_sorter import sort_checks, sort_checks_fail_likely_first
 from daktari.check_utils import CyclicCheckException
 from daktari.test_check_factory import DummyCheck
 
@@ -59,6 +61,26 @@ class TestCheckSorter(unittest.TestCase):
         self.assertGreater(sorted_checks.index("sub.check.a.b"), sorted_checks.index("parent.a"))
         self.assertGreater(sorted_checks.index("sub.check.a.b"), sorted_checks.index("parent.b"))
 
+    def test_fail_likely_first_respects_dependencies(self):
+        history = CheckHistory({}, {})
+        slow_check = DummyCheck("slow.check")
+        reliable_check = DummyCheck("reliable.check")
+        flaky_dependency = DummyCheck("flaky.dependency")
+        flaky_check = DummyCheck("flaky.check", [flaky_dependency])
+        checks = [slow_check, reliable_check, flaky_dependency, flaky_check]
+
+        def record(check, status, duration, times):
+            for _ in range(times):
+                history.record(check, CheckResult(check.name, status, "", {}, duration=duration))
+
+        record(slow_check, CheckStatus.FAIL, 30.0, 5)
+        record(reliable_check, CheckStatus.PASS, 0.1, 5)
+        record(flaky_dependency, CheckStatus.PASS, 0.1, 1)
+        record(flaky_check, CheckStatus.FAIL, 0.1, 5)
+
+        sorted_checks = [check.name for check in sort_checks_fail_likely_first(checks, history)]
+        self.assertEqual(["flaky.dependency", "flaky.check", "reliable.check", "slow.check"], sorted_checks)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,14 @@
 import unittest
+from unittest import mock
 
-from daktari.check_utils import get_all_dependent_check_names, CyclicCheckException
+from daktari.check import CheckStatus
+from daktari.check_utils import (
+    get_all_dependent_check_names,
+    get_check_fingerprint,
+    get_check_id,
+    CyclicCheckException,
+)
+from daktari.checks.kubernetes import HelmInstalled
 from daktari.test_check_factory import DummyCheck
 
 
@@ -63,6 +71,61 @@ class TestCheckUtils(unittest.TestCase):
         with self.assertRaises(CyclicCheckException):
             get_all_dependent_check_names(check_a)
 
+    def test_fingerprint_includes_project_unless_machine_wide(self):
+        class MachineWideCheck(DummyCheck):
+            machine_wide = True
+
+        with mock.patch("os.getcwd", return_value="/project/one"):
+            project_check = get_check_fingerprint(DummyCheck("A"))
+            machine_wide_check = get_check_fingerprint(MachineWideCheck("A"))
+        with mock.patch("os.getcwd", return_value="/project/two"):
+            self.assertNotEqual(project_check, get_check_fingerprint(DummyCheck("A")))
+            self.assertEqual(machine_wide_check, get_check_fingerprint(MachineWideCheck("A")))
+
+    def test_fingerprint_includes_project_for_version_requirements(self):
+        with mock.patch("os.getcwd", return_value="/project/one"):
+            unversioned = get_check_fingerprint(HelmInstalled())
+            versioned = get_check_fingerprint(HelmInstalled(required_version=">=3.0.0"))
+        with mock.patch("os.getcwd", return_value="/project/two"):
+            self.assertEqual(unversioned, get_check_fingerprint(HelmInstalled()))
+            self.assertNotEqual(versioned, get_check_fingerprint(HelmInstalled(required_version=">=3.0.0")))
+
+    def test_fingerprint_depends_only_on_attribute_values(self):
+        class ConfiguredCheck(DummyCheck):
+            def __init__(self, name: str, value):
+                super().__init__(name)
+                self.value = value
+
+        with mock.patch("os.getcwd", return_value="/project"):
+            first = get_check_fingerprint(ConfiguredCheck("A", {"paths": ("a", "b"), "status": CheckStatus.FAIL}))
+            second = get_check_fingerprint(ConfiguredCheck("A", {"paths": ["a", "b"], "status": CheckStatus.FAIL}))
+            self.assertIsNotNone(first)
+            self.assertEqual(first, second)
+            self.assertNotEqual(first, get_check_fingerprint(ConfiguredCheck("A", {"paths": ["a"]})))
+
+    def test_no_fingerprint_for_attributes_without_stable_identity(self):
+        class CallbackCheck(DummyCheck):
+            def __init__(self, name: str):
+                super().__init__(name)
+                self.callback = lambda: True
+
+        self.assertIsNone(get_check_fingerprint(CallbackCheck("A")))
+        self.assertIsNotNone(get_check_fingerprint(DummyCheck("A")))
+
+    def test_id_tells_apart_checks_sharing_a_name_in_any_project(self):
+        class CallbackCheck(DummyCheck):
+            def __init__(self, name: str):
+                super().__init__(name)
+                self.callback = lambda: True
+
+        with mock.patch("os.getcwd", return_value="/project/one"):
+            passing = get_check_id(DummyCheck("A"))
+            callback = get_check_id(CallbackCheck("A"))
+        with mock.patch("os.getcwd", return_value="/project/two"):
+            self.assertEqual(passing, get_check_id(DummyCheck("A")))
+            self.assertEqual(callback, get_check_id(CallbackCheck("A")))
+        self.assertNotEqual(passing, get_check_id(DummyCheck("A", succeed=False)))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,107 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+from daktari.command_utils import (
+    CancellationToken,
+    CommandCancelledException,
+    CommandErrorException,
+    CommandNotFoundException,
+    run_command,
+    stream_stdout_lines,
+    use_cancellation_token,
+)
+
+
+class TestStreamStdoutLines(unittest.TestCase):
+    def test_yields_lines(self):
+        lines = stream_stdout_lines([sys.executable, "-c", "print('one'); print('two')"])
+        self.assertEqual(["one", "two"], list(lines))
+
+    def test_stops_early(self):
+        lines = stream_stdout_lines([sys.executable, "-c", "import itertools\nfor i in itertools.count(): print(i)"])
+        self.assertEqual("0", next(lines))
+        self.assertEqual("1", next(lines))
+        lines.close()
+
+    def test_raises_on_non_zero_exit(self):
+        lines = stream_stdout_lines([sys.executable, "-c", "import sys; sys.stderr.write('bad'); sys.exit(3)"])
+        with self.assertRaises(CommandErrorException) as context:
+            list(lines)
+        self.assertEqual(3, context.exception.return_code)
+        self.assertEqual("bad", context.exception.stderr)
+
+    def test_raises_when_command_not_found(self):
+        with self.assertRaises(CommandNotFoundException):
+            list(stream_stdout_lines("no-such-command-for-daktari"))
+
+
+class TestCancellationToken(unittest.TestCase):
+    def test_commands_only_get_their_own_session_when_isolated(self):
+        command = [sys.executable, "-c", "import os; print(os.getpgrp(), os.getsid(0))"]
+        daktari_groups = f"{os.getpgrp()} {os.getsid(0)}"
+        self.assertEqual(daktari_groups, run_command(command).stdout.strip())
+        with use_cancellation_token(CancellationToken(isolate_processes=False)):
+            self.assertEqual(daktari_groups, run_command(command).stdout.strip())
+
+        with use_cancellation_token(CancellationToken()):
+            process_group, session = run_command(command).stdout.split()
+        self.assertNotEqual(os.getpgrp(), int(process_group))
+        self.assertEqual(process_group, session)
+
+    def test_cancel_kills_command_and_its_children(self):
+        errors = []
+        # The child outlives its parent unless the whole process group is killed
+        command = [sys.executable, "-c", "import subprocess; subprocess.run(['sleep', '30'])"]
+
+        def run():
+            try:
+                run_command(command)
+            except Exception as err:
+                errors.append(err)
+
+        token = CancellationToken()
+        with use_cancellation_token(token):
+            thread = threading.Thread(target=run)
+            thread.start()
+            while not token.processes:
+                time.sleep(0.01)
+            start_time = time.monotonic()
+            token.cancel()
+            thread.join(timeout=5)
+        self.assertLess(time.monotonic() - start_time, 2)
+        self.assertEqual(1, len(errors))
+        self.assertIsInstance(errors[0], CommandCancelledException)
+
+    def test_cancel_kills_command_when_not_isolated(self):
+        errors = []
+
+        def run():
+            try:
+                run_command([sys.executable, "-c", "import time; time.sleep(30)"])
+            except Exception as err:
+                errors.append(err)
+
+        token = CancellationToken(isolate_processes=False)
+        with use_cancellation_token(token):
+            thread = threading.Thread(target=run)
+            thread.start()
+            while not token.processes:
+                time.sleep(0.01)
+            token.cancel()
+            thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertIsInstance(errors[0], CommandCancelledException)
+
+    def test_refuses_to_start_commands_once_cancelled(self):
+        token = CancellationToken()
+        token.cancel()
+        with use_cancellation_token(token):
+            with self.assertRaises(CommandCancelledException):
+                run_command([sys.executable, "-c", "pass"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import threading
+import unittest
+
+from daktari.concurrency import AUTO_JOBS, AdaptiveConcurrency, DaemonThreadPool, parse_jobs
+
+
+class FakeMachine:
+    def __init__(self):
+        self.time = 0.0
+        self.load = 0.0
+        self.cpu = 0.0
+
+
+def make_concurrency(machine: FakeMachine, max_jobs: int = 8) -> AdaptiveConcurrency:
+    return AdaptiveConcurrency(
+        max_jobs,
+        initial_jobs=2,
+        cpu_count=4,
+        # Just under the simulated second, so rounding in the fake clock never delays an adjustment
+        interval=0.99,
+        clock=lambda: machine.time,
+        load_sampler=lambda: machine.load,
+        cpu_sampler=lambda: machine.cpu,
+    )
+
+
+def finish_checks(concurrency: AdaptiveConcurrency, machine: FakeMachine, count: int, cpu_per_check: float = 0.0):
+    for _ in range(count):
+        machine.time += 1.0 / count
+        machine.cpu += cpu_per_check
+        concurrency.check_finished()
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    def test_grows_while_throughput_rises(self):
+        machine = FakeMachine()
+        concurrency = make_concurrency(machine)
+        for count in [2, 3, 4, 5]:
+            finish_checks(concurrency, machine, count)
+        self.assertEqual(6, concurrency.limit())
+
+    def test_never_exceeds_max_jobs(self):
+        machine = FakeMachine()
+        concurrency = make_concurrency(machine, max_jobs=3)
+        for count in [2, 3, 4, 5]:
+            finish_checks(concurrency, machine, count)
+        self.assertEqual(3, concurrency.limit())
+
+    def test_backs_off_when_throughput_falls(self):
+        machine = FakeMachine()
+        concurrency = make_concurrency(machine)
+        finish_checks(concurrency, machine, 4)
+        self.assertEqual(3, concurrency.limit())
+        finish_checks(concurrency, machine, 2)
+        self.assertEqual(2, concurrency.limit())
+
+    def test_backs_off_when_overloaded(self):
+        machine = FakeMachine()
+        concurrency = make_concurrency(machine)
+        machine.load = 10.0
+        finish_checks(concurrency, machine, 4)
+        self.assertEqual(1, concurrency.limit())
+
+    def test_stops_growing_when_cpus_busy(self):
+        machine = FakeMachine()
+        concurrency = make_concurrency(machine)
+        # Each check keeps a CPU busy for the whole second
+        finish_checks(concurrency, machine, 4, cpu_per_check=1.0)
+        finish_checks(concurrency, machine, 4, cpu_per_check=1.0)
+        self.assertEqual(2, concurrency.limit())
+
+    def test_parse_jobs(self):
+        self.assertEqual(3, parse_jobs("3"))
+        self.assertEqual(AUTO_JOBS, parse_jobs("auto"))
+        with self.assertRaises(ValueError):
+            parse_jobs("lots")
+
+
+class TestDaemonThreadPool(unittest.TestCase):
+    def test_runs_functions_on_at_most_max_workers(self):
+        pool = DaemonThreadPool(2, thread_name_prefix="test")
+        futures = [pool.submit(lambda value: value * 2, value) for value in range(10)]
+        self.assertEqual([value * 2 for value in range(10)], [future.result(timeout=5) for future in futures])
+        self.assertLessEqual(len(pool.workers), 2)
+        self.assertTrue(all(worker.daemon for worker in pool.workers))
+        pool.shutdown()
+
+    def test_shutdown_cancels_functions_not_yet_started(self):
+        pool = DaemonThreadPool(1, thread_name_prefix="test")
+        started, release = threading.Event(), threading.Event()
+
+        def block() -> bool:
+            started.set()
+            return release.wait(5)
+
+        running = pool.submit(block)
+        waiting = pool.submit(lambda: None)
+        started.wait(5)
+        pool.shutdown()
+        self.assertTrue(waiting.cancelled())
+        release.set()
+        self.assertTrue(running.result(timeout=5))
+
+    def test_reports_exceptions(self):
+        pool = DaemonThreadPool(1, thread_name_prefix="test")
+        future = pool.submit(int, "not a number")
+        self.assertIsInstance(future.exception(timeout=5), ValueError)
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -166,6 +166,22 @@ class TestConfig(unittest.TestCase):
         self.assertEqual([EnvVarSet(variable_name="SOME_ENV_VAR")], updated_config.checks)
         self.assertEqual([IntelliJIdeaInstalled(), IntelliJProjectImported()], updated_config.ignored_checks)
 
+    def test_local_config_ignored_check_glob(self):
+        self.write_to_local_config("ignoredChecks: ['intellij.*']")
+
+        config = Config(None, None, TEST_CHECKS)
+        updated_config = apply_local_config(config)
+        self.assertEqual([EnvVarSet(variable_name="SOME_ENV_VAR")], updated_config.checks)
+        self.assertEqual([IntelliJIdeaInstalled(), IntelliJProjectImported()], updated_config.ignored_checks)
+
+    def test_local_config_ignored_dependency_not_in_config(self):
+        self.write_to_local_config("ignoredChecks: ['intellij.installed']")
+
+        config = Config(None, None, [IntelliJProjectImported()])
+        updated_config = apply_local_config(config)
+        self.assertEqual([], updated_config.checks)
+        self.assertEqual([IntelliJProjectImported()], updated_config.ignored_checks)
+
     def write_to_local_config(self, contents: str):
         with open(LOCAL_CONFIG_PATH, "a") as local_config_file:
             local_config_file.write(contents)
@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from daktari.check import CheckStatus
+from daktari.check_runner import CheckRunner, RunOptions
+from daktari.discovery import SharedResultCache, combine_grouped_output, find_config_paths, get_grouped_formatter
+from daktari.test_check_factory import DummyCheck
+
+
+class MachineWideCheck(DummyCheck):
+    machine_wide = True
+
+
+class TestDiscovery(unittest.TestCase):
+    def test_find_config_paths(self):
+        with tempfile.TemporaryDirectory() as root:
+            for directory in ["", "service-a", "service-b/nested", "node_modules/package", ".hidden"]:
+                os.makedirs(os.path.join(root, directory), exist_ok=True)
+                Path(root, directory, ".daktari.py").touch()
+
+            config_paths = [str(path.relative_to(root)) for path in find_config_paths(Path(root))]
+            self.assertEqual(
+                [".daktari.py", "service-a/.daktari.py", "service-b/nested/.daktari.py"],
+                config_paths,
+            )
+
+    def test_shares_machine_wide_results(self):
+        cache = SharedResultCache({})
+        CheckRunner([MachineWideCheck("git.installed")], RunOptions(quiet_mode=True, result_cache=cache)).run()
+
+        check = MachineWideCheck("git.installed")
+        result = cache.get(check)
+        self.assertEqual(CheckStatus.PASS, result.status)
+        self.assertTrue(result.cached)
+
+    def test_does_not_share_project_results(self):
+        cache = SharedResultCache({})
+        CheckRunner([DummyCheck("file.exists")], RunOptions(quiet_mode=True, result_cache=cache)).run()
+        self.assertIsNone(cache.get(DummyCheck("file.exists")))
+
+    def test_combines_json_per_config(self):
+        outputs = []
+        for config_name, succeed in [("a/.daktari.py", True), ("b/.daktari.py", False)]:
+            formatter = get_grouped_formatter("json", False, config_name)
+            CheckRunner([DummyCheck("check.one", succeed=succeed)], RunOptions(), formatter).run()
+            outputs.append((config_name, formatter))
+
+        document = json.loads(combine_grouped_output("json", outputs, all_passed=False))
+        self.assertFalse(document["all_passed"])
+        self.assertEqual(["a/.daktari.py", "b/.daktari.py"], [config["config"] for config in document["configs"]])
+        self.assertEqual([True, False], [config["all_passed"] for config in document["configs"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from daktari.git_attributes import get_filter_for_path, parse_git_attributes_filters, pattern_to_regex
+
+
+class TestGitAttributes(unittest.TestCase):
+    def test_pattern_without_slash_matches_at_any_depth(self):
+        regex = pattern_to_regex("*.key")
+        self.assertTrue(regex.match("secret.key"))
+        self.assertTrue(regex.match("config/prod/secret.key"))
+        self.assertFalse(regex.match("secret.key.txt"))
+
+    def test_pattern_with_slash_is_anchored(self):
+        regex = pattern_to_regex("secrets/*")
+        self.assertTrue(regex.match("secrets/db.env"))
+        self.assertFalse(regex.match("secrets/nested/db.env"))
+        self.assertFalse(regex.match("other/secrets/db.env"))
+
+    def test_double_star(self):
+        regex = pattern_to_regex("secrets/**")
+        self.assertTrue(regex.match("secrets/nested/db.env"))
+        self.assertTrue(pattern_to_regex("**/creds.json").match("a/b/creds.json"))
+        self.assertTrue(pattern_to_regex("**/creds.json").match("creds.json"))
+
+    def test_character_class(self):
+        self.assertTrue(pattern_to_regex("file[0-9].txt").match("file1.txt"))
+        self.assertFalse(pattern_to_regex("file[!0-9].txt").match("file1.txt"))
+
+    def test_parse_filters(self):
+        content = """
+# Encrypted files
+secrets/** filter=git-crypt diff=git-crypt
+*.md text
+secrets/README.md !filter !diff
+"""
+        rules = parse_git_attributes_filters(content)
+        self.assertEqual(2, len(rules))
+        self.assertEqual("git-crypt", get_filter_for_path("secrets/db.env", rules))
+        self.assertIsNone(get_filter_for_path("secrets/README.md", rules))
+        self.assertIsNone(get_filter_for_path("README.md", rules))
+
+    def test_nested_attributes_are_relative(self):
+        rules = parse_git_attributes_filters("*.env filter=git-crypt", "service")
+        self.assertEqual("git-crypt", get_filter_for_path("service/config/prod.env", rules))
+        self.assertIsNone(get_filter_for_path("other/prod.env", rules))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from unittest import mock
+
+from daktari.git_config import GitConfigSnapshot, get_git_config, parse_git_config_list
+from daktari.run_cache import clear_run_cache
+
+CONFIG_LIST_OUTPUT = (
+    "file:/home/user/.gitconfig\0user.name\nA User\0"
+    "file:/home/user/.gitconfig\0user.signingkey\nABCD1234\0"
+    "file:/home/user/.gitconfig\0commit.gpgsign\nfalse\0"
+    "file:.git/config\0commit.gpgsign\0"
+    "file:.git/config\0remote.Origin.url\ngit@github.com:org/repo.git\0"
+)
+
+
+class TestGitConfig(unittest.TestCase):
+    def setUp(self):
+        self.snapshot = GitConfigSnapshot(parse_git_config_list(CONFIG_LIST_OUTPUT))
+
+    def test_get_value(self):
+        self.assertEqual("ABCD1234", self.snapshot.get("user.signingkey"))
+        self.assertEqual("ABCD1234", self.snapshot.get("user.signingKey"))
+        self.assertIsNone(self.snapshot.get("gpg.format"))
+
+    def test_last_value_wins(self):
+        self.assertEqual("true", self.snapshot.get("commit.gpgsign"))
+        self.assertEqual(["false", "true"], self.snapshot.get_all("commit.gpgsign"))
+
+    def test_origin(self):
+        self.assertEqual("file:/home/user/.gitconfig", self.snapshot.get_origin("user.name"))
+        self.assertEqual("file:.git/config", self.snapshot.get_origin("commit.gpgsign"))
+        self.assertIsNone(self.snapshot.get_origin("gpg.format"))
+
+    def test_subsection_is_case_sensitive(self):
+        self.assertEqual("git@github.com:org/repo.git", self.snapshot.get("REMOTE.Origin.URL"))
+        self.assertIsNone(self.snapshot.get("remote.origin.url"))
+
+    @mock.patch("daktari.git_config.run_command")
+    def test_reads_config_again_in_later_runs(self, mock_run_command):
+        clear_run_cache()
+        mock_run_command.return_value = mock.Mock(stdout="file:.git/config\0user.name\nBefore\0")
+        self.assertEqual("Before", get_git_config("user.name"))
+
+        mock_run_command.return_value = mock.Mock(stdout="file:.git/config\0user.name\nAfter\0")
+        self.assertEqual("Before", get_git_config("user.name"))
+        clear_run_cache()
+        self.assertEqual("After", get_git_config("user.name"))
+        self.assertEqual(2, mock_run_command.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
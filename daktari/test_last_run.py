@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from io import StringIO
+from unittest import mock
+
+from daktari.check import Check, CheckResult, CheckStatus
+from daktari.check_runner import CheckRunner, RunOptions
+from daktari.check_utils import get_check_id
+from daktari.last_run import LastRun, select_failed_checks
+from daktari.result_formatter import JsonFormatter
+from daktari.test_check_factory import DummyCheck
+
+
+def record(last_run: LastRun, check: Check, status: CheckStatus, directory: str = "/project"):
+    last_run.record(get_check_id(check), CheckResult(check.name, status, "", {}), directory)
+
+
+class TestLastRun(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.env_patch = mock.patch.dict(os.environ, {"DAKTARI_CACHE_DIR": self.cache_dir.name})
+        self.env_patch.start()
+
+    def tearDown(self):
+        self.env_patch.stop()
+        self.cache_dir.cleanup()
+
+    def test_later_runs_merge_into_stored_results(self):
+        check_one, check_two = DummyCheck("check.one"), DummyCheck("check.two")
+        last_run = LastRun.load()
+        record(last_run, check_one, CheckStatus.FAIL)
+        record(last_run, check_two, CheckStatus.PASS)
+        record(last_run, check_one, CheckStatus.PASS, "/other")
+        last_run.save()
+
+        rerun = LastRun.load()
+        record(rerun, check_one, CheckStatus.PASS)
+        rerun.save()
+
+        statuses = LastRun.load().get_statuses("/project")
+        self.assertEqual({get_check_id(check_one): "PASS", get_check_id(check_two): "PASS"}, statuses)
+
+    def test_saving_keeps_results_saved_by_other_processes(self):
+        check_one, check_two = DummyCheck("check.one"), DummyCheck("check.two")
+        foreground, background = LastRun.load(), LastRun.load()
+        record(foreground, check_one, CheckStatus.FAIL)
+        record(background, check_two, CheckStatus.PASS)
+        foreground.save()
+        background.save()
+
+        statuses = LastRun.load().get_statuses("/project")
+        self.assertEqual({get_check_id(check_one): "FAIL", get_check_id(check_two): "PASS"}, statuses)
+
+    def test_selects_failed_checks_and_their_dependencies(self):
+        base = DummyCheck("base")
+        failed = DummyCheck("failed", [base])
+        skipped = DummyCheck("skipped", [failed])
+        passed = DummyCheck("passed", [base])
+        last_run = LastRun({})
+        record(last_run, base, CheckStatus.PASS)
+        record(last_run, failed, CheckStatus.ERROR)
+        record(last_run, skipped, CheckStatus.PASS_WITH_WARNING)
+        record(last_run, passed, CheckStatus.PASS)
+
+        selected = select_failed_checks([base, failed, skipped, passed], last_run, "/project")
+
+        self.assertEqual(["base", "failed", "skipped"], [check.name for check in selected])
+
+    def test_selects_everything_for_config_never_run(self):
+        checks = [DummyCheck("check.one"), DummyCheck("check.two")]
+        self.assertEqual(checks, select_failed_checks(checks, LastRun({}), "/project"))
+
+    def test_tells_apart_checks_sharing_a_name(self):
+        def file_exists_checks():
+            return [DummyCheck("file.exists", succeed=False), DummyCheck("file.exists")]
+
+        project = os.getcwd()
+        last_run = LastRun.load()
+        options = RunOptions(last_run=last_run)
+        self.assertFalse(CheckRunner(file_exists_checks(), options, JsonFormatter(StringIO())).run())
+        self.assertEqual({get_check_id(file_exists_checks()[0])}, LastRun.load().get_failed_ids(project))
+
+        failing, passing = file_exists_checks()
+        self.assertEqual([failing], select_failed_checks([failing, passing], LastRun.load(), project))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import socket
+import time
+import unittest
+from unittest import mock
+
+from daktari.network import NetworkProbe, parse_probe_address
+
+
+class TestNetworkProbe(unittest.TestCase):
+    def test_online_when_listener_accepts(self):
+        with socket.socket() as listener:
+            listener.bind(("127.0.0.1", 0))
+            listener.listen()
+            probe = NetworkProbe(listener.getsockname())
+            self.assertTrue(probe.is_online())
+
+    def test_offline_when_connection_refused(self):
+        with socket.socket() as unused:
+            unused.bind(("127.0.0.1", 0))
+            address = unused.getsockname()
+        probe = NetworkProbe(address)
+        start_time = time.monotonic()
+        self.assertFalse(probe.is_online())
+        self.assertLess(time.monotonic() - start_time, 1)
+
+    def test_probes_once(self):
+        probe = NetworkProbe(("127.0.0.1", 1))
+        with mock.patch.object(probe, "probe", return_value=False) as mock_probe:
+            self.assertFalse(probe.is_online())
+            self.assertFalse(probe.is_online())
+        mock_probe.assert_called_once()
+
+    def test_parse_probe_address(self):
+        self.assertEqual(("1.1.1.1", 443), parse_probe_address("1.1.1.1:443"))
+        self.assertEqual(("::1", 80), parse_probe_address("[::1]:80"))
+        self.assertIsNone(parse_probe_address("off"))
+        with self.assertRaises(ValueError):
+            parse_probe_address("example.com")
+
+
+if __name__ == "__main__":
+    unittest.main()
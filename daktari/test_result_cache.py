@@ -0,0 +1,129 @@
+import os
+import tempfile
+import time
+import unittest
+from dataclasses import replace
+from datetime import timedelta
+from unittest import mock
+
+from daktari.check import CheckStatus
+from daktari.check_runner import RunOptions, run_checks
+from daktari.result_cache import ResultCache
+from daktari.test_check_factory import DummyCheck
+
+
+class CachedDummyCheck(DummyCheck):
+    cache_ttl = timedelta(hours=1)
+
+
+class ParameterisedCheck(CachedDummyCheck):
+    def __init__(self, parameter: str):
+        super().__init__("parameterised.check")
+        self.parameter = parameter
+
+
+class InputFileCheck(CachedDummyCheck):
+    def __init__(self, path: str):
+        super().__init__("input.check")
+        self.path = path
+
+    def get_input_paths(self):
+        return [self.path]
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.env_patch = mock.patch.dict(os.environ, {"DAKTARI_CACHE_DIR": self.cache_dir.name})
+        self.env_patch.start()
+
+    def tearDown(self):
+        self.env_patch.stop()
+        self.cache_dir.cleanup()
+
+    def run_with_cache(self, check, refresh: bool = False) -> bool:
+        return run_checks([check], RunOptions(quiet_mode=True, result_cache=ResultCache.load(refresh)))
+
+    def test_reuses_passing_result(self):
+        self.assertTrue(self.run_with_cache(CachedDummyCheck("cached.check")))
+
+        check = CachedDummyCheck("cached.check")
+        self.assertTrue(self.run_with_cache(check))
+        self.assertFalse(check.was_run)
+
+    def test_refresh_bypasses_cache(self):
+        self.run_with_cache(CachedDummyCheck("cached.check"))
+
+        check = CachedDummyCheck("cached.check")
+        self.run_with_cache(check, refresh=True)
+        self.assertTrue(check.was_run)
+
+    def test_does_not_cache_failures(self):
+        self.run_with_cache(CachedDummyCheck("cached.check", succeed=False))
+
+        check = CachedDummyCheck("cached.check")
+        self.run_with_cache(check)
+        self.assertTrue(check.was_run)
+
+    def test_does_not_cache_checks_without_ttl(self):
+        self.run_with_cache(DummyCheck("uncached.check"))
+
+        check = DummyCheck("uncached.check")
+        self.run_with_cache(check)
+        self.assertTrue(check.was_run)
+
+    def test_keyed_by_constructor_arguments(self):
+        self.run_with_cache(ParameterisedCheck("one"))
+
+        check = ParameterisedCheck("two")
+        self.run_with_cache(check)
+        self.assertTrue(check.was_run)
+
+    def test_result_expires_at_valid_until(self):
+        cache = ResultCache({})
+        check = CachedDummyCheck("cached.check")
+        cache.put(check, replace(check.check(), valid_until=time.time() - 1))
+        self.assertIsNone(cache.get(check))
+
+    def test_misses_once_input_file_changes(self):
+        input_path = os.path.join(self.cache_dir.name, "input.txt")
+        with open(input_path, "w") as input_file:
+            input_file.write("before")
+        cache = ResultCache({})
+        check = InputFileCheck(input_path)
+        cache.put(check, check.check())
+        self.assertIsNotNone(cache.get(check))
+
+        with open(input_path, "w") as input_file:
+            input_file.write("edited contents")
+        self.assertIsNone(cache.get(check))
+
+        cache.put(check, check.check())
+        os.remove(input_path)
+        self.assertIsNone(cache.get(check))
+
+    def test_saving_keeps_entries_saved_by_other_processes(self):
+        check_one, check_two = CachedDummyCheck("check.one"), CachedDummyCheck("check.two")
+        foreground, background = ResultCache.load(), ResultCache.load()
+        # Results from other instances, as running a dummy check changes its fingerprint
+        foreground.put(check_one, CachedDummyCheck("check.one").check())
+        background.put(check_two, CachedDummyCheck("check.two").check())
+        foreground.save()
+        background.save()
+
+        reloaded = ResultCache.load()
+        self.assertIsNotNone(reloaded.get(CachedDummyCheck("check.one")))
+        self.assertIsNotNone(reloaded.get(CachedDummyCheck("check.two")))
+
+    def test_cached_result(self):
+        cache = ResultCache({})
+        check = CachedDummyCheck("cached.check")
+        cache.put(check, check.check())
+        result = cache.get(check)
+        self.assertEqual(CheckStatus.PASS, result.status)
+        self.assertEqual("dummy check", result.summary)
+        self.assertTrue(result.cached)
+
+
+if __name__ == "__main__":
+    unittest.main()
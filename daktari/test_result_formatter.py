@@ -0,0 +1,100 @@
+import json
+import unittest
+from io import StringIO
+from unittest import mock
+from xml.etree.ElementTree import fromstring
+
+from daktari.check_runner import CheckRunner, RunOptions
+from daktari.os import OS
+from daktari.result_formatter import JsonFormatter, JunitFormatter, NdjsonFormatter, ResultFormatter, TextFormatter
+from daktari.terminal_renderer import TerminalRenderer
+from daktari.test_check_factory import DummyCheck, ExplodingCheck
+from daktari.timing_report import TimingReport
+
+
+class TestResultFormatter(unittest.TestCase):
+    def test_ndjson_streams_one_event_per_check(self):
+        output = StringIO()
+        checks = [DummyCheck("check.one"), DummyCheck("check.two", succeed=False).suggest("Fix it", OS.GENERIC)]
+        CheckRunner(checks, formatter=NdjsonFormatter(output)).run()
+
+        events = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(["start", "check", "check", "finish"], [event["event"] for event in events])
+        self.assertEqual(2, events[0]["total"])
+        self.assertEqual("check.two", events[2]["name"])
+        self.assertEqual("FAIL", events[2]["status"])
+        self.assertEqual("dummy check", events[2]["summary"])
+        self.assertEqual("Fix it", events[2]["suggestion"])
+        self.assertGreaterEqual(events[2]["duration"], 0)
+        self.assertFalse(events[3]["all_passed"])
+
+    def test_json_writes_single_document(self):
+        output = StringIO()
+        checks = [DummyCheck("check.one")]
+        CheckRunner(checks, formatter=JsonFormatter(output)).run()
+
+        document = json.loads(output.getvalue())
+        self.assertTrue(document["all_passed"])
+        self.assertEqual(["check.one"], [check["name"] for check in document["checks"]])
+
+    def test_json_identifies_checks_sharing_a_name(self):
+        output = StringIO()
+        checks = [DummyCheck("file.exists", succeed=False), DummyCheck("file.exists")]
+        CheckRunner(checks, formatter=JsonFormatter(output)).run()
+
+        ids = [check["id"] for check in json.loads(output.getvalue())["checks"]]
+        self.assertEqual(2, len(set(ids)))
+        self.assertNotIn(None, ids)
+
+    def test_junit(self):
+        output = StringIO()
+        checks = [DummyCheck("check.one"), DummyCheck("check.two", succeed=False), ExplodingCheck()]
+        CheckRunner(checks, formatter=JunitFormatter(output)).run()
+
+        suite = fromstring(output.getvalue())
+        self.assertEqual("3", suite.get("tests"))
+        self.assertEqual("1", suite.get("failures"))
+        self.assertEqual("1", suite.get("errors"))
+        cases = suite.findall("testcase")
+        self.assertIsNone(cases[0].find("failure"))
+        self.assertEqual("dummy check", cases[1].find("failure").get("message"))
+        self.assertIsNotNone(cases[2].find("error"))
+
+    def test_ndjson_only_reports_timings_when_asked(self):
+        for timing_report in (False, True):
+            output = StringIO()
+            formatter = NdjsonFormatter(output, timing_report=timing_report)
+            CheckRunner([DummyCheck("check.one")], RunOptions(timing_report=TimingReport(5)), formatter).run()
+
+            events = [json.loads(line)["event"] for line in output.getvalue().splitlines()]
+            self.assertEqual(timing_report, "timings" in events)
+
+    def test_text_only_shows_checks_in_flight_when_running_in_parallel(self):
+        for jobs in (1, 2):
+            output = StringIO()
+            renderer = TerminalRenderer(output, show_in_flight=True)
+            CheckRunner([DummyCheck("check.one")], RunOptions(jobs=jobs), TextFormatter(False, renderer)).run()
+            self.assertEqual(jobs > 1, "⏳ check.one" in output.getvalue())
+
+    @mock.patch("daktari.result_printer.pyclip.copy")
+    def test_only_text_output_copies_suggestion_on_early_exit(self, mock_copy):
+        def failing_check():
+            return DummyCheck("check.one", succeed=False).suggest("Run <cmd>make setup</cmd>", OS.GENERIC)
+
+        for formatter in [JsonFormatter(StringIO()), NdjsonFormatter(StringIO()), JunitFormatter(StringIO())]:
+            CheckRunner([failing_check()], RunOptions(fail_fast=True), formatter).run()
+        mock_copy.assert_not_called()
+
+        output = StringIO()
+        formatter = TextFormatter(False, TerminalRenderer(output, show_in_flight=False))
+        CheckRunner([failing_check()], RunOptions(fail_fast=True), formatter).run()
+        mock_copy.assert_called_once_with("make setup")
+        self.assertIn("Command copied to clipboard", output.getvalue())
+
+    def test_formatters_must_handle_results(self):
+        with self.assertRaises(TypeError):
+            ResultFormatter()  # type: ignore[abstract]
+
+
+if __name__ == "__main__":
+    unittest.main()
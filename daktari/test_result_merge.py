@@ -0,0 +1,73 @@
+import json
+import unittest
+
+from daktari.result_merge import merge_reports, read_report
+
+
+def check(name, status, check_id=None):
+    return {
+        "name": name,
+        "id": check_id or name,
+        "status": status,
+        "summary": "",
+        "duration": 0.1,
+        "cached": False,
+        "suggestion": None,
+    }
+
+
+class TestResultMerge(unittest.TestCase):
+    def test_reads_json_and_ndjson(self):
+        json_report = json.dumps({"all_passed": True, "checks": [check("one", "PASS")], "deferred": []})
+        ndjson_report = "\n".join(
+            json.dumps(event)
+            for event in [
+                {"event": "start", "total": 1},
+                {"event": "check", **check("two", "FAIL")},
+                {"event": "finish", "all_passed": False},
+            ]
+        )
+        self.assertEqual(["one"], [result["name"] for result in read_report(json_report)["checks"]])
+        ndjson = read_report(ndjson_report)
+        self.assertEqual([check("two", "FAIL")], ndjson["checks"])
+        self.assertFalse(ndjson["all_passed"])
+
+    def test_unfinished_ndjson_did_not_pass(self):
+        self.assertFalse(read_report(json.dumps({"event": "start", "total": 1}))["all_passed"])
+
+    def test_rejects_other_documents(self):
+        with self.assertRaises(ValueError):
+            read_report(json.dumps({"all_passed": True, "configs": []}))
+
+    def test_merge_keeps_worst_result_of_duplicated_checks(self):
+        shard_1 = {"all_passed": True, "checks": [check("git", "PASS"), check("one", "PASS")], "deferred": []}
+        shard_2 = {"all_passed": False, "checks": [check("git", "ERROR"), check("two", "FAIL")], "deferred": []}
+        merged = merge_reports([shard_1, shard_2])
+        self.assertFalse(merged["all_passed"])
+        self.assertEqual(
+            [("git", "ERROR"), ("one", "PASS"), ("two", "FAIL")],
+            [(result["name"], result["status"]) for result in merged["checks"]],
+        )
+
+    def test_merge_keeps_distinct_checks_sharing_a_name(self):
+        shard_1 = {
+            "all_passed": False,
+            "checks": [check("file.exists", "FAIL", "a"), check("file.exists", "PASS", "b")],
+            "deferred": [],
+        }
+        shard_2 = {"all_passed": True, "checks": [check("file.exists", "PASS", "b")], "deferred": []}
+        merged = merge_reports([shard_1, shard_2])
+        self.assertEqual(
+            [("a", "FAIL"), ("b", "PASS")],
+            [(result["id"], result["status"]) for result in merged["checks"]],
+        )
+
+    def test_merge_matches_repeated_checks_by_occurrence(self):
+        shard_1 = {"all_passed": True, "checks": [check("git", "PASS"), check("git", "PASS")], "deferred": []}
+        shard_2 = {"all_passed": False, "checks": [check("git", "PASS"), check("git", "FAIL")], "deferred": []}
+        merged = merge_reports([shard_1, shard_2])
+        self.assertEqual(["PASS", "FAIL"], [result["status"] for result in merged["checks"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
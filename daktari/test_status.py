@@ -0,0 +1,118 @@
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+
+from daktari import cli
+from daktari.cache_utils import read_cache_file
+from daktari.check_runner import CheckRunner, RunOptions
+from daktari.last_run import LastRun
+from daktari.result_formatter import JsonFormatter
+from daktari.status import (
+    FAILING,
+    OK,
+    STALE,
+    STATUS_FILE,
+    UNKNOWN,
+    find_status,
+    format_status,
+    get_state,
+    start_refresh,
+    write_status,
+)
+from daktari.test_check_factory import DummyCheck
+
+
+class TestStatus(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.env_patch = mock.patch.dict(os.environ, {"DAKTARI_CACHE_DIR": self.cache_dir.name})
+        self.env_patch.start()
+        self.project_dir = tempfile.TemporaryDirectory()
+        self.project = Path(self.project_dir.name).resolve()
+        self.config_path = self.project / ".daktari.py"
+        self.config_path.write_text("checks = []\n")
+
+    def tearDown(self):
+        self.env_patch.stop()
+        self.cache_dir.cleanup()
+        self.project_dir.cleanup()
+
+    def test_finds_status_from_a_subdirectory(self):
+        write_status(self.config_path, False, 2)
+
+        entry = find_status(read_cache_file(STATUS_FILE), self.project / "src" / "main")
+        self.assertIsNotNone(entry)
+        self.assertEqual(FAILING, get_state(entry, 60, time.time()))
+        self.assertTrue(format_status(FAILING, entry).startswith("failing (2 failed) "))
+
+    def test_unknown_without_a_run(self):
+        self.assertIsNone(find_status({}, self.project))
+        self.assertEqual(UNKNOWN, get_state(None, 60, time.time()))
+
+    def test_stale_once_older_than_max_age(self):
+        write_status(self.config_path, True, 0)
+        entry = find_status(read_cache_file(STATUS_FILE), self.project)
+
+        self.assertEqual(OK, get_state(entry, 60, time.time()))
+        self.assertEqual(STALE, get_state(entry, 60, time.time() + 61))
+
+    def test_stale_once_config_changes(self):
+        write_status(self.config_path, True, 0)
+        self.config_path.write_text("checks = [Git()]\n")
+
+        entry = find_status(read_cache_file(STATUS_FILE), self.project)
+        self.assertEqual(STALE, get_state(entry, 60, time.time()))
+
+    def run_checks(self, checks, last_run):
+        options = RunOptions(last_run=last_run, config_path=self.config_path)
+        with mock.patch("os.getcwd", return_value=str(self.project)):
+            CheckRunner(checks, options, JsonFormatter(StringIO())).run()
+        return find_status(read_cache_file(STATUS_FILE), self.project)
+
+    def test_run_failing_a_check_sharing_a_name_is_failing(self):
+        entry = self.run_checks([DummyCheck("file.exists", succeed=False), DummyCheck("file.exists")], LastRun({}))
+
+        self.assertEqual(FAILING, get_state(entry, 60, time.time()))
+        self.assertEqual(1, entry["failed_count"])
+
+    def test_partial_run_keeps_earlier_failures(self):
+        last_run = LastRun({})
+        self.run_checks([DummyCheck("check.one", succeed=False), DummyCheck("check.two")], last_run)
+
+        entry = self.run_checks([DummyCheck("check.two")], last_run)
+        self.assertEqual(FAILING, get_state(entry, 60, time.time()))
+
+        entry = self.run_checks([DummyCheck("check.one", succeed=False), DummyCheck("check.two")], last_run)
+        self.assertEqual(1, entry["failed_count"])
+
+    def test_status_command_after_other_options(self):
+        write_status(self.config_path, False, 2)
+
+        output = StringIO()
+        with (
+            mock.patch("sys.argv", ["daktari", "-q", "status", "--max-age", "60"]),
+            mock.patch("os.getcwd", return_value=str(self.project)),
+            redirect_stdout(output),
+        ):
+            self.assertEqual(1, cli.main())
+        self.assertTrue(output.getvalue().startswith("failing (2 failed) "))
+
+    @mock.patch("subprocess.Popen")
+    def test_starts_one_refresh_at_a_time(self, mock_popen):
+        write_status(self.config_path, True, 0)
+        entry = find_status(read_cache_file(STATUS_FILE), self.project)
+
+        start_refresh(entry, time.time())
+        start_refresh(entry, time.time())
+        self.assertEqual(1, mock_popen.call_count)
+
+        write_status(self.project / "other" / ".daktari.py", False, 1)
+        statuses = read_cache_file(STATUS_FILE)
+        self.assertIn("refresh_started_at", statuses[str(self.project)])
+        self.assertIn(str(self.project / "other"), statuses)
@@ -0,0 +1,109 @@
+import unittest
+from io import StringIO
+from typing import Callable
+
+from daktari.terminal_renderer import TerminalRenderer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeTimer:
+    def cancel(self):
+        pass
+
+
+class TestTerminalRenderer(unittest.TestCase):
+    def setUp(self):
+        self.output = StringIO()
+        self.clock = FakeClock()
+        self.timers = []
+
+    def start_timer(self, delay: float, callback: Callable[[], None]) -> FakeTimer:
+        self.timers.append((delay, callback))
+        return FakeTimer()
+
+    def create_renderer(self, show_in_flight: bool = False) -> TerminalRenderer:
+        return TerminalRenderer(
+            self.output,
+            max_redraws_per_second=10,
+            show_in_flight=show_in_flight,
+            clock=self.clock,
+            timer_factory=self.start_timer,
+        )
+
+    def test_writes_output_immediately(self):
+        renderer = self.create_renderer()
+        renderer.write("first\n")
+        renderer.write("second\n")
+        self.assertEqual("first\nsecond\n", self.output.getvalue())
+
+    def test_rate_limits_progress_redraws(self):
+        renderer = self.create_renderer()
+        renderer.set_progress("1/3")
+        renderer.render()
+        self.clock.now = 0.05
+        renderer.set_progress("2/3")
+        renderer.render()
+        renderer.render()
+        self.assertNotIn("2/3", self.output.getvalue())
+        self.assertEqual([0.05], [round(delay, 6) for delay, _ in self.timers])
+
+        # The skipped redraw happens at the end of the frame
+        self.clock.now = 0.1
+        self.timers[0][1]()
+        self.assertTrue(self.output.getvalue().endswith("2/3"))
+
+        self.clock.now = 0.2
+        renderer.set_progress("3/3")
+        renderer.render()
+        self.assertTrue(self.output.getvalue().endswith("3/3"))
+        self.assertEqual(1, len(self.timers))
+        renderer.close()
+
+    def test_redraws_progress_below_output(self):
+        renderer = self.create_renderer()
+        renderer.set_progress("1/2")
+        renderer.render()
+        renderer.write("result\n")
+        self.assertEqual("1/2\33[2K\rresult\n1/2", self.output.getvalue())
+
+    def test_shows_checks_in_flight(self):
+        renderer = self.create_renderer(show_in_flight=True)
+        renderer.set_progress("0/2")
+        renderer.check_started("check.one", "1")
+        self.clock.now = 1
+        renderer.check_started("check.two", "2")
+        self.assertTrue(self.output.getvalue().endswith("  ⏳ check.one\n  ⏳ check.two\n0/2"))
+
+        self.clock.now = 2
+        renderer.check_finished("1")
+        renderer.write("result\n")
+        self.assertTrue(self.output.getvalue().endswith("\33[2K\r\33[1A\33[2K\33[1A\33[2Kresult\n  ⏳ check.two\n0/2"))
+
+    def test_shows_checks_in_flight_sharing_a_name(self):
+        renderer = self.create_renderer(show_in_flight=True)
+        renderer.check_started("file.exists", "1")
+        self.clock.now = 1
+        renderer.check_started("file.exists", "2")
+        self.assertTrue(self.output.getvalue().endswith("  ⏳ file.exists\n  ⏳ file.exists"))
+
+        self.clock.now = 2
+        renderer.check_finished("1")
+        renderer.write("result\n")
+        self.assertTrue(self.output.getvalue().endswith("result\n  ⏳ file.exists"))
+
+    def test_close_ends_line(self):
+        renderer = self.create_renderer()
+        renderer.set_progress("2/2")
+        renderer.close()
+        self.assertEqual("2/2\n", self.output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
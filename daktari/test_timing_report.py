@@ -0,0 +1,39 @@
+import unittest
+
+from daktari.timing_report import TimingReport
+
+
+class TestTimingReport(unittest.TestCase):
+    def test_slowest(self):
+        report = TimingReport(slowest_count=2)
+        report.add("check.one", 0.1, [])
+        report.add("check.two", 3.0, [])
+        report.add("check.three", 1.0, [])
+        self.assertEqual(["check.two", "check.three"], [timing.name for timing in report.slowest()])
+
+    def test_regressions(self):
+        report = TimingReport(regression_threshold=0.5)
+        report.add("regressed", 3.0, [1.0, 1.2, 0.9])
+        report.add("within.threshold", 1.4, [1.0, 1.0, 1.0])
+        report.add("too.quick.to.matter", 0.02, [0.01, 0.01, 0.01])
+        report.add("not.enough.history", 3.0, [1.0])
+        self.assertEqual(["regressed"], [timing.name for timing in report.regressions()])
+
+    def test_format(self):
+        report = TimingReport(slowest_count=1)
+        report.add("regressed", 3.0, [1.0, 1.0, 1.0])
+        self.assertEqual(
+            "⏱  Slowest checks:\n"
+            "     3.00s  regressed\n"
+            "⚠️  regressed took 3.00s, 200% slower than its median of 1.00s\n",
+            report.format(),
+        )
+
+    def test_format_nothing_to_report(self):
+        report = TimingReport()
+        report.add("check.one", 1.0, [1.0, 1.0, 1.0])
+        self.assertEqual("", report.format())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import statistics
+import threading
+from dataclasses import dataclass
+from typing import List, Optional
+
+# A check needs this many previous durations before it can be said to have regressed
+MIN_DURATIONS_FOR_REGRESSION = 3
+SLOWEST_CHECKS_REPORTED = 5
+
+
+@dataclass
+class CheckTiming:
+    name: str
+    duration: float
+    # Median of the check's previous durations, if it has enough history to compare against
+    median: Optional[float]
+
+    def slowdown(self) -> Optional[float]:
+        if not self.median:
+            return None
+        return self.duration / self.median - 1
+
+
+class TimingReport:
+    """Collects how long each check took in this run, to report the slowest and any that have become much slower."""
+
+    def __init__(self, slowest_count: int = 0, regression_threshold: float = 0.5, min_regression_seconds: float = 0.2):
+        self.slowest_count = slowest_count
+        self.regression_threshold = regression_threshold
+        # Ignore slowdowns too small to notice, which are mostly noise for very quick checks
+        self.min_regression_seconds = min_regression_seconds
+        self.timings: List[CheckTiming] = []
+        self.lock = threading.Lock()
+
+    def add(self, name: str, duration: float, previous_durations: List[float]):
+        enough_history = len(previous_durations) >= MIN_DURATIONS_FOR_REGRESSION
+        median = statistics.median(previous_durations) if enough_history else None
+        with self.lock:
+            self.timings.append(CheckTiming(name, duration, median))
+
+    def slowest(self) -> List[CheckTiming]:
+        return sorted(self.timings, key=lambda timing: timing.duration, reverse=True)[: self.slowest_count]
+
+    def regressions(self) -> List[CheckTiming]:
+        return [
+            timing
+            for timing in self.timings
+            if timing.median is not None
+            and timing.duration - timing.median >= self.min_regression_seconds
+            and (timing.slowdown() or 0) > self.regression_threshold
+        ]
+
+    def format(self) -> str:
+        output = ""
+        slowest = self.slowest()
+        if slowest:
+            output += "⏱  Slowest checks:\n"
+            for timing in slowest:
+                output += f"   {timing.duration:6.2f}s  {timing.name}\n"
+        for timing in self.regressions():
+            output += (
+                f"⚠️  {timing.name} took {timing.duration:.2f}s, {(timing.slowdown() or 0):.0%} slower than its "
+                f"median of {timing.median:.2f}s\n"
+            )
+        return output